@@ -1,16 +1,54 @@
-from fastapi import Depends, FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from strawberry.fastapi import GraphQLRouter
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
 
+from .core.admission import AdmissionMiddleware, get_admission_controller
+from .core.backend import shutdown_backend
+from .core.compression import DecompressionMiddleware, ResponseGZipMiddleware
 from .core.config import get_settings
+from .core.jobs import shutdown_jobs
 from .core.logging import configure_logging
+from .core.metrics import CONTENT_TYPE, REGISTRY
 from .core.security import require_api_key
+from .core.workers import shutdown_pools
+from .graphql.persisted import PersistedQueryStore
+from .graphql.router import CargoGraphQLRouter
 from .graphql.schema import schema
+from .services.mapping import load_sources
+from .services.stream import NDJSON_MEDIA_TYPE, stream_normalized
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body is produced while the request body is still being read.
+
+    The stock class listens for ``http.disconnect`` on ``receive`` while streaming,
+    which swallows the ``http.request`` messages the body iterator is waiting for.
+    Here only the body iterator reads ``receive``; a dropped client surfaces as
+    ``ClientDisconnect`` from ``request.stream()``.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await shutdown_jobs()
+    await shutdown_backend()
+    shutdown_pools()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(level=settings.log_level)
+    load_sources(settings.source_mappings)
 
     app = FastAPI(
         title="Cargo Processor (GraphQL)",
@@ -19,6 +57,10 @@ def create_app() -> FastAPI:
             "Designed to integrate with the storage-calculator backend."
         ),
         version="0.1.0",
+        lifespan=lifespan,
+        docs_url="/docs" if settings.docs_enabled else None,
+        redoc_url="/redoc" if settings.docs_enabled else None,
+        openapi_url="/openapi.json" if settings.docs_enabled else None,
         contact={
             "name": "Cargo Team",
             "url": "https://github.com/",
@@ -39,19 +81,60 @@ def create_app() -> FastAPI:
             allow_headers=["*"],
         )
 
+    # Compressed request bodies (gzip/deflate, zstd if installed) and gzip responses, except the NDJSON stream
+    app.add_middleware(DecompressionMiddleware, max_bytes=settings.request_max_decompressed_bytes)
+    if settings.response_gzip_min_bytes:
+        app.add_middleware(
+            ResponseGZipMiddleware,
+            minimum_size=settings.response_gzip_min_bytes,
+            exclude_paths=("/normalize/stream",),
+        )
+    # Outermost, so load is shed before bodies are read or decompressed
+    admission = get_admission_controller()
+    if admission is not None:
+        app.add_middleware(AdmissionMiddleware, controller=admission)
+
     async def context_getter(_=Depends(require_api_key)):
         # Put shared resources into context if needed
         return {}
 
-    gql = GraphQLRouter(schema, context_getter=context_getter)
+    persisted = PersistedQueryStore(settings.persisted_queries_max) if settings.persisted_queries_max else None
+    gql = CargoGraphQLRouter(
+        schema,
+        context_getter=context_getter,
+        persisted_queries=persisted,
+        graphql_ide="graphiql" if settings.graphiql_enabled else None,
+    )
     app.include_router(gql, prefix="/graphql")
 
+    @app.post("/normalize/stream", dependencies=[Depends(require_api_key)])
+    async def normalize_stream(request: Request, source: str):
+        # NDJSON in -> NDJSON out; anything else is read as a {"types", "items"} document
+        content_type = request.headers.get("content-type", "")
+        ndjson = content_type.startswith((NDJSON_MEDIA_TYPE, "application/jsonl"))
+        return RequestStreamingResponse(
+            stream_normalized(
+                source, request.stream(), ndjson=ndjson, max_record_bytes=settings.stream_max_record_bytes
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
     @app.get("/health")
     async def health():
         return {"status": "ok"}
 
     @app.get("/ready")
     async def ready():
+        if admission is not None and admission.saturated:
+            return JSONResponse(
+                {"status": "saturated", "inFlight": admission.in_flight, "queued": admission.queued},
+                status_code=503,
+                headers={"Retry-After": str(admission.retry_after)},
+            )
         return {"status": "ready"}
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
     return app
@@ -0,0 +1,213 @@
+"""Admission control for the normalize endpoints.
+
+Each worker admits at most ``ADMISSION_MAX_IN_FLIGHT`` requests whose declared
+bodies (``Content-Length``) add up to at most ``ADMISSION_MAX_BYTES``; a body
+larger than the whole budget is admitted only when nothing else is in flight.
+A body without a usable ``Content-Length`` (chunked uploads) is charged
+``ADMISSION_UNKNOWN_LENGTH_BYTES``, so it cannot bypass the byte budget.
+Requests that do not fit wait in a FIFO queue. When the queue already holds
+``ADMISSION_MAX_QUEUED`` requests, new ones are rejected at once with 429; a
+request still waiting after ``ADMISSION_QUEUE_TIMEOUT_SECONDS`` gets 503. Both
+carry ``Retry-After``. Everything happens before the body is read, so shed
+requests cost almost nothing. ``/ready`` reports 503 while the worker is
+saturated.
+"""
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import get_settings
+from .metrics import REGISTRY, CallbackMetric
+
+ADMITTED_PATHS = ("/graphql", "/normalize/stream")
+
+
+class AdmissionRejectedError(RuntimeError):
+    def __init__(self, status_code: int, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    nbytes: int
+    future: asyncio.Future[None]
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_bytes: int,
+        max_queued: int,
+        queue_timeout: float,
+        unknown_length_bytes: int | None = None,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        # 0 means no byte budget
+        self.max_bytes = max_bytes
+        # Charge for a body of unknown size; by default the whole budget
+        self.unknown_length_bytes = max_bytes if unknown_length_bytes is None else unknown_length_bytes
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.retry_after = max(1, math.ceil(queue_timeout))
+        self.in_flight = 0
+        self.bytes_in_flight = 0
+        self.rejected = {"queue_full": 0, "queue_timeout": 0}
+        self._waiters: deque[_Waiter] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def saturated(self) -> bool:
+        """No capacity left for another request without queueing."""
+        if self._waiters or self.in_flight >= self.max_in_flight:
+            return True
+        return bool(self.max_bytes) and self.bytes_in_flight >= self.max_bytes
+
+    def charge(self, content_length: int | None) -> int:
+        """Bytes to count against the budget for a body that declares ``content_length``."""
+        return self.unknown_length_bytes if content_length is None else content_length
+
+    def _fits(self, nbytes: int) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        # An oversized body may still run alone rather than never
+        return not self.max_bytes or self.in_flight == 0 or self.bytes_in_flight + nbytes <= self.max_bytes
+
+    def _admit(self, nbytes: int) -> None:
+        self.in_flight += 1
+        self.bytes_in_flight += nbytes
+
+    async def acquire(self, nbytes: int) -> None:
+        if not self._waiters and self._fits(nbytes):
+            self._admit(nbytes)
+            return
+        if len(self._waiters) >= self.max_queued:
+            self.rejected["queue_full"] += 1
+            raise AdmissionRejectedError(429, "Too many requests queued; retry later", self.retry_after)
+
+        waiter = _Waiter(nbytes, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait((waiter.future,), timeout=self.queue_timeout)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+        if not waiter.future.done():
+            self._abandon(waiter)
+            self.rejected["queue_timeout"] += 1
+            raise AdmissionRejectedError(503, "Server busy; retry later", self.retry_after)
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            # Admitted just as the caller gave up
+            self.release(waiter.nbytes)
+            return
+        waiter.future.cancel()
+        self._waiters.remove(waiter)
+        # The head of the queue may have been blocking smaller requests behind it
+        self._wake()
+
+    def release(self, nbytes: int) -> None:
+        self.in_flight -= 1
+        self.bytes_in_flight -= nbytes
+        self._wake()
+
+    def _wake(self) -> None:
+        # Strict FIFO: a large body at the head is not starved by smaller ones behind it
+        while self._waiters and self._fits(self._waiters[0].nbytes):
+            waiter = self._waiters.popleft()
+            self._admit(waiter.nbytes)
+            waiter.future.set_result(None)
+
+
+def _content_length(scope: Scope) -> int | None:
+    for key, value in scope["headers"]:
+        if key == b"content-length":
+            try:
+                length = int(value)
+            except ValueError:
+                return None
+            return length if length >= 0 else None
+    return None
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController, paths: tuple[str, ...] = ADMITTED_PATHS) -> None:
+        self.app = app
+        self.controller = controller
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        nbytes = self.controller.charge(_content_length(scope))
+        try:
+            await self.controller.acquire(nbytes)
+        except AdmissionRejectedError as e:
+            response = PlainTextResponse(str(e), status_code=e.status_code, headers={"Retry-After": str(e.retry_after)})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(nbytes)
+
+
+_controller: AdmissionController | None = None
+_configured = False
+
+
+def get_admission_controller() -> AdmissionController | None:
+    """The worker's controller, or ``None`` when ``ADMISSION_MAX_IN_FLIGHT`` is 0."""
+    global _controller, _configured
+    if not _configured:
+        settings = get_settings()
+        if settings.admission_max_in_flight > 0:
+            _controller = AdmissionController(
+                settings.admission_max_in_flight,
+                settings.admission_max_bytes,
+                settings.admission_max_queued,
+                settings.admission_queue_timeout_seconds,
+                settings.admission_unknown_length_bytes,
+            )
+        _configured = True
+    return _controller
+
+
+def _admission_state() -> dict[tuple[str, ...], float]:
+    if _controller is None:
+        return {}
+    return {
+        ("in_flight",): _controller.in_flight,
+        ("queued",): _controller.queued,
+        ("bytes_in_flight",): _controller.bytes_in_flight,
+    }
+
+
+def _admission_rejected() -> dict[tuple[str, ...], float]:
+    if _controller is None:
+        return {}
+    return {(reason,): n for reason, n in _controller.rejected.items()}
+
+
+REGISTRY.register(CallbackMetric("cargo_admission", "Admission control state.", ("state",), _admission_state))
+REGISTRY.register(
+    CallbackMetric(
+        "cargo_admission_rejected_total",
+        "Requests shed by admission control.",
+        ("reason",),
+        _admission_rejected,
+        "counter",
+    )
+)
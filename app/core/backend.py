@@ -0,0 +1,52 @@
+"""Shared HTTP client for the storage backend (``BACKEND_BASE_URL``).
+
+One pooled keep-alive ``httpx.AsyncClient`` per worker, used by the push
+subsystem and the catalogue cache; ``API_TOKEN`` is sent as a bearer token.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from .config import get_settings
+
+if TYPE_CHECKING:
+    import httpx
+
+_client: "httpx.AsyncClient | None" = None
+# Reset the singletons built on the client (pusher, catalogue) before it is closed
+_shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+def get_backend_client() -> "httpx.AsyncClient | None":
+    """The worker's client, or ``None`` when ``BACKEND_BASE_URL`` is not set."""
+    global _client
+    settings = get_settings()
+    if _client is None and settings.backend_base_url:
+        # httpx takes ~80 ms to import; only workers that talk to the backend pay for it
+        import httpx
+
+        headers = {"Authorization": f"Bearer {settings.api_token}"} if settings.api_token else {}
+        _client = httpx.AsyncClient(
+            base_url=settings.backend_base_url.rstrip("/"),
+            headers=headers,
+            timeout=settings.push_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.push_max_concurrency,
+                max_keepalive_connections=settings.push_max_concurrency,
+            ),
+        )
+    return _client
+
+
+async def shutdown_backend() -> None:
+    global _client
+    for hook in _shutdown_hooks:
+        await hook()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
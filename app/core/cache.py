@@ -0,0 +1,153 @@
+"""Content-addressed cache for serialized normalize results.
+
+Keys are a SHA-256 of the raw request body (``request_key``) or, without one,
+of the source and the canonicalized payload (``result_key``); values are
+already-serialized JSON. ``ResultCache`` is the backend interface;
+``MemoryLRUCache`` is the per-worker default and a shared backend (e.g. Redis)
+can be plugged in with ``set_result_cache``.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from .config import get_settings
+from .metrics import REGISTRY, CallbackMetric
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResultCache(Protocol):
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+    def stats(self) -> CacheStats: ...
+
+
+class MemoryLRUCache:
+    """LRU cache bounded by a byte budget, with a per-entry TTL."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._drop(key)
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        while self._stats.bytes + size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._stats.evictions += 1
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._stats.bytes += size
+
+    def stats(self) -> CacheStats:
+        self._stats.entries = len(self._entries)
+        return CacheStats(**vars(self._stats))
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._stats.bytes -= len(key) + len(value)
+
+
+_cache: ResultCache | None = None
+_configured = False
+# Larger bodies are hashed on a thread; hashlib releases the GIL while it works
+_INLINE_HASH_BYTES = 1024 * 1024
+
+
+def result_key(source: str, payload: Any) -> str:
+    canonical = json.dumps([source, payload], sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _body_digest(body: bytes, scope: tuple[str, ...]) -> str:
+    digest = hashlib.sha256("\0".join(scope).encode() + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def request_key(body: bytes, *scope: str) -> str:
+    """Key for a result fully determined by a request body, without re-encoding the payload.
+
+    ``scope`` tells apart results computed from the same body, e.g. the
+    response key of the root field.
+    """
+    if len(body) <= _INLINE_HASH_BYTES:
+        return _body_digest(body, scope)
+    return await asyncio.to_thread(_body_digest, body, scope)
+
+
+def get_result_cache() -> ResultCache | None:
+    """Configured cache backend, or ``None`` when ``RESULT_CACHE_MAX_BYTES`` is 0."""
+    global _cache, _configured
+    if not _configured:
+        settings = get_settings()
+        if settings.result_cache_max_bytes > 0:
+            _cache = MemoryLRUCache(settings.result_cache_max_bytes, settings.result_cache_ttl_seconds)
+        _configured = True
+    return _cache
+
+
+def set_result_cache(cache: ResultCache | None) -> None:
+    global _cache, _configured
+    _cache = cache
+    _configured = True
+
+
+def _cache_events() -> dict[tuple[str, ...], float]:
+    cache = get_result_cache()
+    if cache is None:
+        return {}
+    stats = cache.stats()
+    return {("hit",): stats.hits, ("miss",): stats.misses, ("eviction",): stats.evictions}
+
+
+def _cache_usage() -> dict[tuple[str, ...], float]:
+    cache = get_result_cache()
+    if cache is None:
+        return {}
+    stats = cache.stats()
+    return {("bytes",): stats.bytes, ("entries",): stats.entries}
+
+
+REGISTRY.register(
+    CallbackMetric(
+        "cargo_result_cache_events_total",
+        "Result cache hits, misses and evictions.",
+        ("event",),
+        _cache_events,
+        "counter",
+    )
+)
+REGISTRY.register(CallbackMetric("cargo_result_cache_usage", "Result cache size.", ("unit",), _cache_usage))
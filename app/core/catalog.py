@@ -0,0 +1,142 @@
+"""Worker-local copy of the backend's item-type catalogue.
+
+The first lookup fetches ``GET /item-types`` and builds a ``CatalogIndex``.
+Afterwards lookups return the current index at once. When it is older than
+``CATALOG_TTL_SECONDS``, one background task revalidates it with
+``If-None-Match``/``If-Modified-Since``, and a 304 just renews the TTL
+(stale-while-revalidate). If a refresh fails, the old index stays in use.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from ..services.catalog import CatalogIndex
+from .backend import get_backend_client, on_shutdown
+from .config import get_settings
+from .metrics import REGISTRY, CallbackMetric
+
+logger = logging.getLogger("app.catalog")
+
+
+class CatalogUnavailableError(RuntimeError):
+    """No catalogue has been loaded and the backend cannot provide one."""
+
+
+class CatalogCache:
+    def __init__(self, client: httpx.AsyncClient, ttl_seconds: float, fuzzy_cutoff: float = 0.85) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.index: CatalogIndex | None = None
+        self.fetched_at = 0.0
+        self.requests = {"fetched": 0, "not_modified": 0, "failed": 0}
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self.fetched_at >= self.ttl_seconds
+
+    async def refresh(self) -> CatalogIndex:
+        """Revalidate now; concurrent callers share one request."""
+        started = time.monotonic()
+        async with self._lock:
+            if self.index is not None and self.fetched_at >= started:
+                return self.index  # refreshed while we waited for the lock
+            headers = {}
+            if self.index is not None:
+                if self._etag:
+                    headers["If-None-Match"] = self._etag
+                if self._last_modified:
+                    headers["If-Modified-Since"] = self._last_modified
+            try:
+                response = await self.client.get("/item-types", headers=headers)
+                if response.status_code == 304 and self.index is not None:
+                    self.requests["not_modified"] += 1
+                else:
+                    response.raise_for_status()
+                    self.index = CatalogIndex(response.json(), self.fuzzy_cutoff)
+                    self._etag = response.headers.get("etag")
+                    self._last_modified = response.headers.get("last-modified")
+                    self.requests["fetched"] += 1
+            except (httpx.HTTPError, ValueError) as e:
+                self.requests["failed"] += 1
+                if self.index is None:
+                    raise CatalogUnavailableError(f"GET /item-types failed: {e}") from e
+                logger.warning("Catalogue refresh failed; keeping the current index: %s", e)
+            self.fetched_at = time.monotonic()
+            return self.index
+
+    async def get(self) -> CatalogIndex:
+        if self.index is None:
+            return await self.refresh()
+        if self.stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_quietly())
+        return self.index
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except CatalogUnavailableError:
+            pass
+
+    def add(self, name: str, item_type_id: object) -> None:
+        """Record a type created through this worker without waiting for the next refresh."""
+        if self.index is not None:
+            self.index.add(name, item_type_id)
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+
+
+_catalog: CatalogCache | None = None
+
+
+def get_catalog() -> CatalogCache | None:
+    """The worker's catalogue, or ``None`` when ``BACKEND_BASE_URL`` is not set."""
+    global _catalog
+    if _catalog is None:
+        client = get_backend_client()
+        if client is not None:
+            settings = get_settings()
+            _catalog = CatalogCache(client, settings.catalog_ttl_seconds, settings.catalog_fuzzy_cutoff)
+    return _catalog
+
+
+@on_shutdown
+async def shutdown_catalog() -> None:
+    global _catalog
+    if _catalog is not None:
+        await _catalog.aclose()
+        _catalog = None
+
+
+def _catalog_state() -> dict[tuple[str, ...], float]:
+    if _catalog is None or _catalog.index is None:
+        return {}
+    return {("entries",): len(_catalog.index), ("age_seconds",): time.monotonic() - _catalog.fetched_at}
+
+
+def _catalog_requests() -> dict[tuple[str, ...], float]:
+    if _catalog is None:
+        return {}
+    return {(outcome,): n for outcome, n in _catalog.requests.items()}
+
+
+REGISTRY.register(CallbackMetric("cargo_catalog", "Item-type catalogue state.", ("state",), _catalog_state))
+REGISTRY.register(
+    CallbackMetric(
+        "cargo_catalog_requests_total",
+        "Catalogue fetches by outcome.",
+        ("outcome",),
+        _catalog_requests,
+        "counter",
+    )
+)
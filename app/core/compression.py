@@ -0,0 +1,141 @@
+"""Request body decompression for ``Content-Encoding: gzip`` / ``deflate`` / ``zstd``.
+
+zstd is only accepted when the optional ``zstandard`` package is installed.
+The body is inflated chunk by chunk as the app reads it, bounded by
+``max_bytes`` so a small compressed body cannot expand without limit; errors
+surface as ``HTTPException`` (400 / 413) from the app's body read.
+Response compression is Starlette's ``GZipMiddleware``, minus routes that
+stream their output (``ResponseGZipMiddleware``).
+"""
+
+import zlib
+from collections.abc import Callable, Iterable
+
+from starlette.exceptions import HTTPException
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("gzip", "deflate", "zstd") if zstandard is not None else ("gzip", "deflate")
+
+
+def _decoder(encoding: str) -> tuple[Callable[[bytes, int], bytes], Callable[[], bytes]] | None:
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # wbits: 16+ expects a gzip header, 32+ auto-detects zlib/gzip for "deflate"
+        d = zlib.decompressobj(16 + zlib.MAX_WBITS if encoding != "deflate" else 32 + zlib.MAX_WBITS)
+        return d.decompress, d.flush
+    if encoding == "zstd" and zstandard is not None:
+        return _zstd_decoder()
+    return None
+
+
+class _OutputLimitReached(Exception):
+    pass
+
+
+class _LimitedSink:
+    """Write target for ``stream_writer`` that stops decompression once ``limit`` bytes came out."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.limit = 0
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        if self.size > self.limit:
+            raise _OutputLimitReached
+        return len(data)
+
+
+def _zstd_decoder() -> tuple[Callable[[bytes, int], bytes], Callable[[], bytes]]:
+    # decompressobj() has no max_length; the stream writer hands over output a
+    # window at a time, so raising from the sink caps what one chunk can inflate to
+    sink = _LimitedSink()
+    writer = zstandard.ZstdDecompressor().stream_writer(sink)
+
+    def decompress(data: bytes, limit: int) -> bytes:
+        sink.chunks.clear()
+        sink.size = 0
+        sink.limit = limit
+        try:
+            writer.write(data)
+        except _OutputLimitReached:
+            pass  # the caller sees more than ``limit`` bytes and answers 413
+        return b"".join(sink.chunks)
+
+    return decompress, lambda: b""
+
+
+class DecompressionMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = ""
+        for key, value in scope["headers"]:
+            if key == b"content-encoding":
+                encoding = value.decode("latin-1").strip().lower()
+        if encoding in ("", "identity"):
+            await self.app(scope, receive, send)
+            return
+
+        decoder = _decoder(encoding)
+        if decoder is None:
+            response = PlainTextResponse(f"Unsupported Content-Encoding: {encoding}", status_code=415)
+            await response(scope, receive, send)
+            return
+        decompress, flush = decoder
+
+        # The app sees a plain body of unknown length
+        scope = dict(scope)
+        scope["headers"] = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        total = 0
+
+        async def receive_decompressed() -> Message:
+            nonlocal total
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            try:
+                body = decompress(message.get("body", b""), self.max_bytes - total + 1)
+                if not message.get("more_body", False):
+                    body += flush()
+            except Exception as e:  # zlib.error / zstandard.ZstdError
+                raise HTTPException(400, f"Invalid {encoding} request body: {e}") from None
+            total += len(body)
+            if total > self.max_bytes:
+                raise HTTPException(413, "Decompressed request body too large")
+            return {**message, "body": body}
+
+        await self.app(scope, receive_decompressed, send)
+
+
+class ResponseGZipMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` that passes ``exclude_paths`` through untouched.
+
+    The gzip stream only emits output once the compressor's buffer fills, which
+    would hold back responses that are meant to arrive incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, exclude_paths: Iterable[str] = ()) -> None:
+        super().__init__(app, minimum_size=minimum_size)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
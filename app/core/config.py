@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Any, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -6,8 +7,85 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     api_key: str | None = Field(default=None, alias="API_KEY")
+    # Storage backend for normalizeAndPush (unset disables pushing) and the bearer token sent to it
+    backend_base_url: str = Field(default="", alias="BACKEND_BASE_URL")
+    api_token: str | None = Field(default=None, alias="API_TOKEN")
     allowed_origins: list[str] = Field(default_factory=list, alias="ALLOWED_ORIGINS")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    # GraphiQL on GET /graphql and the OpenAPI docs (/docs, /redoc, /openapi.json); not needed to serve traffic
+    graphiql_enabled: bool = Field(default=True, alias="GRAPHIQL_ENABLED")
+    docs_enabled: bool = Field(default=True, alias="DOCS_ENABLED")
+    # JSON object: {"<source>": {"types": {...}, "items": {...}}}; see app/services/mapping.py
+    source_mappings: dict[str, dict[str, Any]] = Field(default_factory=dict, alias="SOURCE_MAPPINGS")
+    # Longest single record /normalize/stream buffers before answering with an error line
+    stream_max_record_bytes: int = Field(default=16 * 1024 * 1024, ge=1, alias="STREAM_MAX_RECORD_BYTES")
+    # "columnar" normalizes into typed arrays and skips the per-record dicts
+    normalize_engine: Literal["dict", "columnar"] = Field(default="dict", alias="NORMALIZE_ENGINE")
+    # Process pool used by normalizeMany; 0 means one worker per CPU
+    normalize_pool_workers: int = Field(default=0, ge=0, alias="NORMALIZE_POOL_WORKERS")
+    # Payloads with more records than this are normalized off the event loop
+    normalize_inline_max_records: int = Field(default=5_000, ge=0, alias="NORMALIZE_INLINE_MAX_RECORDS")
+    normalize_offload_executor: Literal["thread", "process"] = Field(
+        default="process", alias="NORMALIZE_OFFLOAD_EXECUTOR"
+    )
+    # Offloaded jobs (queued + running) allowed per worker before callers get a backpressure error
+    normalize_max_queue_depth: int = Field(default=64, ge=1, alias="NORMALIZE_MAX_QUEUE_DEPTH")
+    # Cache of serialized normalize results; RESULT_CACHE_MAX_BYTES=0 disables it
+    result_cache_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0, alias="RESULT_CACHE_MAX_BYTES")
+    result_cache_ttl_seconds: float = Field(default=300.0, gt=0, alias="RESULT_CACHE_TTL_SECONDS")
+    # Automatic persisted queries kept per worker (0 disables APQ)
+    persisted_queries_max: int = Field(default=1_000, ge=0, alias="PERSISTED_QUERIES_MAX")
+    # Parsed / validated GraphQL documents kept in the schema's LRU caches
+    graphql_document_cache_size: int = Field(default=256, ge=1, alias="GRAPHQL_DOCUMENT_CACHE_SIZE")
+    # Records per chunk when splitting large inputs across the pool
+    normalize_chunk_size: int = Field(default=20_000, ge=1, alias="NORMALIZE_CHUNK_SIZE")
+    # Responses larger than this are gzip-compressed when the client accepts it (0 disables)
+    response_gzip_min_bytes: int = Field(default=1024, ge=0, alias="RESPONSE_GZIP_MIN_BYTES")
+    # Upper bound on a gzip/deflate/zstd request body after decompression
+    request_max_decompressed_bytes: int = Field(default=256 * 1024 * 1024, ge=1, alias="REQUEST_MAX_DECOMPRESSED_BYTES")
+    # normalizeDelta snapshots kept per source, and sources tracked, in a directory shared by all workers
+    delta_snapshots_per_source: int = Field(default=4, ge=1, alias="DELTA_SNAPSHOTS_PER_SOURCE")
+    delta_max_sources: int = Field(default=256, ge=1, alias="DELTA_MAX_SOURCES")
+    # Where snapshots are kept (default: system temp dir)
+    delta_snapshot_dir: str = Field(default="", alias="DELTA_SNAPSHOT_DIR")
+    # Async normalize jobs (submitNormalizeJob): concurrency, admission and retention
+    jobs_max_concurrent: int = Field(default=2, ge=1, alias="JOBS_MAX_CONCURRENT")
+    jobs_max_pending: int = Field(default=16, ge=1, alias="JOBS_MAX_PENDING")
+    jobs_max_retained: int = Field(default=256, ge=1, alias="JOBS_MAX_RETAINED")
+    jobs_result_ttl_seconds: float = Field(default=3600.0, gt=0, alias="JOBS_RESULT_TTL_SECONDS")
+    # Job results with at least this many records are written chunk by chunk, smaller ones when the job is done
+    jobs_spill_min_records: int = Field(default=200_000, ge=0, alias="JOBS_SPILL_MIN_RECORDS")
+    # Job state and results, shared by all workers (default: system temp dir)
+    jobs_spill_dir: str = Field(default="", alias="JOBS_SPILL_DIR")
+    # Admission control for /graphql and /normalize/stream POSTs (ADMISSION_MAX_IN_FLIGHT=0 disables it)
+    admission_max_in_flight: int = Field(default=32, ge=0, alias="ADMISSION_MAX_IN_FLIGHT")
+    # Sum of in-flight Content-Length per worker (0: no byte budget)
+    admission_max_bytes: int = Field(default=512 * 1024 * 1024, ge=0, alias="ADMISSION_MAX_BYTES")
+    # Charged against that budget for a body without Content-Length (chunked)
+    admission_unknown_length_bytes: int = Field(default=64 * 1024 * 1024, ge=0, alias="ADMISSION_UNKNOWN_LENGTH_BYTES")
+    admission_max_queued: int = Field(default=64, ge=0, alias="ADMISSION_MAX_QUEUED")
+    admission_queue_timeout_seconds: float = Field(default=5.0, ge=0, alias="ADMISSION_QUEUE_TIMEOUT_SECONDS")
+    # Production runner (python -m app.server); SERVER_WORKERS=0 means one per available CPU
+    server_workers: int = Field(default=0, ge=0, alias="SERVER_WORKERS")
+    # "auto" picks uvloop / httptools when installed
+    server_loop: Literal["auto", "asyncio", "uvloop"] = Field(default="auto", alias="SERVER_LOOP")
+    server_http: Literal["auto", "h11", "httptools"] = Field(default="auto", alias="SERVER_HTTP")
+    # Worker recycling: after this many requests (+ random jitter) or above this RSS; 0 disables either
+    server_max_requests: int = Field(default=50_000, ge=0, alias="SERVER_MAX_REQUESTS")
+    server_max_requests_jitter: int = Field(default=5_000, ge=0, alias="SERVER_MAX_REQUESTS_JITTER")
+    server_max_rss_mb: int = Field(default=0, ge=0, alias="SERVER_MAX_RSS_MB")
+    server_graceful_timeout_seconds: int = Field(default=30, ge=1, alias="SERVER_GRACEFUL_TIMEOUT_SECONDS")
+    # Backend push: records per POST (1 = one object per request, >1 = JSON array bodies), concurrency, retries
+    push_batch_size: int = Field(default=1, ge=1, alias="PUSH_BATCH_SIZE")
+    push_max_concurrency: int = Field(default=16, ge=1, alias="PUSH_MAX_CONCURRENCY")
+    push_max_retries: int = Field(default=4, ge=0, alias="PUSH_MAX_RETRIES")
+    push_retry_backoff_seconds: float = Field(default=0.2, ge=0, alias="PUSH_RETRY_BACKOFF_SECONDS")
+    push_timeout_seconds: float = Field(default=30.0, gt=0, alias="PUSH_TIMEOUT_SECONDS")
+    # Unsent push batches are kept here and replayed before the next push (default: system temp dir)
+    push_outbox_dir: str = Field(default="", alias="PUSH_OUTBOX_DIR")
+    # Item-type catalogue: age after which it is revalidated in the background, and the fuzzy-match ratio cutoff
+    catalog_ttl_seconds: float = Field(default=300.0, ge=0, alias="CATALOG_TTL_SECONDS")
+    catalog_fuzzy_cutoff: float = Field(default=0.85, gt=0, le=1, alias="CATALOG_FUZZY_CUTOFF")
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,304 @@
+"""Asynchronous normalize jobs, visible to every worker.
+
+``submit`` returns immediately; the job runs as an asyncio task in the worker
+that accepted it, at most ``JOBS_MAX_CONCURRENT`` at a time, and normalizes its
+payload chunk by chunk (``NORMALIZE_CHUNK_SIZE``) on the offload executor so
+that progress can be reported between chunks.
+
+Each job is a directory under ``JOBS_SPILL_DIR`` that all workers of the host
+share: ``state.json`` is replaced after every chunk, and results are JSON-lines
+files with an int64 offset index, so whichever worker a poll lands on can
+report progress and page results. Results with at least
+``JOBS_SPILL_MIN_RECORDS`` records are written chunk by chunk; smaller ones
+are written once the job is done. Finished jobs are removed after
+``JOBS_RESULT_TTL_SECONDS`` or when more than ``JOBS_MAX_RETAINED`` are kept,
+and a job whose worker exited before finishing it is reported as failed.
+"""
+
+import asyncio
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from array import array
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from ..services.batch import chunk_payload
+from ..services.normalizer import normalize_raw
+from .config import get_settings
+from .metrics import REGISTRY, CallbackMetric
+from .workers import QueueFullError, offload, pid_alive
+
+SECTIONS = ("itemTypes", "items")
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+_OFFSET_SIZE = array("q").itemsize
+_JOB_ID = re.compile(r"[0-9a-f]{24}")
+
+
+class SpilledResult:
+    """One JSON-lines file per section plus an index file holding the byte offset of every record."""
+
+    def __init__(self, directory: Path) -> None:
+        self._dir = directory
+
+    def append(self, item_types: list[dict], items: list[dict]) -> None:
+        for section, records in zip(SECTIONS, (item_types, items), strict=True):
+            if not records:
+                continue
+            lines = [_encode(r).encode() + b"\n" for r in records]
+            with open(self._dir / section, "ab") as f:
+                position = f.tell()
+                f.writelines(lines)
+            offsets = array("q")
+            for line in lines:
+                offsets.append(position)
+                position += len(line)
+            # The index grows only after the lines are on disk, so readers never see a partial line
+            with open(self._dir / f"{section}.idx", "ab") as f:
+                offsets.tofile(f)
+
+    def count(self, section: str) -> int:
+        try:
+            return (self._dir / f"{section}.idx").stat().st_size // _OFFSET_SIZE
+        except FileNotFoundError:
+            return 0
+
+    def page(self, section: str, start: int, count: int) -> list[dict]:
+        if count <= 0:
+            return []
+        try:
+            with open(self._dir / f"{section}.idx", "rb") as f:
+                f.seek(start * _OFFSET_SIZE)
+                raw = f.read(count * _OFFSET_SIZE)
+            available = len(raw) // _OFFSET_SIZE
+            if not available:
+                return []
+            first = array("q", raw[:_OFFSET_SIZE])[0]
+            with open(self._dir / section, "rb") as f:
+                f.seek(first)
+                return [json.loads(f.readline()) for _ in range(available)]
+        except FileNotFoundError:
+            return []  # the job was removed meanwhile
+
+    def clear(self) -> None:
+        for section in SECTIONS:
+            (self._dir / section).unlink(missing_ok=True)
+            (self._dir / f"{section}.idx").unlink(missing_ok=True)
+
+
+@dataclass
+class Job:
+    id: str
+    source: str
+    total_records: int
+    status: JobStatus = "queued"
+    processed_records: int = 0
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    # Worker running the job
+    pid: int = field(default_factory=os.getpid)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+def _records(payload: dict[str, Any]) -> int:
+    return len(payload.get("types") or []) + len(payload.get("items") or [])
+
+
+class JobManager:
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_concurrent: int,
+        max_pending: int,
+        max_retained: int,
+        ttl_seconds: float,
+        spill_min_records: int,
+    ) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_pending = max_pending
+        self.max_retained = max_retained
+        self.ttl_seconds = ttl_seconds
+        self.spill_min_records = spill_min_records
+        self._slots = asyncio.Semaphore(max_concurrent)
+        # Unfinished jobs of this worker; everything else is read from ``self.dir``
+        self._jobs: dict[str, Job] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def result(self, job: Job) -> SpilledResult:
+        return SpilledResult(self.dir / job.id)
+
+    def get(self, job_id: str) -> Job | None:
+        """The job's current state, whichever worker runs it (blocking file I/O)."""
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        job = self._load(job_id)
+        if job is None:
+            return None
+        if not job.finished and (job.pid == os.getpid() or not pid_alive(job.pid)):
+            job.status, job.error, job.finished_at = "failed", "worker exited", time.time()
+            self._save(job)
+        if job.finished and (job.finished_at or 0) < time.time() - self.ttl_seconds:
+            return None
+        return job
+
+    def active(self) -> int:
+        return len(self._jobs)
+
+    def status_counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(("queued", "running"), 0)
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+    async def submit(self, source: str, payload: dict[str, Any]) -> Job:
+        active = self.active()
+        if active >= self.max_pending:
+            raise QueueFullError(active)
+        job = Job(id=secrets.token_hex(12), source=source, total_records=_records(payload))
+        self._jobs[job.id] = job
+        try:
+            await asyncio.to_thread(self._sweep_and_create, job)
+        except BaseException:
+            del self._jobs[job.id]
+            raise
+        task = asyncio.create_task(self._run(job, payload))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, payload: dict[str, Any]) -> None:
+        result = self.result(job)
+        spill = job.total_records >= self.spill_min_records
+        buffered: tuple[list[dict], list[dict]] = ([], [])
+        try:
+            async with self._slots:
+                job.status = "running"
+                await asyncio.to_thread(self._save, job)
+                for chunk in chunk_payload(payload, get_settings().normalize_chunk_size):
+                    item_types, items = await self._normalize(job.source, chunk)
+                    if spill:
+                        await asyncio.to_thread(result.append, item_types, items)
+                    else:
+                        buffered[0].extend(item_types)
+                        buffered[1].extend(items)
+                    job.processed_records += _records(chunk)
+                    await asyncio.to_thread(self._save, job)
+                if not spill:
+                    await asyncio.to_thread(result.append, *buffered)
+                job.status = "done"
+        except asyncio.CancelledError:
+            job.status, job.error = "failed", "cancelled"
+            raise
+        except Exception as e:
+            job.status, job.error = "failed", str(e) or type(e).__name__
+        finally:
+            job.finished_at = time.time()
+            del self._jobs[job.id]
+            # Inline: a cancelled task cannot await anymore
+            if job.status == "failed":
+                result.clear()
+            self._save(job)
+
+    async def _normalize(self, source: str, chunk: dict[str, Any]) -> tuple[list[dict], list[dict]]:
+        if _records(chunk) <= get_settings().normalize_inline_max_records:
+            return normalize_raw(source, chunk)
+        while True:
+            try:
+                return await offload(normalize_raw, source, chunk)
+            except QueueFullError:
+                # Interactive requests share the executor; a background job just waits its turn
+                await asyncio.sleep(0.05)
+
+    def _sweep_and_create(self, job: Job) -> None:
+        self._sweep()
+        (self.dir / job.id).mkdir()
+        self._save(job)
+
+    def _save(self, job: Job) -> None:
+        path = self.dir / job.id / "state.json"
+        tmp = path.with_suffix(f".tmp-{os.getpid()}")
+        try:
+            tmp.write_text(_encode(asdict(job)))
+            os.replace(tmp, path)
+        except FileNotFoundError:
+            pass  # removed by another worker's sweep
+
+    def _load(self, job_id: str) -> Job | None:
+        try:
+            return Job(**json.loads((self.dir / job_id / "state.json").read_bytes()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+
+    def _sweep(self) -> None:
+        """Remove expired finished jobs, then the oldest finished ones beyond ``max_retained``."""
+        cutoff = time.time() - self.ttl_seconds
+        jobs = [job for job in map(self._load, (p.name for p in self.dir.iterdir())) if job is not None]
+        finished = sorted((j for j in jobs if j.finished), key=lambda j: j.finished_at or 0)
+        excess = len(jobs) - self.max_retained
+        for job in finished:
+            if excess > 0 or (job.finished_at or 0) < cutoff:
+                shutil.rmtree(self.dir / job.id, ignore_errors=True)
+                excess -= 1
+
+    async def shutdown(self) -> None:
+        # Finished results stay on disk for the other workers
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        # Tasks cancelled before they started never reach their ``finally``
+        for job in list(self._jobs.values()):
+            job.status, job.error, job.finished_at = "failed", "cancelled", time.time()
+            del self._jobs[job.id]
+            self._save(job)
+
+
+_manager: JobManager | None = None
+
+
+def get_job_manager() -> JobManager:
+    global _manager
+    if _manager is None:
+        settings = get_settings()
+        _manager = JobManager(
+            settings.jobs_spill_dir or os.path.join(tempfile.gettempdir(), "cargo-normalize-jobs"),
+            max_concurrent=settings.jobs_max_concurrent,
+            max_pending=settings.jobs_max_pending,
+            max_retained=settings.jobs_max_retained,
+            ttl_seconds=settings.jobs_result_ttl_seconds,
+            spill_min_records=settings.jobs_spill_min_records,
+        )
+    return _manager
+
+
+async def shutdown_jobs() -> None:
+    global _manager
+    if _manager is not None:
+        await _manager.shutdown()
+        _manager = None
+
+
+def _job_counts() -> dict[tuple[str, ...], float]:
+    if _manager is None:
+        return {}
+    return {(status,): n for status, n in _manager.status_counts().items()}
+
+
+REGISTRY.register(
+    CallbackMetric("cargo_normalize_jobs", "Async normalize jobs of this worker by status.", ("status",), _job_counts)
+)
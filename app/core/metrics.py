@@ -0,0 +1,143 @@
+"""Minimal Prometheus-style metrics (text exposition format 0.0.4).
+
+Dependency-free and cheap enough to stay on in production: an observation is a
+``bisect`` plus a few integer increments under an uncontended lock. The number
+of distinct ``source`` values per metric is capped so client-supplied names
+cannot blow up cardinality; later sources are reported as ``source="_other"``,
+with their other labels (e.g. ``stage``) kept.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+MAX_SOURCES = 64
+OVERFLOW_LABEL = "_other"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(float(1024 * 4**i) for i in range(10))  # 1 KiB .. 256 MiB
+COUNT_BUCKETS = tuple(float(10**i) for i in range(8))  # 1 .. 10M
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list[float]] = {}
+        self._source = labelnames.index("source") if "source" in labelnames else None
+        self._sources: set[str] = set()
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                labels = self._cap_source(labels)
+                series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 3))
+            # Layout: per-bucket counts (last one is +Inf), then count, then sum
+            series[idx] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def _cap_source(self, labels: tuple[str, ...]) -> tuple[str, ...]:
+        i = self._source
+        if i is None or labels[i] in self._sources:
+            return labels
+        if len(self._sources) >= MAX_SOURCES:
+            return (*labels[:i], OVERFLOW_LABEL, *labels[i + 1 :])
+        self._sources.add(labels[i])
+        return labels
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), series, strict=False):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _labels(self.labelnames, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative:g}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-2]:g}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-1]!r}"
+
+
+class CallbackMetric:
+    """Gauge or counter sampled at scrape time from a callback returning ``{label values: value}``."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], dict[tuple[str, ...], float]],
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in sorted(self.collect().items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value:g}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Histogram | CallbackMetric] = {}
+
+    def register(self, metric: Histogram | CallbackMetric) -> None:
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STAGE_SECONDS = Histogram(
+    "cargo_stage_seconds",
+    "Time spent per request stage (parse, graphql_parse, graphql_validate, normalize, fit, delta, "
+    "materialize, serialize, push, catalog).",
+    ("stage", "source"),
+    LATENCY_BUCKETS,
+)
+PAYLOAD_BYTES = Histogram("cargo_payload_bytes", "Request body size of normalize calls.", ("source",), BYTES_BUCKETS)
+PAYLOAD_RECORDS = Histogram(
+    "cargo_payload_records", "Records (types + items) per normalize payload.", ("source",), COUNT_BUCKETS
+)
+for _metric in (STAGE_SECONDS, PAYLOAD_BYTES, PAYLOAD_RECORDS):
+    REGISTRY.register(_metric)
+
+
+@contextmanager
+def timed(stage: str, source: str = "") -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage, source)
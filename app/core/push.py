@@ -0,0 +1,384 @@
+"""Push normalized results to the storage backend.
+
+Item types go to ``POST /item-types`` and item lines to
+``POST /containers/{id}/items`` over one pooled keep-alive ``httpx.AsyncClient``.
+Names are resolved to backend ids through ``GET /item-types``; only missing
+types are created. Records are sent in batches of ``PUSH_BATCH_SIZE`` (a
+single object when 1, which is what the current backend DTOs accept, a JSON
+array otherwise), at most ``PUSH_MAX_CONCURRENCY`` requests at a time. With a
+``CatalogCache`` the names come from the worker's catalogue instead of a
+``GET /item-types`` per push, and created types are added to it.
+
+Retries use full-jitter exponential backoff, honouring ``Retry-After``. GETs
+are retried after transport errors and 408/425/429/5xx. POSTs are not
+idempotent (an item line adds to the container's quantity), so they are only
+retried when the backend cannot have processed them: connection failures,
+429, and 503 with ``Retry-After``. Any other failure leaves a POST
+unconfirmed: unconfirmed item types are looked up again by name, and
+unconfirmed item lines are reported as ``PUSH_UNCONFIRMED`` instead of being
+resent. Other 4xx answers reject their batch for good and are reported.
+
+Whatever is certainly unsent after the retries is written to the disk outbox,
+one JSON file per push holding the container id plus the remaining type and
+item records (items by type name). Each push starts replaying the outbox,
+oldest first, in the background; entries claimed by a worker that has since
+died are put back first.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import secrets
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+
+from ..services.issues import NormalizeIssue
+from .backend import get_backend_client, on_shutdown
+from .catalog import CatalogCache, CatalogUnavailableError, get_catalog
+from .config import get_settings
+from .workers import pid_alive
+
+logger = logging.getLogger("app.push")
+
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+BACKEND_REJECTED = "BACKEND_REJECTED"
+ITEM_TYPE_NOT_PUSHED = "ITEM_TYPE_NOT_PUSHED"
+PUSH_UNCONFIRMED = "PUSH_UNCONFIRMED"
+_MAX_BACKOFF_SECONDS = 30.0
+# Raised before the request is sent, so the backend never saw it
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PushError(RuntimeError):
+    """The backend cannot take the push at all (e.g. the item type lookup was rejected)."""
+
+
+@dataclass
+class PushReport:
+    item_types_created: int = 0
+    items_sent: int = 0
+    outboxed_item_types: int = 0
+    outboxed_items: int = 0
+    issues: list[NormalizeIssue] = field(default_factory=list)
+
+
+class _Unconfirmed(Exception):
+    """A POST failed after it may have reached the backend, so it must not be sent again."""
+
+
+@dataclass
+class _Outcome:
+    responses: list[Any] | None = None
+    # Set when the batch was rejected for good: (status, response text)
+    rejected: tuple[int, str] | None = None
+    # Set when the backend may or may not have applied the batch
+    unconfirmed: str | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.responses is not None
+
+
+# Claims this process is replaying; a claim under our pid that is not here was left by an earlier process
+_claimed_here: set[Path] = set()
+
+
+class Outbox:
+    """Unsent push remainders as JSON files; a file is claimed by renaming it, so workers can share the directory."""
+
+    def __init__(self, directory: str) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def put(self, entry: dict[str, Any]) -> None:
+        name = f"{time.time_ns():020d}-{secrets.token_hex(4)}"
+        tmp = self.dir / f"{name}.tmp"
+        tmp.write_text(json.dumps(entry, separators=(",", ":")))
+        os.replace(tmp, self.dir / f"{name}.json")
+
+    def requeue_stale(self) -> None:
+        """Put back entries claimed by workers that died before releasing them."""
+        for claimed in self.dir.glob("*.claim-*"):
+            pid = claimed.suffix.removeprefix(".claim-")
+            if not pid.isdigit() or claimed in _claimed_here:
+                continue
+            if int(pid) == os.getpid() or not pid_alive(int(pid)):
+                try:
+                    os.replace(claimed, claimed.with_suffix(".json"))
+                except FileNotFoundError:
+                    continue  # another worker put it back
+
+    def claim(self) -> Iterator[tuple[Path, dict[str, Any]]]:
+        self.requeue_stale()
+        for path in sorted(self.dir.glob("*.json")):
+            claimed = path.with_suffix(f".claim-{os.getpid()}")
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue  # another worker got it
+            _claimed_here.add(claimed)
+            yield claimed, json.loads(claimed.read_text())
+
+    def release(self, claimed: Path, remainder: dict[str, Any] | None) -> None:
+        """Drop a replayed entry, or put back what is still unsent under its original name."""
+        _claimed_here.discard(claimed)
+        if remainder is None:
+            claimed.unlink(missing_ok=True)
+            return
+        claimed.write_text(json.dumps(remainder, separators=(",", ":")))
+        os.replace(claimed, claimed.with_suffix(".json"))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.dir.glob("*.json"))
+
+
+def _batches(records: list[Any], size: int) -> list[list[Any]]:
+    return [records[i : i + size] for i in range(0, len(records), size)]
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class BackendPusher:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        outbox: Outbox,
+        *,
+        batch_size: int = 1,
+        max_concurrency: int = 16,
+        max_retries: int = 4,
+        backoff_seconds: float = 0.2,
+        catalog: CatalogCache | None = None,
+    ) -> None:
+        self.client = client
+        self.catalog = catalog
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.outbox = outbox
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._drain_task: asyncio.Task[None] | None = None
+
+    async def _request(self, method: str, path: str, body: Any = None) -> httpx.Response | None:
+        """The final response (success or permanent error), or ``None`` once transient failures exhaust the retries.
+
+        Raises ``_Unconfirmed`` when a POST failed in a way that may have left it applied.
+        """
+        idempotent = method == "GET"
+        for attempt in range(self.max_retries + 1):
+            delay = None
+            try:
+                async with self._slots:
+                    response = await self.client.request(method, path, json=body)
+            except _NOT_SENT_ERRORS:
+                pass
+            except httpx.TransportError as e:
+                if not idempotent:
+                    raise _Unconfirmed(type(e).__name__) from e
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                delay = _retry_after(response)
+                refused = response.status_code == 429 or (response.status_code == 503 and delay is not None)
+                if not idempotent and not refused:
+                    raise _Unconfirmed(f"HTTP {response.status_code}")
+            if attempt == self.max_retries:
+                break
+            if delay is None:
+                delay = random.uniform(0, min(_MAX_BACKOFF_SECONDS, self.backoff_seconds * 2**attempt))
+            await asyncio.sleep(delay)
+        return None
+
+    async def _post_batch(self, path: str, records: list[dict]) -> _Outcome:
+        body: Any = records[0] if self.batch_size == 1 else records
+        try:
+            response = await self._request("POST", path, body)
+        except _Unconfirmed as e:
+            return _Outcome(unconfirmed=str(e))
+        if response is None:
+            return _Outcome()
+        if response.is_error:
+            return _Outcome(rejected=(response.status_code, response.text[:200]))
+        data = response.json() if response.content else None
+        return _Outcome(responses=data if isinstance(data, list) else [data])
+
+    async def _post_all(self, path: str, records: list[dict]) -> list[tuple[list[int], _Outcome]]:
+        indexed = _batches(list(range(len(records))), self.batch_size)
+        outcomes = await asyncio.gather(*(self._post_batch(path, [records[i] for i in idx]) for idx in indexed))
+        return list(zip(indexed, outcomes, strict=True))
+
+    async def _item_type_ids(self, fresh: bool = False) -> dict[str, Any] | None:
+        if self.catalog is not None:
+            try:
+                index = await (self.catalog.refresh() if fresh else self.catalog.get())
+            except CatalogUnavailableError:
+                return None
+            return dict(index.by_name)
+        response = await self._request("GET", "/item-types")
+        if response is None:
+            return None
+        if response.is_error:
+            raise PushError(f"GET /item-types failed with {response.status_code}: {response.text[:200]}")
+        return {t["name"]: t["id"] for t in response.json() if isinstance(t, dict) and "name" in t and "id" in t}
+
+    async def _push(
+        self, container_id: str, item_types: list[dict], items: list[dict], report: PushReport
+    ) -> dict[str, Any] | None:
+        """Deliver what can be delivered; return the unsent remainder (``None`` when nothing is left)."""
+        remainder: dict[str, Any] = {"containerId": container_id, "itemTypes": [], "items": []}
+        ids = await self._item_type_ids()
+        if ids is None:
+            return {"containerId": container_id, "itemTypes": item_types, "items": items}
+
+        # First definition of each missing name, with its position in ``item_types``
+        new_types: dict[str, int] = {}
+        for pos, t in enumerate(item_types):
+            if t["name"] not in ids:
+                new_types.setdefault(t["name"], pos)
+        type_positions = list(new_types.values())
+        new_list = [{k: v for k, v in item_types[pos].items() if v is not None} for pos in type_positions]
+        unavailable: set[str] = set()
+        unconfirmed: list[int] = []
+        for idx, outcome in await self._post_all("/item-types", new_list):
+            if outcome.sent:
+                report.item_types_created += len(idx)
+                for created in outcome.responses or ():
+                    if isinstance(created, dict) and "name" in created and "id" in created:
+                        ids[created["name"]] = created["id"]
+                        if self.catalog is not None:
+                            self.catalog.add(created["name"], created["id"])
+                continue
+            if outcome.unconfirmed is not None:
+                unconfirmed.extend(idx)
+                continue
+            unavailable.update(new_list[i]["name"] for i in idx)
+            if outcome.rejected is None:
+                remainder["itemTypes"].extend(item_types[type_positions[i]] for i in idx)
+            else:
+                status, text = outcome.rejected
+                report.issues.extend(
+                    NormalizeIssue(f"itemTypes[{type_positions[i]}]", BACKEND_REJECTED, f"{status}: {text}")
+                    for i in idx
+                )
+
+        if unconfirmed or any(i["itemTypeName"] not in ids and i["itemTypeName"] not in unavailable for i in items):
+            # Created without an id in the response, defined concurrently, or maybe created by an unconfirmed POST
+            ids.update(await self._item_type_ids(fresh=True) or {})
+        for i in unconfirmed:
+            if new_list[i]["name"] not in ids:
+                # Not in the backend after all, so it is safe to send again
+                unavailable.add(new_list[i]["name"])
+                remainder["itemTypes"].append(item_types[type_positions[i]])
+
+        lines: list[dict] = []
+        positions: list[int] = []
+        for pos, item in enumerate(items):
+            name = item["itemTypeName"]
+            if name in ids:
+                lines.append({"itemTypeId": ids[name], "quantity": item["quantity"]})
+                positions.append(pos)
+            elif name in unavailable and any(t["name"] == name for t in remainder["itemTypes"]):
+                # Its type is queued in the outbox, so the line goes with it
+                remainder["items"].append(item)
+            else:
+                report.issues.append(
+                    NormalizeIssue(f"items[{pos}]", ITEM_TYPE_NOT_PUSHED, f"Item type {name!r} is not in the backend")
+                )
+
+        path = f"/containers/{quote(container_id, safe='')}/items"
+        for idx, outcome in await self._post_all(path, lines):
+            if outcome.sent:
+                report.items_sent += len(idx)
+            elif outcome.unconfirmed is not None:
+                message = f"The backend did not confirm these lines ({outcome.unconfirmed}); not resent"
+                report.issues.extend(NormalizeIssue(f"items[{positions[i]}]", PUSH_UNCONFIRMED, message) for i in idx)
+            elif outcome.rejected is None:
+                remainder["items"].extend(items[positions[i]] for i in idx)
+            else:
+                status, text = outcome.rejected
+                report.issues.extend(
+                    NormalizeIssue(f"items[{positions[i]}]", BACKEND_REJECTED, f"{status}: {text}") for i in idx
+                )
+        return remainder if remainder["itemTypes"] or remainder["items"] else None
+
+    async def drain_outbox(self) -> None:
+        for claimed, entry in self.outbox.claim():
+            try:
+                remainder = await self._push(entry["containerId"], entry["itemTypes"], entry["items"], PushReport())
+            except BaseException:
+                self.outbox.release(claimed, entry)
+                raise
+            self.outbox.release(claimed, remainder)
+            if remainder is not None:
+                break  # the backend is still failing; leave the rest for the next push
+
+    def _drain_in_background(self) -> None:
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_quietly())
+
+    async def _drain_quietly(self) -> None:
+        try:
+            await self.drain_outbox()
+        except (httpx.HTTPError, PushError, OSError, ValueError) as e:
+            logger.warning("Outbox replay failed; retrying on the next push: %s", e)
+
+    async def push(self, container_id: str, item_types: list[dict], items: list[dict]) -> PushReport:
+        # The outbox is replayed alongside, so a backlog never holds up this push
+        self._drain_in_background()
+        report = PushReport()
+        remainder = await self._push(container_id, item_types, items, report)
+        if remainder is not None:
+            report.outboxed_item_types = len(remainder["itemTypes"])
+            report.outboxed_items = len(remainder["items"])
+            self.outbox.put(remainder)
+        return report
+
+    async def aclose(self) -> None:
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+
+
+_pusher: BackendPusher | None = None
+
+
+def get_pusher() -> BackendPusher | None:
+    """The worker's pusher, or ``None`` when ``BACKEND_BASE_URL`` is not set."""
+    global _pusher
+    client = get_backend_client()
+    if _pusher is None and client is not None:
+        settings = get_settings()
+        outbox_dir = settings.push_outbox_dir or os.path.join(tempfile.gettempdir(), "cargo-push-outbox")
+        _pusher = BackendPusher(
+            client,
+            Outbox(outbox_dir),
+            batch_size=settings.push_batch_size,
+            max_concurrency=settings.push_max_concurrency,
+            max_retries=settings.push_max_retries,
+            backoff_seconds=settings.push_retry_backoff_seconds,
+            catalog=get_catalog(),
+        )
+    return _pusher
+
+
+@on_shutdown
+async def shutdown_push() -> None:
+    global _pusher
+    if _pusher is not None:
+        await _pusher.aclose()
+        _pusher = None
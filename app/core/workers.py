@@ -0,0 +1,136 @@
+import asyncio
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from ..services.mapping import load_sources
+from .config import get_settings
+from .metrics import REGISTRY, CallbackMetric
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+_T = TypeVar("_T")
+
+_process_pool: "ProcessPoolExecutor | None" = None
+_thread_pool: ThreadPoolExecutor | None = None
+# Offloaded calls queued or running; only touched from the event loop thread
+_pending = 0
+
+
+class QueueFullError(RuntimeError):
+    def __init__(self, depth: int) -> None:
+        super().__init__(f"Normalization queue is full ({depth} jobs pending); retry later")
+        self.depth = depth
+
+
+def pid_alive(pid: int) -> bool:
+    """Whether process ``pid`` (e.g. another server worker) still exists on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _init_worker(source_mappings: dict[str, dict[str, Any]]) -> None:
+    # Workers are spawned fresh, so they need the same source plans as the app
+    load_sources(source_mappings)
+
+
+def get_process_pool() -> "ProcessPoolExecutor":
+    """Shared, lazily started process pool for CPU-bound normalization."""
+    global _process_pool
+    if _process_pool is None:
+        # multiprocessing is only imported once a pool is needed; it is not on the startup path
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        settings = get_settings()
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.normalize_pool_workers or None,
+            # spawn, not fork: forking a process that runs an event loop and threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings.source_mappings,),
+        )
+    return _process_pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=get_settings().normalize_pool_workers or None, thread_name_prefix="normalize"
+        )
+    return _thread_pool
+
+
+def get_offload_executor() -> Executor:
+    if get_settings().normalize_offload_executor == "thread":
+        return get_thread_pool()
+    return get_process_pool()
+
+
+async def offload_all(fn: Callable[..., _T], calls: Iterable[tuple[Any, ...]], executor: Executor) -> list[_T]:
+    """Run ``fn(*args)`` for every args tuple on ``executor`` and return results in order.
+
+    Raises ``QueueFullError`` before anything is submitted when
+    ``NORMALIZE_MAX_QUEUE_DEPTH`` jobs are already pending. Once admitted, calls
+    are submitted as slots free up, so a batch larger than the queue still goes
+    through; each admitted batch keeps at least one call running, even on a
+    queue filled by others.
+    """
+    global _pending
+    calls = list(calls)
+    limit = get_settings().normalize_max_queue_depth
+    if calls and _pending >= limit:
+        raise QueueFullError(_pending)
+    loop = asyncio.get_running_loop()
+    results: list[Any] = [None] * len(calls)
+    running: dict[asyncio.Future[_T], int] = {}
+    submitted = 0
+    try:
+        while submitted < len(calls) or running:
+            while submitted < len(calls) and (_pending < limit or not running):
+                running[loop.run_in_executor(executor, fn, *calls[submitted])] = submitted
+                _pending += 1
+                submitted += 1
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                _pending -= 1
+                results[running.pop(future)] = future.result()
+    finally:
+        for future in running:
+            future.cancel()
+        _pending -= len(running)
+    return results
+
+
+async def offload(fn: Callable[..., _T], *args: Any, executor: Executor | None = None) -> _T:
+    (result,) = await offload_all(fn, [args], executor or get_offload_executor())
+    return result
+
+
+def pending_jobs() -> int:
+    return _pending
+
+
+REGISTRY.register(
+    CallbackMetric(
+        "cargo_offload_pending_jobs", "Normalize jobs queued or running off the event loop.", (), lambda: {(): _pending}
+    )
+)
+
+
+def shutdown_pools() -> None:
+    global _process_pool, _thread_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(cancel_futures=True)
+        _thread_pool = None
@@ -0,0 +1,20 @@
+from collections.abc import Iterator
+
+from strawberry.extensions import SchemaExtension
+
+from ..core.metrics import timed
+
+
+class MetricsExtension(SchemaExtension):
+    """Record GraphQL parse and validation time in ``cargo_stage_seconds``.
+
+    Listed before the document caches so a cache hit is measured as what it costs.
+    """
+
+    def on_parse(self) -> Iterator[None]:
+        with timed("graphql_parse"):
+            yield
+
+    def on_validate(self) -> Iterator[None]:
+        with timed("graphql_validate"):
+            yield
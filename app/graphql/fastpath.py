@@ -0,0 +1,221 @@
+"""Pre-serialized fast path for the common ``normalize`` mutation shape.
+
+A document qualifies when it is a single ``normalize`` mutation whose
+arguments are ``source``/``payload`` (or ``normalizeTyped`` with
+``source``/``itemTypes``/``items``) and whose selection only picks plain
+fields of ``itemTypes``/``items`` (no aliases below the root field, fragments,
+directives or ``__typename``). For those, the normalizer's dicts are encoded
+straight into the response body; anything else returns ``None`` from
+``match_normalize`` and goes through regular Strawberry execution.
+"""
+
+import json
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, TypeGuard
+
+from graphql import (
+    FieldNode,
+    GraphQLError,
+    NonNullTypeNode,
+    OperationDefinitionNode,
+    OperationType,
+    StringValueNode,
+    VariableNode,
+    parse,
+    print_ast,
+    value_from_ast_untyped,
+)
+
+from ..services.mapping import DEFAULT_PLAN
+
+try:  # optional, noticeably faster on large lists
+    import orjson
+
+    dumps: Callable[[Any], bytes] = orjson.dumps
+except ImportError:  # pragma: no cover
+    _encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def dumps(obj: Any) -> bytes:
+        return _encode(obj).encode()
+
+
+TYPE_FIELDS = tuple(DEFAULT_PLAN.types)
+ITEM_FIELDS = tuple(DEFAULT_PLAN.items)
+_LIST_FIELDS = {"itemTypes": TYPE_FIELDS, "items": ITEM_FIELDS}
+_TYPE_KEYS = frozenset(TYPE_FIELDS)
+_ITEM_KEYS = frozenset(ITEM_FIELDS)
+_REQUIRED_TYPE_FLOATS = frozenset(("unitWeightKg", "unitVolumeM3"))
+# Root field -> argument name -> declared variable type
+_ARG_TYPES = {
+    "normalize": {"source": "String!", "payload": "JSON!"},
+    "normalizeTyped": {"source": "String!", "itemTypes": "[ItemTypeIn!]!", "items": "[ItemIn!]!"},
+}
+_INT_MIN, _INT_MAX = -(2**31), 2**31 - 1
+
+
+@dataclass(frozen=True)
+class NormalizeShape:
+    field: str
+    response_key: str
+    # argument name -> ("var", variable name) or ("value", literal)
+    arguments: tuple[tuple[str, tuple[str, Any]], ...]
+    # (list field, selected scalar fields) in selection order
+    selections: tuple[tuple[str, tuple[str, ...]], ...]
+
+    @property
+    def is_full(self) -> bool:
+        """Selection equals the full result layout, so the lists can be encoded as they are."""
+        return self.selections == tuple(_LIST_FIELDS.items())
+
+    def resolve_arguments(self, variables: dict[str, Any] | None) -> dict[str, Any] | None:
+        values: dict[str, Any] = {}
+        for name, (kind, ref) in self.arguments:
+            if kind == "var":
+                if not variables or ref not in variables:
+                    return None
+                values[name] = variables[ref]
+            else:
+                values[name] = ref
+        if not isinstance(values.get("source"), str):
+            return None
+        if self.field == "normalize" and not isinstance(values.get("payload"), dict):
+            return None
+        return values
+
+
+def _plain(field: Any) -> TypeGuard[FieldNode]:
+    return isinstance(field, FieldNode) and field.alias is None and not field.directives and not field.arguments
+
+
+def _var_type(node: Any) -> str | None:
+    # All arguments are non-null, so only non-null variables are valid for them
+    if isinstance(node, NonNullTypeNode):
+        return print_ast(node)
+    return None
+
+
+def _float(value: Any) -> float | None:
+    # GraphQL Float: finite numbers, ints widened
+    if type(value) is float:
+        return value if math.isfinite(value) else None
+    if type(value) is int:
+        return float(value)
+    return None
+
+
+def typed_lists(item_types: Any, items: Any) -> tuple[list[dict], list[dict]] | None:
+    """Coerce ``normalizeTyped`` inputs as GraphQL would, or ``None`` when regular execution must report an error."""
+    if not isinstance(item_types, list) or not isinstance(items, list):
+        return None
+    out_types = []
+    for t in item_types:
+        if type(t) is not dict or not t.keys() <= _TYPE_KEYS or type(t.get("name")) is not str:
+            return None
+        rec: dict[str, Any] = {"name": t["name"]}
+        for key in TYPE_FIELDS[1:]:
+            value = t.get(key)
+            if value is None:
+                if key in _REQUIRED_TYPE_FLOATS:
+                    return None
+                rec[key] = None
+                continue
+            rec[key] = number = _float(value)
+            if number is None:
+                return None
+        out_types.append(rec)
+    out_items = []
+    for i in items:
+        if type(i) is not dict or i.keys() != _ITEM_KEYS or type(i["itemTypeName"]) is not str:
+            return None
+        quantity = i["quantity"]
+        if type(quantity) is not int or not _INT_MIN <= quantity <= _INT_MAX:
+            return None
+        out_items.append({"itemTypeName": i["itemTypeName"], "quantity": quantity})
+    return out_types, out_items
+
+
+@lru_cache(maxsize=256)
+def match_normalize(query: str, operation_name: str | None) -> NormalizeShape | None:
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return None
+    if len(document.definitions) != 1:
+        return None
+    op = document.definitions[0]
+    if not isinstance(op, OperationDefinitionNode) or op.operation != OperationType.MUTATION or op.directives:
+        return None
+    if operation_name is not None and (op.name is None or op.name.value != operation_name):
+        return None
+
+    (root, *rest) = op.selection_set.selections
+    if rest or not isinstance(root, FieldNode) or root.name.value not in _ARG_TYPES or root.directives:
+        return None
+    arg_types = _ARG_TYPES[root.name.value]
+
+    declared = {}
+    for var in op.variable_definitions:
+        if var.default_value is not None or var.directives:
+            return None
+        declared[var.variable.name.value] = _var_type(var.type)
+
+    arguments = []
+    used = set()
+    for arg in root.arguments:
+        name = arg.name.value
+        if name not in arg_types:
+            return None
+        if isinstance(arg.value, VariableNode):
+            var_name = arg.value.name.value
+            if declared.get(var_name) != arg_types[name]:
+                return None
+            used.add(var_name)
+            arguments.append((name, ("var", var_name)))
+        elif name == "source" and not isinstance(arg.value, StringValueNode):
+            return None
+        else:
+            arguments.append((name, ("value", value_from_ast_untyped(arg.value))))
+    if used != set(declared) or {a for a, _ in arguments} != set(arg_types):
+        return None
+
+    if root.selection_set is None:
+        return None
+    selections = []
+    for sel in root.selection_set.selections:
+        if not _plain(sel) or sel.name.value not in _LIST_FIELDS or sel.selection_set is None:
+            return None
+        allowed = _LIST_FIELDS[sel.name.value]
+        fields = []
+        for sub in sel.selection_set.selections:
+            if not _plain(sub) or sub.name.value not in allowed or sub.selection_set is not None:
+                return None
+            fields.append(sub.name.value)
+        selections.append((sel.name.value, tuple(fields)))
+    if len({name for name, _ in selections}) != len(selections):
+        return None
+
+    return NormalizeShape(
+        field=root.name.value,
+        response_key=root.alias.value if root.alias else root.name.value,
+        arguments=tuple(arguments),
+        selections=tuple(selections),
+    )
+
+
+def encode_lists(item_types: list[dict], items: list[dict]) -> bytes:
+    return dumps({"itemTypes": item_types, "items": items})
+
+
+def render(shape: NormalizeShape, result: tuple[list[dict], list[dict]]) -> bytes:
+    """Encode the GraphQL response body for ``shape`` from the normalizer's dicts."""
+    head = b'{"data":{' + dumps(shape.response_key) + b":"
+    if shape.is_full:
+        return head + encode_lists(*result) + b"}}"
+    lists = {"itemTypes": result[0], "items": result[1]}
+    out = {}
+    for name, fields in shape.selections:
+        out[name] = [{f: rec[f] for f in fields} for rec in lists[name]]
+    return head + dumps(out) + b"}}"
@@ -0,0 +1,128 @@
+"""GraphQL types for async normalize jobs and cursor-paginated results."""
+
+import asyncio
+import base64
+from enum import Enum
+
+import strawberry
+from graphql import GraphQLError
+from strawberry.types import Info
+
+from ..core.jobs import Job, SpilledResult
+from .types import Item, ItemType, ItemTypeIndex, link_items, selects_item_type
+
+MAX_PAGE_SIZE = 10_000
+
+
+@strawberry.enum
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@strawberry.type
+class PageInfo:
+    endCursor: str | None
+    hasNextPage: bool
+
+
+@strawberry.type
+class ItemTypePage:
+    nodes: list[ItemType]
+    pageInfo: PageInfo
+    totalCount: int
+
+
+@strawberry.type
+class ItemPage:
+    nodes: list[Item]
+    pageInfo: PageInfo
+    totalCount: int
+
+
+def encode_cursor(section: str, index: int) -> str:
+    return base64.urlsafe_b64encode(f"{section}:{index}".encode()).decode()
+
+
+def decode_cursor(section: str, cursor: str | None) -> int:
+    """Index of the first record after ``cursor`` (0 without one)."""
+    if cursor is None:
+        return 0
+    try:
+        prefix, _, index = base64.urlsafe_b64decode(cursor.encode()).decode().partition(":")
+        if prefix == section and int(index) >= 0:
+            return int(index) + 1
+    except ValueError:
+        pass
+    raise GraphQLError(f"Invalid cursor for {section}", extensions={"code": "BAD_USER_INPUT"})
+
+
+def _read(result: SpilledResult, section: str, start: int, count: int) -> tuple[list[dict], int]:
+    # Page before counting, so the total never trails the page while records are appended
+    records = result.page(section, start, count)
+    return records, result.count(section)
+
+
+async def _window(
+    job: Job, result: SpilledResult, section: str, first: int, after: str | None
+) -> tuple[list[dict], PageInfo, int]:
+    if not 0 < first <= MAX_PAGE_SIZE:
+        raise GraphQLError(f"first must be between 1 and {MAX_PAGE_SIZE}", extensions={"code": "BAD_USER_INPUT"})
+    start = decode_cursor(section, after)
+    records, total = await asyncio.to_thread(_read, result, section, start, first)
+    end = start + len(records)
+    # While the job runs, more records may still arrive after the current end
+    more = end < total or not job.finished
+    cursor = encode_cursor(section, end - 1) if records else after
+    return records, PageInfo(endCursor=cursor, hasNextPage=more), total
+
+
+@strawberry.type
+class NormalizeJob:
+    id: str
+    source: str
+    status: JobStatus
+    processedRecords: int
+    totalRecords: int
+    error: str | None
+    job: strawberry.Private[Job]
+    result: strawberry.Private[SpilledResult]
+    # Built per request from the job's item types, the first time an item page selects them
+    types: strawberry.Private[ItemTypeIndex | None] = None
+
+    @strawberry.field
+    def progress(self) -> float:
+        return self.processedRecords / self.totalRecords if self.totalRecords else float(self.status is JobStatus.DONE)
+
+    @strawberry.field
+    async def itemTypes(self, first: int = 1000, after: str | None = None) -> ItemTypePage:
+        records, page_info, total = await _window(self.job, self.result, "itemTypes", first, after)
+        return ItemTypePage(nodes=[ItemType(**r) for r in records], pageInfo=page_info, totalCount=total)
+
+    @strawberry.field
+    async def items(self, info: Info, first: int = 1000, after: str | None = None) -> ItemPage:
+        records, page_info, total = await _window(self.job, self.result, "items", first, after)
+        nodes = [Item(**r) for r in records]
+        if nodes and selects_item_type(info, "nodes"):
+            if self.types is None:
+                self.types = ItemTypeIndex(await asyncio.to_thread(self._all_item_types))
+            link_items(nodes, self.types)
+        return ItemPage(nodes=nodes, pageInfo=page_info, totalCount=total)
+
+    def _all_item_types(self) -> list[ItemType]:
+        return [ItemType(**r) for r in self.result.page("itemTypes", 0, self.result.count("itemTypes"))]
+
+
+def job_to_type(job: Job, result: SpilledResult) -> NormalizeJob:
+    return NormalizeJob(
+        id=job.id,
+        source=job.source,
+        status=JobStatus(job.status),
+        processedRecords=job.processed_records,
+        totalRecords=job.total_records,
+        error=job.error,
+        job=job,
+        result=result,
+    )
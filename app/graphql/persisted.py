@@ -0,0 +1,64 @@
+"""Automatic persisted queries (Apollo APQ protocol).
+
+A client sends ``extensions.persistedQuery.sha256Hash`` with or without the
+``query``. With the query, the document is registered under its hash; without
+it, the hash is looked up and, if unknown, the client gets a
+``PERSISTED_QUERY_NOT_FOUND`` error and retries with the full document.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+
+class PersistedQueryError(Exception):
+    def __init__(self, message: str, code: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+    def as_response(self) -> dict[str, Any]:
+        return {"data": None, "errors": [{"message": str(self), "extensions": {"code": self.code}}]}
+
+
+class PersistedQueryStore:
+    """Bounded LRU of registered documents keyed by SHA-256 hex digest."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._documents: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, sha256: str) -> str | None:
+        query = self._documents.get(sha256)
+        if query is not None:
+            self._documents.move_to_end(sha256)
+        return query
+
+    def register(self, sha256: str, query: str) -> None:
+        self._documents[sha256] = query
+        self._documents.move_to_end(sha256)
+        while len(self._documents) > self.maxsize:
+            self._documents.popitem(last=False)
+
+    def resolve(self, data: dict[str, Any]) -> None:
+        """Fill in or register ``data["query"]`` in place from its persisted-query extension."""
+        extensions = data.get("extensions")
+        persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        if not isinstance(persisted, dict):
+            return
+        sha256 = persisted.get("sha256Hash")
+        if persisted.get("version") != 1 or not isinstance(sha256, str):
+            raise PersistedQueryError("Unsupported persisted query version", "PERSISTED_QUERY_NOT_SUPPORTED")
+
+        query = data.get("query")
+        if isinstance(query, str):
+            if hashlib.sha256(query.encode()).hexdigest() != sha256:
+                raise PersistedQueryError("provided sha does not match query", "PERSISTED_QUERY_HASH_MISMATCH")
+            self.register(sha256, query)
+            return
+        query = self.get(sha256)
+        if query is None:
+            raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        data["query"] = query
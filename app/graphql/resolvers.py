@@ -1,13 +1,451 @@
-from typing import Any
+import asyncio
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from typing import Any, TypeVar, cast
 
-from .types import Item, ItemType, NormalizeResult
+from graphql import GraphQLError
+from starlette.requests import Request
 
+from ..core.cache import get_result_cache, request_key, result_key
+from ..core.config import get_settings
+from ..core.jobs import get_job_manager
+from ..core.metrics import PAYLOAD_BYTES, PAYLOAD_RECORDS, timed
+from ..core.workers import QueueFullError, get_offload_executor, get_process_pool, get_thread_pool, offload_all
+from ..services.aggregate import normalize_aggregated, normalize_aggregated_lenient
+from ..services.batch import chunk_payload, merge_results
+from ..services.capacity import ContainerSpec, FitResult, fit_containers
+from ..services.catalog import match_issues
+from ..services.columnar import ColumnarBatch, normalize_columnar
+from ..services.delta import Delta, FileSnapshotStore, SnapshotNotFoundError, diff_delta, full_delta
+from ..services.issues import NormalizeIssue
+from ..services.mapping import DEFAULT_PLAN
 from ..services.normalizer import normalize_raw
+from ..services.validation import NORMALIZE_ERRORS, first_issue, normalize_lenient
+from .jobs import NormalizeJob, job_to_type
+from .types import (
+    CatalogMode,
+    ColumnarResult,
+    ContainerFitResult,
+    ContainerIn,
+    ContainerLoad,
+    DeltaMode,
+    DeltaResult,
+    Item,
+    ItemColumns,
+    ItemIn,
+    ItemType,
+    ItemTypeColumns,
+    ItemTypeIn,
+    ItemTypeIndex,
+    NormalizeError,
+    NormalizeResult,
+    PushResult,
+    ValidationMode,
+    link_items,
+)
 
+T = TypeVar("T")
 
-def normalize_payload(source: str, payload: dict[str, Any]) -> NormalizeResult:
-    item_types, items = normalize_raw(source, payload)
+_snapshots: FileSnapshotStore | None = None
+
+
+def get_snapshot_store() -> FileSnapshotStore:
+    global _snapshots
+    if _snapshots is None:
+        settings = get_settings()
+        snapshot_dir = settings.delta_snapshot_dir or os.path.join(tempfile.gettempdir(), "cargo-delta-snapshots")
+        _snapshots = FileSnapshotStore(snapshot_dir, settings.delta_snapshots_per_source, settings.delta_max_sources)
+    return _snapshots
+
+
+def columnar_to_result(batch: ColumnarBatch) -> NormalizeResult:
+    return NormalizeResult(
+        itemTypes=[
+            ItemType(name=n, unitWeightKg=w, unitVolumeM3=v, lengthM=length, widthM=width, heightM=height)
+            for n, w, v, length, width, height in batch.iter_item_type_rows()
+        ],
+        items=[Item(itemTypeName=n, quantity=q) for n, q in batch.iter_item_rows()],
+    )
+
+
+def _errors(issues: list[NormalizeIssue] | None) -> list[NormalizeError]:
+    return [NormalizeError(path=e.path, code=e.code, message=e.message) for e in issues or ()]
+
+
+def columnar_to_columns(batch: ColumnarBatch) -> ColumnarResult:
+    columns = batch.as_columns()
+    return ColumnarResult(
+        names=columns["names"],
+        itemTypes=ItemTypeColumns(**columns["itemTypes"]),
+        items=ItemColumns(**columns["items"]),
+    )
+
+
+def dicts_to_result(
+    item_types: list[dict], items: list[dict], issues: list[NormalizeIssue] | None = None
+) -> NormalizeResult:
     return NormalizeResult(
         itemTypes=[ItemType(**it) for it in item_types],
         items=[Item(**i) for i in items],
+        errors=_errors(issues),
+    )
+
+
+def encode_result(result: NormalizeResult) -> bytes:
+    # Only the plain normalize layout is cached
+    body = {
+        "itemTypes": [{f: getattr(t, f) for f in DEFAULT_PLAN.types} for t in result.itemTypes],
+        "items": [{f: getattr(i, f) for f in DEFAULT_PLAN.items} for i in result.items],
+    }
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def decode_result(data: bytes) -> NormalizeResult:
+    body = json.loads(data)
+    return dicts_to_result(body["itemTypes"], body["items"])
+
+
+def normalize_payload(source: str, payload: dict[str, Any]) -> NormalizeResult:
+    if get_settings().normalize_engine == "columnar":
+        with timed("normalize", source):
+            batch = normalize_columnar(source, payload)
+        with timed("materialize", source):
+            return columnar_to_result(batch)
+    with timed("normalize", source):
+        parts = normalize_raw(source, payload)
+    with timed("materialize", source):
+        return dicts_to_result(*parts)
+
+
+def record_count(payload: dict[str, Any]) -> int:
+    return len(payload.get("types") or []) + len(payload.get("items") or [])
+
+
+def observe_payload(source: str, payload: dict[str, Any], nbytes: int | None = None) -> None:
+    """Record payload size histograms; ``nbytes`` is the request body size when known."""
+    PAYLOAD_RECORDS.observe(record_count(payload), source)
+    if nbytes is not None:
+        PAYLOAD_BYTES.observe(nbytes, source)
+
+
+def _backpressure(e: QueueFullError) -> GraphQLError:
+    return GraphQLError(str(e), extensions={"code": "BACKPRESSURE", "pendingJobs": e.depth})
+
+
+def _invalid_payload(source: str, payload: dict[str, Any], error: Exception) -> GraphQLError:
+    # Only reached after the normalizer failed, so the slower per-record walk costs nothing on clean payloads
+    issue = first_issue(source, payload)
+    if issue is None:
+        return GraphQLError(str(error) or type(error).__name__, extensions={"code": "BAD_USER_INPUT"})
+    return GraphQLError(f"{issue.path}: {issue.message}", extensions={"code": issue.code, "payloadPath": issue.path})
+
+
+async def normalize_payload_offloaded(source: str, payload: dict[str, Any]) -> NormalizeResult:
+    """Normalize small payloads inline and large ones on the configured executor."""
+    if record_count(payload) <= get_settings().normalize_inline_max_records:
+        return normalize_payload(source, payload)
+    executor = get_offload_executor()
+    try:
+        if executor is get_thread_pool():
+            # Threads share memory, so the objects can be built off the loop as well
+            (result,) = await offload_all(normalize_payload, [(source, payload)], executor)
+            return result
+        # Worker processes keep their own registries, so time the round trip from here
+        with timed("normalize", source):
+            (parts,) = await offload_all(normalize_raw, [(source, payload)], executor)
+    except QueueFullError as e:
+        raise _backpressure(e) from None
+    with timed("materialize", source):
+        return dicts_to_result(*parts)
+
+
+async def _normalize_offloaded(fn: Callable[[str, dict[str, Any]], T], source: str, payload: dict[str, Any]) -> T:
+    if record_count(payload) <= get_settings().normalize_inline_max_records:
+        with timed("normalize", source):
+            return fn(source, payload)
+    try:
+        with timed("normalize", source):
+            (result,) = await offload_all(fn, [(source, payload)], get_offload_executor())
+    except QueueFullError as e:
+        raise _backpressure(e) from None
+    return result
+
+
+async def normalize_dicts_offloaded(source: str, payload: dict[str, Any]) -> tuple[list[dict], list[dict]]:
+    """``normalize_raw`` under the same inline/offload policy as ``normalize_payload_offloaded``."""
+    return await _normalize_offloaded(normalize_raw, source, payload)
+
+
+async def normalize_aggregated_offloaded(
+    source: str, payload: dict[str, Any], mode: ValidationMode = ValidationMode.STRICT
+) -> NormalizeResult:
+    """Normalize, then merge item lines and attach totals and reference errors (not cached)."""
+    fn = normalize_aggregated_lenient if mode is ValidationMode.LENIENT else normalize_aggregated
+    try:
+        item_types, items, issues = await _normalize_offloaded(fn, source, payload)
+    except NORMALIZE_ERRORS as e:
+        raise _invalid_payload(source, payload, e) from None
+    with timed("materialize", source):
+        return dicts_to_result(item_types, items, issues)
+
+
+async def normalize_lenient_offloaded(source: str, payload: dict[str, Any]) -> NormalizeResult:
+    """Normalize the valid records and report the skipped ones in ``errors`` (not cached)."""
+    item_types, items, issues = await _normalize_offloaded(normalize_lenient, source, payload)
+    with timed("materialize", source):
+        return dicts_to_result(item_types, items, issues)
+
+
+async def normalize_columnar_offloaded(source: str, payload: dict[str, Any]) -> ColumnarResult:
+    """Normalize with the columnar engine and return the columns as-is, names listed once."""
+    try:
+        batch = await _normalize_offloaded(normalize_columnar, source, payload)
+    except NORMALIZE_ERRORS as e:
+        raise _invalid_payload(source, payload, e) from None
+    with timed("materialize", source):
+        return columnar_to_columns(batch)
+
+
+def _delta_to_result(delta: Delta, base_id: str | None) -> DeltaResult:
+    return DeltaResult(
+        snapshotId=delta.snapshot_id,
+        baseSnapshotId=base_id,
+        added=dicts_to_result(delta.added_types, delta.added_items),
+        changed=dicts_to_result(delta.changed_types, delta.changed_items),
+        removedItemTypes=delta.removed_types,
+        removedItems=delta.removed_items,
+    )
+
+
+async def normalize_delta(source: str, payload: dict[str, Any], mode: DeltaMode, base_id: str | None) -> DeltaResult:
+    """Normalize ``payload`` and return only what changed relative to snapshot ``base_id``."""
+    if mode is DeltaMode.DIFF and base_id is None:
+        raise GraphQLError("DIFF mode requires baseSnapshotId", extensions={"code": "BAD_USER_INPUT"})
+    removed = payload.get("removed")
+    if removed is not None and not isinstance(removed, dict):
+        raise GraphQLError("payload.removed must be an object", extensions={"code": "BAD_USER_INPUT"})
+
+    try:
+        item_types, items = await _normalize_offloaded(normalize_raw, source, payload)
+    except NORMALIZE_ERRORS as e:
+        raise _invalid_payload(source, payload, e) from None
+    store = get_snapshot_store()
+    try:
+        # Snapshot files are read and written on a thread, off the event loop
+        with timed("delta", source):
+            if mode is DeltaMode.DIFF:
+                delta = await asyncio.to_thread(
+                    diff_delta, store, source, item_types, items, removed, cast(str, base_id)
+                )
+            else:
+                delta = await asyncio.to_thread(full_delta, store, source, item_types, items, base_id)
+    except SnapshotNotFoundError as e:
+        raise GraphQLError(str(e), extensions={"code": "SNAPSHOT_NOT_FOUND"}) from None
+    except ValueError as e:
+        raise GraphQLError(str(e), extensions={"code": "BAD_USER_INPUT"}) from None
+    with timed("materialize", source):
+        return _delta_to_result(delta, base_id)
+
+
+async def normalize_and_push(source: str, payload: dict[str, Any], container_id: str) -> PushResult:
+    """Normalize ``payload`` and deliver it to the storage backend (item types, then the container's items)."""
+    # Imported on first use so that httpx stays off the startup path
+    from ..core.push import PushError, get_pusher
+
+    pusher = get_pusher()
+    if pusher is None:
+        raise GraphQLError("BACKEND_BASE_URL is not configured", extensions={"code": "PUSH_NOT_CONFIGURED"})
+    try:
+        item_types, items = await _normalize_offloaded(normalize_raw, source, payload)
+    except NORMALIZE_ERRORS as e:
+        raise _invalid_payload(source, payload, e) from None
+    try:
+        with timed("push", source):
+            report = await pusher.push(container_id, item_types, items)
+    except PushError as e:
+        raise GraphQLError(str(e), extensions={"code": "BACKEND_ERROR"}) from None
+    return PushResult(
+        itemTypesCreated=report.item_types_created,
+        itemsSent=report.items_sent,
+        outboxedItemTypes=report.outboxed_item_types,
+        outboxedItems=report.outboxed_items,
+        errors=_errors(report.issues),
+    )
+
+
+async def attach_catalog(source: str, result: NormalizeResult, mode: CatalogMode) -> NormalizeResult:
+    """Give ``result`` backend ids and canonical names from the catalogue; each distinct name is looked up once."""
+    from ..core.catalog import CatalogUnavailableError, get_catalog
+
+    catalog = get_catalog()
+    if catalog is None:
+        raise GraphQLError("BACKEND_BASE_URL is not configured", extensions={"code": "CATALOG_NOT_CONFIGURED"})
+    try:
+        index = await catalog.get()
+    except CatalogUnavailableError as e:
+        raise GraphQLError(str(e), extensions={"code": "BACKEND_ERROR"}) from None
+    with timed("catalog", source):
+        type_names = [t.name for t in result.itemTypes]
+        item_names = [i.itemTypeName for i in result.items]
+        resolved = index.resolve_all(type_names + item_names, fuzzy=mode is CatalogMode.FUZZY)
+        for t in result.itemTypes:
+            match = resolved[t.name]
+            if match is not None:
+                t.id, t.name = str(match.id), match.name
+        for i in result.items:
+            match = resolved[i.itemTypeName]
+            if match is not None:
+                i.itemTypeId, i.itemTypeName = str(match.id), match.name
+        issues = match_issues("itemTypes", "name", type_names, resolved)
+        issues += match_issues("items", "itemTypeName", item_names, resolved)
+        result.errors.extend(_errors(issues))
+    return result
+
+
+async def submit_normalize_job(source: str, payload: dict[str, Any]) -> NormalizeJob:
+    manager = get_job_manager()
+    try:
+        job = await manager.submit(source, payload)
+    except QueueFullError as e:
+        raise _backpressure(e) from None
+    return job_to_type(job, manager.result(job))
+
+
+async def get_normalize_job(job_id: str) -> NormalizeJob | None:
+    """The job from whichever worker accepted it; its state is read from the shared jobs directory."""
+    manager = get_job_manager()
+    job = await asyncio.to_thread(manager.get, job_id)
+    return job_to_type(job, manager.result(job)) if job is not None else None
+
+
+async def _normalize_payload_checked(source: str, payload: dict[str, Any]) -> NormalizeResult:
+    try:
+        return await normalize_payload_offloaded(source, payload)
+    except NORMALIZE_ERRORS as e:
+        raise _invalid_payload(source, payload, e) from None
+
+
+async def normalize_payload_cached(
+    source: str, payload: dict[str, Any], request: Request | None = None, field: str = ""
+) -> NormalizeResult:
+    """``normalize_payload_offloaded`` behind the content-addressed result cache.
+
+    With the JSON ``request`` that carried the mutation, the key is a digest
+    of its body scoped to the response key ``field``; without one, of the
+    canonicalized payload. Invalid payloads fail with the path of the first
+    bad value (``INVALID_VALUE`` etc.).
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return await _normalize_payload_checked(source, payload)
+    if request is not None and "application/json" in request.headers.get("content-type", ""):
+        key = await request_key(await request.body(), "result", field)
+    else:
+        key = result_key(source, payload)
+    hit = cache.get(key)
+    if hit is not None:
+        with timed("materialize", source):
+            return decode_result(hit)
+    result = await _normalize_payload_checked(source, payload)
+    cache.set(key, encode_result(result))
+    return result
+
+
+async def normalize_many_payloads(inputs: list[tuple[str, dict[str, Any]]]) -> list[NormalizeResult]:
+    """Normalize every input on the process pool, chunking large ones, and keep input order."""
+    chunk_size = get_settings().normalize_chunk_size
+
+    for source, payload in inputs:
+        observe_payload(source, payload)
+    plans = [(source, chunk_payload(payload, chunk_size)) for source, payload in inputs]
+    calls = [(source, chunk) for source, chunks in plans for chunk in chunks]
+    try:
+        with timed("normalize"):
+            parts = await offload_all(normalize_raw, calls, get_process_pool())
+    except QueueFullError as e:
+        raise _backpressure(e) from None
+
+    results = []
+    offset = 0
+    for source, chunks in plans:
+        with timed("materialize", source):
+            results.append(dicts_to_result(*merge_results(parts[offset : offset + len(chunks)])))
+        offset += len(chunks)
+    return results
+
+
+def _item_type_from_input(t: ItemTypeIn) -> ItemType:
+    return ItemType(
+        name=t.name,
+        unitWeightKg=t.unitWeightKg,
+        unitVolumeM3=t.unitVolumeM3,
+        lengthM=t.lengthM,
+        widthM=t.widthM,
+        heightM=t.heightM,
+    )
+
+
+def normalize_typed(source: str, item_types: list[ItemTypeIn], items: list[ItemIn]) -> NormalizeResult:
+    """Copy already-typed canonical inputs into the result; no alias lookup or casts."""
+    PAYLOAD_RECORDS.observe(len(item_types) + len(items), source)
+    with timed("materialize", source):
+        return NormalizeResult(
+            itemTypes=[_item_type_from_input(t) for t in item_types],
+            items=[Item(itemTypeName=i.itemTypeName, quantity=i.quantity) for i in items],
+        )
+
+
+def _fit_to_result(fit: FitResult, item_types: list[ItemTypeIn]) -> ContainerFitResult:
+    result = ContainerFitResult(
+        containers=[
+            ContainerLoad(
+                name=c.name,
+                weightKg=c.weight_kg,
+                volumeM3=c.volume_m3,
+                weightUtilization=c.weight_utilization,
+                volumeUtilization=c.volume_utilization,
+                overflowWeightKg=c.overflow_weight_kg,
+                overflowVolumeM3=c.overflow_volume_m3,
+                fits=c.fits,
+                items=[Item(itemTypeName=n, quantity=q) for n, q in c.items],
+            )
+            for c in fit.containers
+        ],
+        unassigned=[Item(itemTypeName=n, quantity=q) for n, q in fit.unassigned],
+        errors=_errors(fit.issues),
+    )
+    # Item lines resolve ``itemType`` against the request's own item types
+    index = ItemTypeIndex(lambda: [_item_type_from_input(t) for t in item_types])
+    link_items(result.unassigned, index)
+    for container in result.containers:
+        link_items(container.items, index)
+    return result
+
+
+def _item_dicts(items: list[ItemIn]) -> list[dict]:
+    return [{"itemTypeName": i.itemTypeName, "quantity": i.quantity} for i in items]
+
+
+async def fit_containers_offloaded(
+    item_types: list[ItemTypeIn], items: list[ItemIn], containers: list[ContainerIn]
+) -> ContainerFitResult:
+    """Check container loads and assign loose items; large inputs run off the event loop."""
+    args = (
+        [{"name": t.name, "unitWeightKg": t.unitWeightKg, "unitVolumeM3": t.unitVolumeM3} for t in item_types],
+        _item_dicts(items),
+        [ContainerSpec(c.name, c.maxWeightKg, c.maxVolumeM3, tuple(_item_dicts(c.items or []))) for c in containers],
     )
+    lines = len(items) + sum(len(c.items or ()) for c in containers)
+    if lines <= get_settings().normalize_inline_max_records:
+        with timed("fit"):
+            fit = fit_containers(*args)
+    else:
+        try:
+            with timed("fit"):
+                (fit,) = await offload_all(fit_containers, [args], get_offload_executor())
+        except QueueFullError as e:
+            raise _backpressure(e) from None
+    with timed("materialize"):
+        return _fit_to_result(fit, item_types)
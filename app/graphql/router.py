@@ -0,0 +1,120 @@
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from strawberry.fastapi import GraphQLRouter
+
+from ..core.cache import get_result_cache, request_key
+from ..core.metrics import PAYLOAD_BYTES, PAYLOAD_RECORDS, timed
+from ..services.wire import expand_payload
+from .fastpath import match_normalize, render, typed_lists
+from .persisted import PersistedQueryError, PersistedQueryStore
+from .resolvers import normalize_dicts_offloaded, observe_payload
+
+# Body parsed by the fast-path probe, reused by Strawberry when it falls back
+_parsed_body: ContextVar[tuple[bytes, Any] | None] = ContextVar("_parsed_body", default=None)
+
+
+class CargoGraphQLRouter(GraphQLRouter):
+    """GraphQLRouter with persisted queries and a fast path for plain ``normalize``/``normalizeTyped`` mutations."""
+
+    def __init__(self, *args: Any, persisted_queries: PersistedQueryStore | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.persisted_queries = persisted_queries
+
+    async def run(self, request: Any, context: Any = None, root_value: Any = None) -> Any:
+        if isinstance(request, Request) and request.method == "POST":
+            data = await self._read_json(request)
+            if isinstance(data, dict):
+                if self.persisted_queries is not None:
+                    try:
+                        self.persisted_queries.resolve(data)
+                    except PersistedQueryError as e:
+                        return JSONResponse(e.as_response())
+                response = await self._try_fast_path(request, data)
+                if response is not None:
+                    return response
+        return await super().run(request, context=context, root_value=root_value)
+
+    def decode_json(self, data: str | bytes) -> object:
+        cached = _parsed_body.get()
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        return super().decode_json(data)
+
+    def encode_json(self, data: object) -> str | bytes:
+        with timed("serialize"):
+            return super().encode_json(data)
+
+    async def _read_json(self, request: Request) -> Any:
+        if "application/json" not in request.headers.get("content-type", ""):
+            return None
+        body = await request.body()
+        try:
+            with timed("parse"):
+                data = self.decode_json(body)
+        except ValueError:
+            return None
+        # Strawberry re-reads the same (cached) body object on fallback
+        _parsed_body.set((body, data))
+        return data
+
+    async def _try_fast_path(self, request: Request, data: dict[str, Any]) -> Response | None:
+        if not isinstance(data.get("query"), str):
+            return None
+        operation_name = data.get("operationName")
+        shape = match_normalize(data["query"], operation_name if isinstance(operation_name, str) else None)
+        if shape is None:
+            return None
+        variables = data.get("variables")
+        args = shape.resolve_arguments(variables if isinstance(variables, dict) else None)
+        if args is None:
+            return None
+        source = args["source"]
+        # A plain normalize response is fully determined by the request body, so it is cached as sent
+        cache = get_result_cache() if shape.field == "normalize" else None
+        key = None
+        if cache is not None:
+            body = await request.body()
+            key = await request_key(body, "response")
+            hit = cache.get(key)
+            if hit is not None:
+                PAYLOAD_BYTES.observe(len(body), source)
+                return await self._response(request, hit)
+
+        result: tuple[list[dict], list[dict]] | None
+        if shape.field == "normalizeTyped":
+            result = typed_lists(args["itemTypes"], args["items"])
+            if result is not None:
+                PAYLOAD_RECORDS.observe(len(result[0]) + len(result[1]), source)
+        else:
+            result = await self._normalize_fast(request, source, args["payload"])
+        if result is None:
+            return None
+
+        with timed("serialize", source):
+            content = render(shape, result)
+        if cache is not None and key is not None:
+            cache.set(key, content)
+        return await self._response(request, content)
+
+    async def _response(self, request: Request, content: bytes) -> Response:
+        response = Response(content, media_type="application/json")
+        sub_response = await self.get_sub_response(request)
+        response.headers.raw.extend(sub_response.headers.raw)
+        return response
+
+    async def _normalize_fast(
+        self, request: Request, source: str, payload: dict[str, Any]
+    ) -> tuple[list[dict], list[dict]] | None:
+        try:
+            payload = expand_payload(payload)
+        except ValueError:
+            return None
+        observe_payload(source, payload, len(await request.body()))
+        try:
+            return await normalize_dicts_offloaded(source, payload)
+        except Exception:
+            # Let regular execution report the error in GraphQL form
+            return None
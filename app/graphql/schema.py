@@ -1,27 +1,113 @@
-from typing import TYPE_CHECKING, Any, cast
+from typing import Any, cast
 
 import strawberry
-from strawberry.scalars import JSON as JSONScalar
+from strawberry.extensions import ParserCache, ValidationCache
 from strawberry.types import Info
 
-from .types import NormalizeResult
-from .resolvers import normalize_payload
+from ..core.config import get_settings
+from ..services.wire import expand_payload
+from .extensions import MetricsExtension
+from .jobs import NormalizeJob
+from .resolvers import (
+    attach_catalog,
+    fit_containers_offloaded,
+    get_normalize_job,
+    normalize_aggregated_offloaded,
+    normalize_and_push,
+    normalize_columnar_offloaded,
+    normalize_delta,
+    normalize_lenient_offloaded,
+    normalize_many_payloads,
+    normalize_payload_cached,
+    normalize_typed,
+    observe_payload,
+    submit_normalize_job,
+)
+from .types import (
+    CatalogMode,
+    ColumnarResult,
+    ContainerFitResult,
+    ContainerIn,
+    DeltaMode,
+    DeltaResult,
+    ItemIn,
+    ItemTypeIn,
+    JSONInput,
+    NormalizeInput,
+    NormalizeResult,
+    PushResult,
+    ValidationMode,
+)
 
 
-# Use Strawberry's JSON scalar at runtime while keeping type-checkers happy
-if TYPE_CHECKING:
-    JSONInput = Any
-else:
-    JSONInput = JSONScalar
+def _payload(info: Info, source: str, payload: JSONInput) -> dict[str, Any]:
+    # mypy: JSON is a runtime scalar (Any); cast to dict for downstream function
+    payload_dict = expand_payload(cast(dict[str, Any], payload or {}))
+    request = info.context.get("request")
+    content_length = request.headers.get("content-length") if request is not None else None
+    observe_payload(source, payload_dict, int(content_length) if content_length else None)
+    return payload_dict
 
 
 @strawberry.type
 class Mutation:
     @strawberry.mutation
-    def normalize(self, info: Info, source: str, payload: JSONInput) -> NormalizeResult:
-        # mypy: JSON is a runtime scalar (Any); cast to dict for downstream function
-        payload_dict = cast(dict[str, Any], payload or {})
-        return normalize_payload(source=source, payload=payload_dict)
+    async def normalize(
+        self,
+        info: Info,
+        source: str,
+        payload: JSONInput,
+        aggregate: bool = False,
+        mode: ValidationMode = ValidationMode.STRICT,
+        catalog: CatalogMode = CatalogMode.NONE,
+    ) -> NormalizeResult:
+        payload_dict = _payload(info, source, payload)
+        if aggregate:
+            result = await normalize_aggregated_offloaded(source, payload_dict, mode)
+        elif mode is ValidationMode.LENIENT:
+            result = await normalize_lenient_offloaded(source, payload_dict)
+        else:
+            result = await normalize_payload_cached(
+                source, payload_dict, request=info.context.get("request"), field=str(info.path.key)
+            )
+        if catalog is not CatalogMode.NONE:
+            result = await attach_catalog(source, result, catalog)
+        return result
+
+    @strawberry.mutation(name="normalizeTyped")
+    def normalize_typed(
+        self, info: Info, source: str, itemTypes: list[ItemTypeIn], items: list[ItemIn]
+    ) -> NormalizeResult:
+        return normalize_typed(source, itemTypes, items)
+
+    @strawberry.mutation(name="normalizeMany")
+    async def normalize_many(self, info: Info, inputs: list[NormalizeInput]) -> list[NormalizeResult]:
+        return await normalize_many_payloads(
+            [(i.source, expand_payload(cast(dict[str, Any], i.payload or {}))) for i in inputs]
+        )
+
+    @strawberry.mutation(name="normalizeColumnar")
+    async def normalize_columnar(self, info: Info, source: str, payload: JSONInput) -> ColumnarResult:
+        return await normalize_columnar_offloaded(source, _payload(info, source, payload))
+
+    @strawberry.mutation(name="submitNormalizeJob")
+    async def submit_normalize_job(self, info: Info, source: str, payload: JSONInput) -> NormalizeJob:
+        return await submit_normalize_job(source, _payload(info, source, payload))
+
+    @strawberry.mutation(name="normalizeAndPush")
+    async def normalize_and_push(self, info: Info, source: str, payload: JSONInput, containerId: str) -> PushResult:
+        return await normalize_and_push(source, _payload(info, source, payload), containerId)
+
+    @strawberry.mutation(name="normalizeDelta")
+    async def normalize_delta(
+        self,
+        info: Info,
+        source: str,
+        payload: JSONInput,
+        mode: DeltaMode = DeltaMode.FULL,
+        baseSnapshotId: str | None = None,
+    ) -> DeltaResult:
+        return await normalize_delta(source, _payload(info, source, payload), mode, baseSnapshotId)
 
 
 @strawberry.type
@@ -30,5 +116,25 @@ class Query:
     def health(self) -> str:
         return "ok"
 
+    @strawberry.field(name="containerFit")
+    async def container_fit(
+        self, itemTypes: list[ItemTypeIn], items: list[ItemIn], containers: list[ContainerIn]
+    ) -> ContainerFitResult:
+        return await fit_containers_offloaded(itemTypes, items, containers)
+
+    @strawberry.field(name="normalizeJob")
+    async def normalize_job(self, id: str) -> NormalizeJob | None:
+        return await get_normalize_job(id)
+
+
+_document_cache_size = get_settings().graphql_document_cache_size
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[
+        MetricsExtension,
+        ParserCache(maxsize=_document_cache_size),
+        ValidationCache(maxsize=_document_cache_size),
+    ],
+)
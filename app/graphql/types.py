@@ -1,4 +1,43 @@
+from collections.abc import Callable, Iterable, Iterator
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
 import strawberry
+from strawberry.scalars import JSON as JSONScalar
+from strawberry.types import Info
+from strawberry.types.nodes import SelectedField, Selection
+
+# Use Strawberry's JSON scalar at runtime while keeping type-checkers happy
+if TYPE_CHECKING:
+    JSONInput = Any
+else:
+    JSONInput = JSONScalar
+
+
+@strawberry.enum
+class DeltaMode(Enum):
+    # payload is the complete record set
+    FULL = "full"
+    # payload holds upserts and ``removed`` names relative to baseSnapshotId
+    DIFF = "diff"
+
+
+@strawberry.enum
+class ValidationMode(Enum):
+    # the first invalid value fails the request, with its path
+    STRICT = "strict"
+    # invalid records are skipped and reported in ``errors``
+    LENIENT = "lenient"
+
+
+@strawberry.enum
+class CatalogMode(Enum):
+    # leave names as normalized, without backend ids
+    NONE = "none"
+    # case- and whitespace-insensitive match against the backend catalogue
+    EXACT = "exact"
+    # EXACT, then the closest name above CATALOG_FUZZY_CUTOFF
+    FUZZY = "fuzzy"
 
 
 @strawberry.input
@@ -17,6 +56,21 @@ class ItemIn:
     quantity: int
 
 
+@strawberry.input
+class ContainerIn:
+    name: str
+    maxWeightKg: float
+    maxVolumeM3: float
+    # Current load, checked as-is before loose items are assigned
+    items: list[ItemIn] | None = None
+
+
+@strawberry.input
+class NormalizeInput:
+    source: str
+    payload: JSONInput
+
+
 @strawberry.type
 class ItemType:
     name: str
@@ -25,15 +79,172 @@ class ItemType:
     lengthM: float | None = None
     widthM: float | None = None
     heightM: float | None = None
+    # Backend id; only filled in by ``normalize(catalog: EXACT | FUZZY)``
+    id: str | None = None
+
+
+class ItemTypeIndex:
+    """Item types by name (first definition wins), shared by the items of one result.
+
+    Built on the first lookup, so results whose items never select ``itemType``
+    or the totals pay nothing, and every later lookup is one dict hit.
+    """
+
+    def __init__(self, item_types: Iterable["ItemType"] | Callable[[], Iterable["ItemType"]]) -> None:
+        self._source = item_types
+        self._by_name: dict[str, ItemType] | None = None
+
+    def get(self, name: str) -> "ItemType | None":
+        if self._by_name is None:
+            by_name: dict[str, ItemType] = {}
+            for t in self._source() if callable(self._source) else self._source:
+                by_name.setdefault(t.name, t)
+            self._by_name = by_name
+        return self._by_name.get(name)
+
+
+def link_items(items: Iterable["Item"], index: ItemTypeIndex) -> None:
+    for item in items:
+        item.types = index
+
+
+# Item fields that need the item's type
+LINKED_ITEM_FIELDS = frozenset(("itemType", "totalWeightKg", "totalVolumeM3"))
+
+
+def _selected(selections: Iterable[Selection], path: tuple[str, ...]) -> Iterator[SelectedField]:
+    for sel in selections:
+        if not isinstance(sel, SelectedField):
+            yield from _selected(sel.selections, path)  # fragments
+        elif not path:
+            yield sel
+        elif sel.name == path[0]:
+            yield from _selected(sel.selections, path[1:])
+
+
+def selects_item_type(info: Info, *path: str) -> bool:
+    """Whether the items at ``path`` below the current field select ``itemType`` or a line total."""
+    return any(
+        f.name in LINKED_ITEM_FIELDS for field in info.selected_fields for f in _selected(field.selections, path)
+    )
 
 
 @strawberry.type
 class Item:
     itemTypeName: str
     quantity: int
+    # Backend item type id; only filled in by ``normalize(catalog: EXACT | FUZZY)``
+    itemTypeId: str | None = None
+    # Line totals precomputed by ``normalize(aggregate: true)``; otherwise derived from ``itemType``
+    totalWeightKg: strawberry.Private[float | None] = None
+    totalVolumeM3: strawberry.Private[float | None] = None
+    types: strawberry.Private[ItemTypeIndex | None] = None
+
+    def _item_type(self) -> "ItemType | None":
+        return self.types.get(self.itemTypeName) if self.types is not None else None
+
+    @strawberry.field(name="itemType")
+    def item_type(self) -> "ItemType | None":
+        return self._item_type()
+
+    @strawberry.field(name="totalWeightKg")
+    def total_weight_kg(self) -> float | None:
+        if self.totalWeightKg is not None:
+            return self.totalWeightKg
+        t = self._item_type()
+        return self.quantity * t.unitWeightKg if t is not None else None
+
+    @strawberry.field(name="totalVolumeM3")
+    def total_volume_m3(self) -> float | None:
+        if self.totalVolumeM3 is not None:
+            return self.totalVolumeM3
+        t = self._item_type()
+        return self.quantity * t.unitVolumeM3 if t is not None else None
+
+
+@strawberry.type
+class NormalizeError:
+    path: str
+    code: str
+    message: str
 
 
 @strawberry.type
 class NormalizeResult:
     itemTypes: list[ItemType]
+    items: strawberry.Private[list[Item]]
+    errors: list[NormalizeError] = strawberry.field(default_factory=list)
+
+    @strawberry.field(name="items")
+    def linked_items(self, info: Info) -> list[Item]:
+        # Items are linked to their types only when a selection resolves through them
+        if self.items and selects_item_type(info):
+            link_items(self.items, ItemTypeIndex(self.itemTypes))
+        return self.items
+
+
+@strawberry.type
+class PushResult:
+    itemTypesCreated: int
+    itemsSent: int
+    # Left in the outbox after retries; sent before the next push
+    outboxedItemTypes: int
+    outboxedItems: int
+    errors: list[NormalizeError] = strawberry.field(default_factory=list)
+
+
+@strawberry.type
+class ItemTypeColumns:
+    # Index into ColumnarResult.names
+    nameIndex: list[int]
+    unitWeightKg: list[float]
+    unitVolumeM3: list[float]
+    lengthM: list[float | None]
+    widthM: list[float | None]
+    heightM: list[float | None]
+
+
+@strawberry.type
+class ItemColumns:
+    # Index into ColumnarResult.names
+    itemTypeNameIndex: list[int]
+    quantity: list[int]
+
+
+@strawberry.type
+class ColumnarResult:
+    names: list[str]
+    itemTypes: ItemTypeColumns
+    items: ItemColumns
+
+
+@strawberry.type
+class ContainerLoad:
+    name: str
+    weightKg: float
+    volumeM3: float
+    # Null when the container has no capacity in that dimension
+    weightUtilization: float | None
+    volumeUtilization: float | None
+    overflowWeightKg: float
+    overflowVolumeM3: float
+    fits: bool
     items: list[Item]
+
+
+@strawberry.type
+class ContainerFitResult:
+    containers: list[ContainerLoad]
+    unassigned: list[Item]
+    errors: list[NormalizeError]
+
+
+@strawberry.type
+class DeltaResult:
+    snapshotId: str
+    baseSnapshotId: str | None
+    added: NormalizeResult
+    changed: NormalizeResult
+    removedItemTypes: list[str]
+    # Items are keyed by itemTypeName in delta mode
+    removedItems: list[str]
@@ -0,0 +1,238 @@
+"""Production runner: preload the app, bind once, fork uvicorn workers.
+
+``python -m app.server`` builds the app (and with it the Strawberry schema and
+source plans) in the master process, binds the listening socket, and forks
+``SERVER_WORKERS`` children that share both copy-on-write. Each child runs its
+own ``uvicorn.Server`` on the inherited socket. It exits gracefully after
+``SERVER_MAX_REQUESTS`` requests (plus up to ``SERVER_MAX_REQUESTS_JITTER``,
+so workers do not recycle together) or once its RSS exceeds
+``SERVER_MAX_RSS_MB``. The master replaces every worker that exits until it
+receives SIGTERM/SIGINT, which it forwards. POSIX only.
+
+Each worker starts its own normalize process pool, so unless
+``NORMALIZE_POOL_WORKERS`` is set the available CPUs are divided between the
+workers instead of every worker taking all of them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import math
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import cast
+
+import uvicorn
+from uvicorn.config import HTTPProtocolType, LoopSetupType
+
+from .api import create_app
+from .core.config import get_settings
+
+logger = logging.getLogger("app.server")
+
+# A worker that dies sooner than this after starting is respawned with a delay, not in a tight loop
+_MIN_WORKER_SECONDS = 1.0
+# RSS is sampled on uvicorn's 100 ms tick
+_RSS_CHECK_TICKS = 50
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 quota when there is one."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def pool_workers_per_worker(workers: int) -> int:
+    """Normalize pool size per worker that keeps the whole server at about one process per CPU."""
+    return max(1, available_cpus() // workers)
+
+
+def rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@dataclass
+class ServerOptions:
+    host: str
+    port: int
+    workers: int
+    # NORMALIZE_POOL_WORKERS for every worker (0: keep the setting)
+    pool_workers: int = 0
+    loop: LoopSetupType = "auto"
+    http: HTTPProtocolType = "auto"
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+    max_rss_mb: int = 0
+    backlog: int = 2048
+    graceful_timeout: int = 30
+
+
+class RecyclingServer(uvicorn.Server):
+    """``uvicorn.Server`` that also shuts down once the process RSS exceeds ``max_rss_bytes``."""
+
+    def __init__(self, config: uvicorn.Config, max_rss_bytes: int = 0) -> None:
+        super().__init__(config)
+        self.max_rss_bytes = max_rss_bytes
+
+    async def on_tick(self, counter: int) -> bool:
+        if self.max_rss_bytes and counter % _RSS_CHECK_TICKS == 0:
+            rss = rss_bytes()
+            if rss is not None and rss > self.max_rss_bytes:
+                logger.warning("Worker %d RSS %d MiB over limit; recycling", os.getpid(), rss >> 20)
+                return True
+        return await super().on_tick(counter)
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket, options: ServerOptions) -> None:
+    # Children start with default signal handling; uvicorn installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if options.max_requests:
+        config.limit_max_requests = options.max_requests + random.randint(0, options.max_requests_jitter)
+    RecyclingServer(config, options.max_rss_mb << 20).run(sockets=[sock])
+
+
+def _spawn(config: uvicorn.Config, sock: socket.socket, options: ServerOptions) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(config, sock, options)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            code = 1
+        finally:
+            # Never fall back into the master's loop
+            os._exit(code)
+    return pid
+
+
+def serve(options: ServerOptions) -> None:
+    if not hasattr(os, "fork"):
+        raise SystemExit("app.server needs fork(); use `uvicorn main:app` on this platform")
+
+    if options.pool_workers:
+        # Before create_app(), so every forked worker inherits it
+        get_settings().normalize_pool_workers = options.pool_workers
+    # Preload: everything imported and built here is shared copy-on-write by the workers
+    config = uvicorn.Config(
+        create_app(),
+        host=options.host,
+        port=options.port,
+        loop=options.loop,
+        http=options.http,
+        backlog=options.backlog,
+        timeout_graceful_shutdown=options.graceful_timeout,
+        log_config=None,
+    )
+    sock = config.bind_socket()
+    # Keep the collector away from the preloaded objects, so workers do not copy their pages by touching them
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Master %d serving on %s:%d with %d workers (normalize pool: %d processes each)",
+        os.getpid(),
+        options.host,
+        options.port,
+        options.workers,
+        get_settings().normalize_pool_workers or available_cpus(),
+    )
+
+    children: dict[int, float] = {}
+    stopping = False
+
+    def stop(signum: int, _frame: object) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(options.workers):
+        children[_spawn(config, sock, options)] = time.monotonic()
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        if code != 0 and time.monotonic() - started < _MIN_WORKER_SECONDS:
+            logger.error("Worker %d exited with %d right after start; respawning in 1s", pid, code)
+            time.sleep(1.0)
+        else:
+            logger.info("Worker %d exited with %d; respawning", pid, code)
+        if not stopping:
+            children[_spawn(config, sock, options)] = time.monotonic()
+    sock.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run the service with preloaded, forked uvicorn workers")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=settings.server_workers, help="0: one per available CPU")
+    parser.add_argument(
+        "--pool-workers",
+        type=int,
+        default=settings.normalize_pool_workers,
+        help="normalize pool processes per worker (0: available CPUs / workers)",
+    )
+    parser.add_argument("--loop", choices=("auto", "asyncio", "uvloop"), default=settings.server_loop)
+    parser.add_argument("--http", choices=("auto", "h11", "httptools"), default=settings.server_http)
+    parser.add_argument("--max-requests", type=int, default=settings.server_max_requests, help="0: never recycle")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.server_max_requests_jitter)
+    parser.add_argument("--max-rss-mb", type=int, default=settings.server_max_rss_mb, help="0: no RSS limit")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--graceful-timeout", type=int, default=settings.server_graceful_timeout_seconds)
+    args = parser.parse_args(argv)
+
+    workers = args.workers or available_cpus()
+    serve(
+        ServerOptions(
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            pool_workers=args.pool_workers or pool_workers_per_worker(workers),
+            loop=cast(LoopSetupType, args.loop),
+            http=cast(HTTPProtocolType, args.http),
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            max_rss_mb=args.max_rss_mb,
+            backlog=args.backlog,
+            graceful_timeout=args.graceful_timeout,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
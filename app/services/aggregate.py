@@ -0,0 +1,65 @@
+"""Post-normalization stage: cross-reference items against item types and merge lines.
+
+One pass over ``items`` against a hash index of ``itemTypes`` by name. Duplicate
+lines for the same type are merged (first occurrence keeps its position) and
+every line gets ``totalWeightKg``/``totalVolumeM3``. Lines whose type is not
+defined are kept, with null totals, and reported as ``UNKNOWN_ITEM_TYPE``.
+"""
+
+from typing import Any
+
+from .issues import NormalizeIssue
+from .normalizer import normalize_raw
+from .validation import normalize_lenient_indexed
+
+UNKNOWN_ITEM_TYPE = "UNKNOWN_ITEM_TYPE"
+
+
+def aggregate_items(
+    item_types: list[dict], items: list[dict], positions: list[int] | None = None
+) -> tuple[list[dict], list[dict], list[NormalizeIssue]]:
+    """``positions`` maps each item to its index in the raw payload when invalid rows were skipped."""
+    index: dict[str, dict] = {}
+    for t in item_types:
+        # First definition wins, matching how the backend resolves duplicates
+        index.setdefault(t["name"], t)
+
+    merged: dict[str, dict[str, Any]] = {}
+    issues: list[NormalizeIssue] = []
+    for i, item in enumerate(items):
+        name = item["itemTypeName"]
+        if name not in index:
+            issues.append(
+                NormalizeIssue(
+                    f"items[{positions[i] if positions else i}].itemTypeName",
+                    UNKNOWN_ITEM_TYPE,
+                    f"Item type {name!r} is not defined",
+                )
+            )
+        line = merged.get(name)
+        if line is None:
+            line = merged[name] = {"itemTypeName": name, "quantity": 0}
+        line["quantity"] += item["quantity"]
+
+    for name, line in merged.items():
+        item_type = index.get(name)
+        if item_type is None:
+            line["totalWeightKg"] = line["totalVolumeM3"] = None
+        else:
+            line["totalWeightKg"] = line["quantity"] * item_type["unitWeightKg"]
+            line["totalVolumeM3"] = line["quantity"] * item_type["unitVolumeM3"]
+    return item_types, list(merged.values()), issues
+
+
+def normalize_aggregated(source: str, raw: dict[str, Any]) -> tuple[list[dict], list[dict], list[NormalizeIssue]]:
+    """``normalize_raw`` followed by ``aggregate_items``; picklable for the process pool."""
+    return aggregate_items(*normalize_raw(source, raw))
+
+
+def normalize_aggregated_lenient(
+    source: str, raw: dict[str, Any]
+) -> tuple[list[dict], list[dict], list[NormalizeIssue]]:
+    """Like ``normalize_aggregated``, but invalid records are skipped and reported first."""
+    item_types, items, issues, positions = normalize_lenient_indexed(source, raw)
+    item_types, merged, reference_issues = aggregate_items(item_types, items, positions)
+    return item_types, merged, issues + reference_issues
@@ -0,0 +1,22 @@
+from typing import Any
+
+
+def chunk_payload(raw: dict[str, Any], chunk_size: int) -> list[dict[str, Any]]:
+    """Split a payload into chunks of at most ``chunk_size`` records each, types first."""
+    types_raw = raw.get("types") or []
+    items_raw = raw.get("items") or []
+    chunks: list[dict[str, Any]] = [
+        {"types": types_raw[i : i + chunk_size]} for i in range(0, len(types_raw), chunk_size)
+    ]
+    chunks += [{"items": items_raw[i : i + chunk_size]} for i in range(0, len(items_raw), chunk_size)]
+    return chunks
+
+
+def merge_results(parts: list[tuple[list[dict], list[dict]]]) -> tuple[list[dict], list[dict]]:
+    """Concatenate chunk results in chunk order."""
+    item_types: list[dict] = []
+    items: list[dict] = []
+    for part_types, part_items in parts:
+        item_types.extend(part_types)
+        items.extend(part_items)
+    return item_types, items
@@ -0,0 +1,173 @@
+"""Container capacity check and first-fit-decreasing assignment.
+
+Each container may already hold items (its current load); those are summed
+into per-container weight/volume columns (``array('d')``, one slot per
+container). Loose items are then packed with first-fit decreasing. Units of
+one item type are identical, so lines are first merged per type and each type
+is placed as a block of units, split across containers where needed; the scan
+is bounded by types x containers rather than lines x containers. Types are
+ordered by unit size relative to the largest container, and containers that
+cannot take even the smallest unit are dropped from the scan.
+"""
+
+from array import array
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from .aggregate import UNKNOWN_ITEM_TYPE
+from .issues import NormalizeIssue
+
+# Slack for float rounding when dividing remaining capacity by a unit size
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class ContainerSpec:
+    name: str
+    max_weight_kg: float
+    max_volume_m3: float
+    # Items already loaded, as normalized item dicts
+    items: tuple[dict, ...] = ()
+
+
+@dataclass
+class ContainerLoad:
+    name: str
+    weight_kg: float
+    volume_m3: float
+    weight_utilization: float | None
+    volume_utilization: float | None
+    overflow_weight_kg: float
+    overflow_volume_m3: float
+    items: list[tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return self.overflow_weight_kg == 0 and self.overflow_volume_m3 == 0
+
+
+@dataclass
+class FitResult:
+    containers: list[ContainerLoad]
+    unassigned: list[tuple[str, int]]
+    issues: list[NormalizeIssue]
+
+
+def _ratio(value: float, limit: float) -> float | None:
+    return value / limit if limit > 0 else None
+
+
+def _overflow(value: float, limit: float) -> float:
+    return value - limit if value - limit > _EPSILON else 0.0
+
+
+def fit_containers(item_types: list[dict], items: list[dict], containers: list[ContainerSpec]) -> FitResult:
+    units: dict[str, tuple[float, float]] = {}
+    for t in item_types:
+        units.setdefault(t["name"], (t["unitWeightKg"], t["unitVolumeM3"]))
+
+    n = len(containers)
+    weight = array("d", bytes(8 * n))
+    volume = array("d", bytes(8 * n))
+    loads: list[dict[str, int]] = [{} for _ in range(n)]
+    issues: list[NormalizeIssue] = []
+
+    def resolve(path: str, lines: Iterable[dict]) -> Iterable[tuple[str, int, float, float]]:
+        for i, line in enumerate(lines):
+            name, quantity = line["itemTypeName"], line["quantity"]
+            unit = units.get(name)
+            if unit is None:
+                issues.append(
+                    NormalizeIssue(f"{path}[{i}].itemTypeName", UNKNOWN_ITEM_TYPE, f"Item type {name!r} is not defined")
+                )
+            elif quantity > 0:
+                yield name, quantity, unit[0], unit[1]
+
+    for c, container in enumerate(containers):
+        load = loads[c]
+        for name, quantity, w, v in resolve(f"containers[{c}].items", container.items):
+            weight[c] += quantity * w
+            volume[c] += quantity * v
+            load[name] = load.get(name, 0) + quantity
+
+    loose: dict[str, list] = {}
+    for name, quantity, w, v in resolve("items", items):
+        entry = loose.get(name)
+        if entry is None:
+            loose[name] = [name, quantity, w, v]
+        else:
+            entry[1] += quantity
+    unassigned = _first_fit_decreasing([tuple(e) for e in loose.values()], containers, weight, volume, loads)
+
+    result = []
+    for c, container in enumerate(containers):
+        w, v = weight[c], volume[c]
+        result.append(
+            ContainerLoad(
+                name=container.name,
+                weight_kg=w,
+                volume_m3=v,
+                weight_utilization=_ratio(w, container.max_weight_kg),
+                volume_utilization=_ratio(v, container.max_volume_m3),
+                overflow_weight_kg=_overflow(w, container.max_weight_kg),
+                overflow_volume_m3=_overflow(v, container.max_volume_m3),
+                items=list(loads[c].items()),
+            )
+        )
+    return FitResult(containers=result, unassigned=list(unassigned.items()), issues=issues)
+
+
+def _first_fit_decreasing(
+    lines: list[tuple[str, int, float, float]],
+    containers: list[ContainerSpec],
+    weight: array,
+    volume: array,
+    loads: list[dict[str, int]],
+) -> dict[str, int]:
+    unassigned: dict[str, int] = {}
+    if not lines:
+        return unassigned
+
+    max_w = array("d", (c.max_weight_kg for c in containers))
+    max_v = array("d", (c.max_volume_m3 for c in containers))
+    ref_w = max(max_w, default=0.0) or 1.0
+    ref_v = max(max_v, default=0.0) or 1.0
+    lines.sort(key=lambda line: max(line[2] / ref_w, line[3] / ref_v), reverse=True)
+
+    # Remaining capacity per container, with the rounding slack folded in
+    rem_w = array("d", (m - x + _EPSILON for m, x in zip(max_w, weight, strict=True)))
+    rem_v = array("d", (m - x + _EPSILON for m, x in zip(max_v, volume, strict=True)))
+    # A container is closed once it cannot take one unit of the smallest type
+    min_w = min((w for _, _, w, _ in lines if w > 0), default=0.0)
+    min_v = min((v for _, _, _, v in lines if v > 0), default=0.0)
+    open_ = [c for c in range(len(containers)) if rem_w[c] >= min_w and rem_v[c] >= min_v]
+
+    for name, quantity, w, v in lines:
+        closed = 0
+        for c in open_:
+            fit = quantity
+            if w > 0:
+                k = int(rem_w[c] // w)
+                if k < fit:
+                    fit = k
+            if v > 0:
+                k = int(rem_v[c] // v)
+                if k < fit:
+                    fit = k
+            if fit <= 0:
+                continue
+            rem_w[c] -= fit * w
+            rem_v[c] -= fit * v
+            weight[c] += fit * w
+            volume[c] += fit * v
+            loads[c][name] = loads[c].get(name, 0) + fit
+            if rem_w[c] < min_w or rem_v[c] < min_v:
+                closed += 1
+            quantity -= fit
+            if quantity == 0:
+                break
+        if quantity:
+            unassigned[name] = quantity
+        if closed:
+            open_ = [c for c in open_ if rem_w[c] >= min_w and rem_v[c] >= min_v]
+    return unassigned
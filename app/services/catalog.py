@@ -0,0 +1,87 @@
+"""Item-type catalogue index: backend names and ids, looked up by normalized name.
+
+Keys are case-folded with whitespace collapsed, so ``" small  BOX"`` finds
+``"Small Box"`` in one dict lookup. Fuzzy lookups (``difflib`` ratio at least
+``fuzzy_cutoff``) scan the keys once per distinct unknown name and are
+memoized for the lifetime of the index.
+"""
+
+import difflib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .issues import NormalizeIssue
+
+FUZZY_MATCH = "FUZZY_MATCH"
+UNKNOWN_CATALOG_ITEM_TYPE = "UNKNOWN_CATALOG_ITEM_TYPE"
+
+
+def catalog_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+@dataclass(frozen=True)
+class CatalogMatch:
+    id: Any
+    name: str
+    fuzzy: bool = False
+
+
+class CatalogIndex:
+    def __init__(self, entries: Iterable[dict[str, Any]] = (), fuzzy_cutoff: float = 0.85) -> None:
+        self.fuzzy_cutoff = fuzzy_cutoff
+        # Canonical name -> id, as the backend spells it
+        self.by_name: dict[str, Any] = {}
+        self._exact: dict[str, CatalogMatch] = {}
+        self._fuzzy: dict[str, CatalogMatch | None] = {}
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get("name"), str) and "id" in entry:
+                self.add(entry["name"], entry["id"])
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def add(self, name: str, item_type_id: Any) -> None:
+        self.by_name.setdefault(name, item_type_id)
+        # First spelling of a key wins, matching the backend's first definition
+        self._exact.setdefault(catalog_key(name), CatalogMatch(item_type_id, name))
+        self._fuzzy.clear()
+
+    def resolve(self, name: str, fuzzy: bool = False) -> CatalogMatch | None:
+        key = catalog_key(name)
+        match = self._exact.get(key)
+        if match is not None or not fuzzy:
+            return match
+        if key not in self._fuzzy:
+            close = difflib.get_close_matches(key, self._exact, n=1, cutoff=self.fuzzy_cutoff)
+            self._fuzzy[key] = (
+                CatalogMatch(self._exact[close[0]].id, self._exact[close[0]].name, True) if close else None
+            )
+        return self._fuzzy[key]
+
+    def resolve_all(self, names: Iterable[str], fuzzy: bool = False) -> dict[str, CatalogMatch | None]:
+        """Each distinct name resolved once."""
+        resolved: dict[str, CatalogMatch | None] = {}
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name, fuzzy)
+        return resolved
+
+
+def match_issues(
+    section: str, field: str, names: list[str], resolved: dict[str, CatalogMatch | None]
+) -> list[NormalizeIssue]:
+    """Report fuzzy and missing matches for ``names`` (in record order) under ``section[i].field``."""
+    issues = []
+    for i, name in enumerate(names):
+        match = resolved[name]
+        if match is None:
+            issues.append(
+                NormalizeIssue(
+                    f"{section}[{i}].{field}", UNKNOWN_CATALOG_ITEM_TYPE, f"{name!r} is not in the catalogue"
+                )
+            )
+        elif match.fuzzy:
+            issues.append(NormalizeIssue(f"{section}[{i}].{field}", FUZZY_MATCH, f"{name!r} matched {match.name!r}"))
+    return issues
@@ -0,0 +1,195 @@
+"""Columnar (array-backed) normalization engine.
+
+Instead of one dict per record, a batch keeps one typed array per field:
+``array('d')`` for weights, volumes and dimensions (NaN marks a missing
+dimension), ``array('q')`` for quantities, and a shared name table referenced
+by index. Records are only materialised (as dicts or GraphQL objects) at the
+boundary, lazily, via the ``iter_*`` helpers.
+"""
+
+import math
+from array import array
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from .mapping import get_plan
+
+
+@dataclass
+class ColumnarBatch:
+    names: list[str]
+    type_name: array
+    unit_weight_kg: array
+    unit_volume_m3: array
+    length_m: array
+    width_m: array
+    height_m: array
+    item_type_name: array
+    quantity: array
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers (the name table excluded)."""
+        columns = (
+            self.type_name,
+            self.unit_weight_kg,
+            self.unit_volume_m3,
+            self.length_m,
+            self.width_m,
+            self.height_m,
+            self.item_type_name,
+            self.quantity,
+        )
+        return sum(len(c) * c.itemsize for c in columns)
+
+    def iter_item_type_rows(self) -> Iterator[tuple[str, float, float, float | None, float | None, float | None]]:
+        names = self.names
+        for idx, w, v, length, width, height in zip(
+            self.type_name,
+            self.unit_weight_kg,
+            self.unit_volume_m3,
+            self.length_m,
+            self.width_m,
+            self.height_m,
+            strict=True,
+        ):
+            yield names[idx], w, v, _opt(length), _opt(width), _opt(height)
+
+    def iter_item_rows(self) -> Iterator[tuple[str, int]]:
+        names = self.names
+        for idx, q in zip(self.item_type_name, self.quantity, strict=True):
+            yield names[idx], q
+
+    def iter_item_types(self) -> Iterator[dict[str, Any]]:
+        for name, w, v, length, width, height in self.iter_item_type_rows():
+            yield {
+                "name": name,
+                "unitWeightKg": w,
+                "unitVolumeM3": v,
+                "lengthM": length,
+                "widthM": width,
+                "heightM": height,
+            }
+
+    def iter_items(self) -> Iterator[dict[str, Any]]:
+        for name, q in self.iter_item_rows():
+            yield {"itemTypeName": name, "quantity": q}
+
+    def as_columns(self) -> dict[str, Any]:
+        """JSON-ready layout of ``normalizeColumnar``: names once, then one list per field."""
+        return {
+            "names": self.names,
+            "itemTypes": {
+                "nameIndex": self.type_name.tolist(),
+                "unitWeightKg": self.unit_weight_kg.tolist(),
+                "unitVolumeM3": self.unit_volume_m3.tolist(),
+                "lengthM": nullable(self.length_m),
+                "widthM": nullable(self.width_m),
+                "heightM": nullable(self.height_m),
+            },
+            "items": {"itemTypeNameIndex": self.item_type_name.tolist(), "quantity": self.quantity.tolist()},
+        }
+
+
+def _opt(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def nullable(column: array) -> list[float | None]:
+    """Column values with the NaN "missing" marker turned back into ``None``."""
+    return [None if math.isnan(x) else x for x in column]
+
+
+def _quantities(get: Callable[[Any], int], items_raw: list[Any]) -> array:
+    column = array("q")
+    try:
+        column.extend(map(get, items_raw))
+    except OverflowError:
+        # extend() keeps what it appended, so the column length is the failing index
+        i = len(column)
+        raise ValueError(f"items[{i}]: quantity {get(items_raw[i])} does not fit in a 64-bit integer") from None
+    return column
+
+
+def normalize_columnar(source: str, raw: dict[str, Any]) -> ColumnarBatch:
+    """Columnar counterpart of ``normalize_raw``: one pass per field over the raw records."""
+    g = get_plan(source).getters
+    types_raw = raw.get("types") or []
+    items_raw = raw.get("items") or []
+
+    table: dict[str, int] = {}
+
+    def intern(name: str) -> int:
+        idx = table.get(name)
+        if idx is None:
+            idx = table[name] = len(table)
+        return idx
+
+    return ColumnarBatch(
+        type_name=array("q", map(intern, map(g["name"], types_raw))),
+        unit_weight_kg=array("d", map(g["unitWeightKg"], types_raw)),
+        unit_volume_m3=array("d", map(g["unitVolumeM3"], types_raw)),
+        length_m=array("d", map(g["lengthM"], types_raw)),
+        width_m=array("d", map(g["widthM"], types_raw)),
+        height_m=array("d", map(g["heightM"], types_raw)),
+        item_type_name=array("q", map(intern, map(g["itemTypeName"], items_raw))),
+        quantity=_quantities(g["quantity"], items_raw),
+        # Evaluated last, after both name columns have been interned
+        names=list(table),
+    )
+
+
+class ColumnarBuilder:
+    """Append records (or whole batches) one at a time into a single ``ColumnarBatch``."""
+
+    def __init__(self, source: str) -> None:
+        self._g = get_plan(source).getters
+        self._table: dict[str, int] = {}
+        self._batch = ColumnarBatch(
+            names=[],
+            type_name=array("q"),
+            unit_weight_kg=array("d"),
+            unit_volume_m3=array("d"),
+            length_m=array("d"),
+            width_m=array("d"),
+            height_m=array("d"),
+            item_type_name=array("q"),
+            quantity=array("q"),
+        )
+
+    def _intern(self, name: str) -> int:
+        idx = self._table.get(name)
+        if idx is None:
+            idx = self._table[name] = len(self._table)
+        return idx
+
+    def add_type(self, raw: dict[str, Any]) -> None:
+        g, b = self._g, self._batch
+        b.type_name.append(self._intern(g["name"](raw)))
+        b.unit_weight_kg.append(g["unitWeightKg"](raw))
+        b.unit_volume_m3.append(g["unitVolumeM3"](raw))
+        b.length_m.append(g["lengthM"](raw))
+        b.width_m.append(g["widthM"](raw))
+        b.height_m.append(g["heightM"](raw))
+
+    def add_item(self, raw: dict[str, Any]) -> None:
+        self._batch.item_type_name.append(self._intern(self._g["itemTypeName"](raw)))
+        self._batch.quantity.append(self._g["quantity"](raw))
+
+    def extend(self, other: ColumnarBatch) -> None:
+        """Append an already normalized batch, re-indexing its names into this one's table."""
+        remap = [self._intern(name) for name in other.names]
+        b = self._batch
+        b.type_name.extend(remap[i] for i in other.type_name)
+        b.unit_weight_kg.extend(other.unit_weight_kg)
+        b.unit_volume_m3.extend(other.unit_volume_m3)
+        b.length_m.extend(other.length_m)
+        b.width_m.extend(other.width_m)
+        b.height_m.extend(other.height_m)
+        b.item_type_name.extend(remap[i] for i in other.item_type_name)
+        b.quantity.extend(other.quantity)
+
+    def build(self) -> ColumnarBatch:
+        self._batch.names = list(self._table)
+        return self._batch
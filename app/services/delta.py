@@ -0,0 +1,249 @@
+"""Delta normalization against per-source snapshots of record fingerprints.
+
+A snapshot maps each record's identity to a fingerprint of its normalized
+values: item types are keyed by ``name`` and items by ``itemTypeName``
+(duplicate item lines are summed, so an item is "the quantity of a type").
+The fingerprint is the list of normalized values itself, so equal
+fingerprints mean equal records (a hash could collide, e.g.
+``hash(-1) == hash(-2)``) and snapshots serialize as plain JSON.
+
+- Full mode: the whole payload is normalized and compared with the base
+  snapshot (or with nothing, on a first sync).
+- Diff mode: the payload only carries upserted records plus
+  ``{"removed": {"types": [names], "items": [names]}}``; work is proportional
+  to the diff apart from copying the base fingerprint maps.
+
+Either way only added, changed and removed records are returned, and the
+resulting state is stored under a new snapshot id. ``SnapshotStore`` is the
+storage interface: ``FileSnapshotStore`` keeps snapshots in a directory that
+all workers of a host share, ``MemorySnapshotStore`` is a single-process
+variant.
+"""
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, Protocol
+
+
+class SnapshotNotFoundError(LookupError):
+    pass
+
+
+Fingerprint = list[Any]
+
+
+@dataclass
+class Snapshot:
+    types: dict[str, Fingerprint] = field(default_factory=dict)
+    items: dict[str, Fingerprint] = field(default_factory=dict)
+
+
+@dataclass
+class Delta:
+    snapshot_id: str
+    added_types: list[dict] = field(default_factory=list)
+    changed_types: list[dict] = field(default_factory=list)
+    removed_types: list[str] = field(default_factory=list)
+    added_items: list[dict] = field(default_factory=list)
+    changed_items: list[dict] = field(default_factory=list)
+    removed_items: list[str] = field(default_factory=list)
+
+
+class SnapshotStore(Protocol):
+    def get(self, source: str, snapshot_id: str) -> Snapshot: ...
+
+    def put(self, source: str, snapshot: Snapshot) -> str: ...
+
+
+def _not_found(source: str, snapshot_id: str) -> SnapshotNotFoundError:
+    return SnapshotNotFoundError(f"Unknown or expired snapshot {snapshot_id!r} for source {source!r}")
+
+
+class MemorySnapshotStore:
+    """Keeps the newest ``per_source`` snapshots for the ``max_sources`` most recently used sources."""
+
+    def __init__(self, per_source: int, max_sources: int) -> None:
+        self.per_source = per_source
+        self.max_sources = max_sources
+        self._sources: OrderedDict[str, OrderedDict[str, Snapshot]] = OrderedDict()
+
+    def get(self, source: str, snapshot_id: str) -> Snapshot:
+        snapshots = self._sources.get(source)
+        snapshot = snapshots.get(snapshot_id) if snapshots is not None else None
+        if snapshot is None:
+            raise _not_found(source, snapshot_id)
+        self._sources.move_to_end(source)
+        return snapshot
+
+    def put(self, source: str, snapshot: Snapshot) -> str:
+        snapshot_id = secrets.token_hex(8)
+        snapshots = self._sources.setdefault(source, OrderedDict())
+        snapshots[snapshot_id] = snapshot
+        while len(snapshots) > self.per_source:
+            snapshots.popitem(last=False)
+        self._sources.move_to_end(source)
+        while len(self._sources) > self.max_sources:
+            self._sources.popitem(last=False)
+        return snapshot_id
+
+
+_SNAPSHOT_ID = re.compile(r"[0-9a-f]{16}")
+
+
+class FileSnapshotStore:
+    """Snapshots as JSON files, one directory per source, so any worker can serve any snapshot id.
+
+    Files are written to a temporary name and renamed into place, so readers
+    never see a partial snapshot. Per-source and per-directory bounds are
+    enforced by modification time (a read marks its source as used).
+    """
+
+    def __init__(self, directory: str, per_source: int, max_sources: int) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.per_source = per_source
+        self.max_sources = max_sources
+
+    def _source_dir(self, source: str) -> Path:
+        # Source names are client-supplied, so they never become path components
+        return self.dir / hashlib.sha256(source.encode()).hexdigest()[:32]
+
+    def get(self, source: str, snapshot_id: str) -> Snapshot:
+        if not _SNAPSHOT_ID.fullmatch(snapshot_id):
+            raise _not_found(source, snapshot_id)
+        source_dir = self._source_dir(source)
+        try:
+            data = json.loads((source_dir / f"{snapshot_id}.json").read_bytes())
+            os.utime(source_dir)
+        except FileNotFoundError:
+            raise _not_found(source, snapshot_id) from None
+        return Snapshot(types=data["types"], items=data["items"])
+
+    def put(self, source: str, snapshot: Snapshot) -> str:
+        snapshot_id = secrets.token_hex(8)
+        source_dir = self._source_dir(source)
+        source_dir.mkdir(exist_ok=True)
+        tmp = source_dir / f"{snapshot_id}.tmp"
+        tmp.write_text(json.dumps({"types": snapshot.types, "items": snapshot.items}, separators=(",", ":")))
+        os.replace(tmp, source_dir / f"{snapshot_id}.json")
+        _drop_oldest(source_dir.glob("*.json"), self.per_source, Path.unlink)
+        _drop_oldest(self.dir.iterdir(), self.max_sources, partial(shutil.rmtree, ignore_errors=True))
+        return snapshot_id
+
+
+def _drop_oldest(paths: Iterable[Path], keep: int, remove: Callable[[Path], object]) -> None:
+    by_age = []
+    for path in paths:
+        try:
+            by_age.append((path.stat().st_mtime_ns, path))
+        except FileNotFoundError:
+            continue  # removed by another worker meanwhile
+    by_age.sort()
+    for _, path in by_age[: max(len(by_age) - keep, 0)]:
+        try:
+            remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _fingerprint(record: dict[str, Any]) -> Fingerprint:
+    return list(record.values())
+
+
+def _unique_types(item_types: list[dict]) -> dict[str, dict]:
+    by_name: dict[str, dict] = {}
+    for t in item_types:
+        by_name.setdefault(t["name"], t)
+    return by_name
+
+
+def _merged_items(items: list[dict]) -> dict[str, dict]:
+    by_name: dict[str, dict] = {}
+    for item in items:
+        name = item["itemTypeName"]
+        line = by_name.get(name)
+        if line is None:
+            by_name[name] = dict(item)
+        else:
+            line["quantity"] += item["quantity"]
+    return by_name
+
+
+def _compare(
+    base: dict[str, Fingerprint], records: dict[str, dict], state: dict[str, Fingerprint]
+) -> tuple[list[dict], list[dict]]:
+    added, changed = [], []
+    for key, record in records.items():
+        fp = _fingerprint(record)
+        old = base.get(key)
+        if old is None:
+            added.append(record)
+        elif old != fp:
+            changed.append(record)
+        state[key] = fp
+    return added, changed
+
+
+def _remove(keys: Any, upserted: dict[str, dict], state: dict[str, Fingerprint]) -> list[str]:
+    if keys is None:
+        return []
+    if not isinstance(keys, list) or not all(isinstance(k, str) for k in keys):
+        raise ValueError("removed.types / removed.items must be lists of names")
+    # A record both upserted and removed in the same diff is kept
+    return [k for k in keys if k not in upserted and state.pop(k, None) is not None]
+
+
+def full_delta(
+    store: SnapshotStore, source: str, item_types: list[dict], items: list[dict], base_id: str | None
+) -> Delta:
+    base = store.get(source, base_id) if base_id else Snapshot()
+    state = Snapshot()
+    added_types, changed_types = _compare(base.types, _unique_types(item_types), state.types)
+    added_items, changed_items = _compare(base.items, _merged_items(items), state.items)
+    return Delta(
+        snapshot_id=store.put(source, state),
+        added_types=added_types,
+        changed_types=changed_types,
+        removed_types=[k for k in base.types if k not in state.types],
+        added_items=added_items,
+        changed_items=changed_items,
+        removed_items=[k for k in base.items if k not in state.items],
+    )
+
+
+def diff_delta(
+    store: SnapshotStore,
+    source: str,
+    item_types: list[dict],
+    items: list[dict],
+    removed: dict[str, Any] | None,
+    base_id: str,
+) -> Delta:
+    base = store.get(source, base_id)
+    state = Snapshot(types=dict(base.types), items=dict(base.items))
+    types_by_name = _unique_types(item_types)
+    items_by_name = _merged_items(items)
+    added_types, changed_types = _compare(base.types, types_by_name, state.types)
+    added_items, changed_items = _compare(base.items, items_by_name, state.items)
+
+    removed = removed or {}
+    removed_types = _remove(removed.get("types"), types_by_name, state.types)
+    removed_items = _remove(removed.get("items"), items_by_name, state.items)
+    return Delta(
+        snapshot_id=store.put(source, state),
+        added_types=added_types,
+        changed_types=changed_types,
+        removed_types=removed_types,
+        added_items=added_items,
+        changed_items=changed_items,
+        removed_items=removed_items,
+    )
@@ -0,0 +1,119 @@
+"""Local file ingestion: normalize JSON / NDJSON files without going through HTTP.
+
+Files are memory-mapped and fed to the streaming decoders of ``stream.py`` in
+fixed-size slices, so only the current slice and the output buffers are held
+in Python objects. NDJSON inputs can be split into newline-aligned byte ranges
+(``ndjson_ranges``) and normalized in parallel; each range is processed
+independently by ``normalize_range_*`` and the parts are joined in file order.
+"""
+
+import json
+import mmap
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO
+
+from .columnar import ColumnarBatch, ColumnarBuilder
+from .mapping import get_plan
+from .stream import JSONDocumentDecoder, NDJSONDecoder, Record
+
+SLICE_BYTES = 1 << 20
+_FLUSH_LINES = 10_000
+
+
+@contextmanager
+def mapped(path: str) -> Iterator[mmap.mmap | bytes]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def ndjson_ranges(buf: mmap.mmap | bytes, parts: int) -> list[tuple[int, int]]:
+    """Split ``buf`` into at most ``parts`` byte ranges that start and end on line boundaries."""
+    size = len(buf)
+    bounds = [0]
+    for k in range(1, parts):
+        nl = buf.find(b"\n", max(size * k // parts, bounds[-1]))
+        if nl == -1:
+            break
+        if nl + 1 > bounds[-1]:
+            bounds.append(nl + 1)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:], strict=False) if b > a]
+
+
+def iter_records(buf: mmap.mmap | bytes, ndjson: bool, start: int = 0, end: int | None = None) -> Iterator[Record]:
+    decoder = NDJSONDecoder(first_line=_line_at(buf, start)) if ndjson else JSONDocumentDecoder()
+    end = len(buf) if end is None else end
+    for pos in range(start, end, SLICE_BYTES):
+        yield from decoder.feed(buf[pos : min(pos + SLICE_BYTES, end)])
+    yield from decoder.close()
+
+
+def _line_at(buf: mmap.mmap | bytes, pos: int) -> int:
+    """1-based line number of the byte at ``pos``, so that a worker's errors point into the whole file."""
+    line = 1
+    for p in range(0, pos, SLICE_BYTES):
+        line += buf[p : min(p + SLICE_BYTES, pos)].count(b"\n")
+    return line
+
+
+def write_ndjson(source: str, records: Iterator[Record], out: IO[bytes]) -> int:
+    """Write records in the ``/normalize/stream`` output format; returns the record count."""
+    extract = dict(zip(("type", "item"), get_plan(source).extractors, strict=True))
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    lines: list[str] = []
+    count = 0
+    for kind, rec in records:
+        lines.append(dumps({"kind": kind, **extract[kind](rec)}))
+        if len(lines) >= _FLUSH_LINES:
+            out.write(("\n".join(lines) + "\n").encode())
+            count += len(lines)
+            lines.clear()
+    if lines:
+        out.write(("\n".join(lines) + "\n").encode())
+        count += len(lines)
+    return count
+
+
+def build_columnar(source: str, records: Iterator[Record]) -> ColumnarBatch:
+    builder = ColumnarBuilder(source)
+    for kind, rec in records:
+        if kind == "type":
+            builder.add_type(rec)
+        else:
+            builder.add_item(rec)
+    return builder.build()
+
+
+def normalize_range_ndjson(path: str, source: str, ndjson: bool, start: int, end: int, out_path: str) -> int:
+    """Normalize ``path[start:end]`` into an NDJSON part file; top-level so it can run on a process pool."""
+    with mapped(path) as buf, open(out_path, "wb") as out:
+        return write_ndjson(source, iter_records(buf, ndjson, start, end), out)
+
+
+def normalize_range_columnar(path: str, source: str, ndjson: bool, start: int, end: int) -> ColumnarBatch:
+    with mapped(path) as buf:
+        return build_columnar(source, iter_records(buf, ndjson, start, end))
+
+
+def write_columnar(batch: ColumnarBatch, out: IO[bytes]) -> None:
+    out.write(json.dumps(batch.as_columns(), separators=(",", ":")).encode())
+
+
+def merge_parts(part_paths: list[str], out: IO[bytes]) -> None:
+    for part in part_paths:
+        with open(part, "rb") as f:
+            while chunk := f.read(SLICE_BYTES):
+                out.write(chunk)
+
+
+def detect_ndjson(path: str, input_format: str = "auto") -> bool:
+    if input_format != "auto":
+        return input_format == "ndjson"
+    return path.endswith((".ndjson", ".jsonl"))
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class NormalizeIssue:
+    """A problem found in a payload, located by a path such as ``items[3].itemTypeName``."""
+
+    path: str
+    code: str
+    message: str
@@ -0,0 +1,227 @@
+"""Per-source field-mapping plans.
+
+A plan lists, for every canonical output field, the raw keys to probe (in
+order), the default used when none of them is present and the cast applied to
+the value found. Plans are compiled once into specialised extractor functions
+and cached on the plan, so each record costs one ``dict.get`` chain per field.
+
+New sources are loaded from configuration (see ``SOURCE_MAPPINGS``)::
+
+    {"acme": {"types": {"name": ["sku"], "unitWeightKg": {"aliases": ["kg"], "default": 1.0}},
+              "items": {"quantity": ["qty"]},
+              "units": {"weight": "lb", "length": "in", "volume": "ft3"}}}
+
+Fields not mentioned keep the default plan's aliases and defaults. ``units``
+declares what the source's numbers are in; the factor to kg / m / m³ is
+compiled into the extractors as a constant, so conversion costs one multiply
+per value found (defaults are canonical and not scaled). When a type has no
+volume but all three dimensions, its volume is their product.
+"""
+
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Any
+
+Extractor = Callable[[dict[str, Any]], dict[str, Any]]
+Getter = Callable[[dict[str, Any]], Any]
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    aliases: tuple[str, ...]
+    default: Any
+    cast: Callable[[Any], Any]
+    # Factor from the source's unit to the canonical one
+    scale: float = 1.0
+
+
+# Factors to the canonical unit (kg, m, m³) per dimension
+UNIT_FACTORS: dict[str, dict[str, float]] = {
+    "weight": {"kg": 1.0, "g": 1e-3, "lb": 0.45359237, "oz": 0.028349523125},
+    "length": {"m": 1.0, "cm": 1e-2, "mm": 1e-3, "in": 0.0254, "ft": 0.3048},
+    "volume": {"m3": 1.0, "l": 1e-3, "cm3": 1e-6, "in3": 0.0254**3, "ft3": 0.3048**3},
+}
+_UNIT_FIELDS = {"weight": ("unitWeightKg",), "length": ("lengthM", "widthM", "heightM"), "volume": ("unitVolumeM3",)}
+_VOLUME = "unitVolumeM3"
+_DIMENSIONS = ("lengthM", "widthM", "heightM")
+
+
+@dataclass(frozen=True, eq=False)
+class MappingPlan:
+    types: Mapping[str, FieldSpec]
+    items: Mapping[str, FieldSpec]
+
+    @cached_property
+    def extractors(self) -> tuple[Extractor, Extractor]:
+        """Compiled ``(extract_type, extract_item)`` pair for this plan."""
+        return _compile(self.types, "extract_type"), _compile(self.items, "extract_item")
+
+    @cached_property
+    def getters(self) -> dict[str, Getter]:
+        """Compiled single-field getters keyed by canonical field name, for column-wise passes.
+
+        Optional float fields default to NaN instead of ``None`` so they fit in ``array('d')``.
+        """
+        out: dict[str, Getter] = {}
+        for name, spec in (*self.types.items(), *self.items.items()):
+            fields = {name: spec}
+            if name == _VOLUME:
+                # Volume may be derived from the dimensions, so its getter reads them too
+                fields.update((d, self.types[d]) for d in _DIMENSIONS if d in self.types)
+            fields = {
+                n: replace(f, default=math.nan) if f.default is None and f.cast is float else f
+                for n, f in fields.items()
+            }
+            out[name] = _compile(fields, f"get_{name}", returns=name)
+        return out
+
+
+DEFAULT_PLAN = MappingPlan(
+    types={
+        "name": FieldSpec(("name", "id"), "Unknown", str),
+        "unitWeightKg": FieldSpec(("unitWeightKg", "w"), 0.0, float),
+        "unitVolumeM3": FieldSpec(("unitVolumeM3", "v"), 0.0, float),
+        "lengthM": FieldSpec(("lengthM",), None, float),
+        "widthM": FieldSpec(("widthM",), None, float),
+        "heightM": FieldSpec(("heightM",), None, float),
+    },
+    items={
+        "itemTypeName": FieldSpec(("itemTypeName", "type"), "Unknown", str),
+        "quantity": FieldSpec(("quantity", "q"), 0, int),
+    },
+)
+
+_plans: dict[str, MappingPlan] = {}
+
+
+def _compile(
+    fields: Mapping[str, FieldSpec], fn_name: str, returns: str | None = None
+) -> Callable[[dict[str, Any]], Any]:
+    # Generate straight-line code (one get chain per field) instead of looping
+    # over alias tuples at run time, the same way dataclasses builds __init__.
+    ns: dict[str, Any] = {}
+    body = ["    get = r.get"]
+    var = {name: f"v{i}" for i, name in enumerate(fields)}
+    # Volume and dimensions stay None until the volume has been derived; defaults come after
+    derive = _VOLUME in fields and all(d in fields for d in _DIMENSIONS)
+    deferred = {_VOLUME, *_DIMENSIONS} if derive else set()
+    tail = []
+    # A lone volume getter only needs the dimensions when the volume itself is missing
+    lazy: list[str] = []
+    for i, (name, spec) in enumerate(fields.items()):
+        v = var[name]
+        ns[f"cast{i}"] = spec.cast
+        ns[f"default{i}"] = spec.default
+        value = f"cast{i}({v})" if spec.scale == 1.0 else f"cast{i}({v}) * {spec.scale!r}"
+        if name in deferred:
+            out = lazy if returns == _VOLUME and name != _VOLUME else body
+            if spec.aliases:
+                _emit_get(out, v, spec.aliases)
+                out.append(f"    if {v} is not None:")
+                out.append(f"        {v} = {value}")
+            else:
+                out.append(f"    {v} = None")
+            if name == _VOLUME:
+                tail.append(f"    if {v} is None:")
+                dims = " and ".join(f"{var[d]} is not None" for d in _DIMENSIONS)
+                product = " * ".join(var[d] for d in _DIMENSIONS)
+                tail.append(f"        {v} = {product} if {dims} else default{i}")
+            elif spec.default is not None and returns is None:
+                tail.append(f"    if {v} is None:")
+                tail.append(f"        {v} = default{i}")
+        elif spec.aliases:
+            _emit_get(body, v, spec.aliases)
+            body.append(f"    {v} = default{i} if {v} is None else {value}")
+        else:
+            body.append(f"    {v} = default{i}")
+    if lazy:
+        tail[1:1] = ["    " + line for line in lazy]
+    body.extend(tail)
+    if returns is not None:
+        body.append(f"    return {var[returns]}")
+    else:
+        body.append("    return {" + ", ".join(f"{name!r}: {var[name]}" for name in fields) + "}")
+    exec("\n".join([f"def {fn_name}(r):", *body]), ns)
+    return ns[fn_name]
+
+
+def _emit_get(body: list[str], var: str, aliases: tuple[str, ...]) -> None:
+    first, *rest = aliases
+    body.append(f"    {var} = get({first!r})")
+    for alias in rest:
+        body.append(f"    if {var} is None:")
+        body.append(f"        {var} = get({alias!r})")
+
+
+_FIELD_CONFIG_KEYS = {"aliases", "default"}
+
+
+def _aliases(value: Any, where: str) -> tuple[str, ...]:
+    if not isinstance(value, list | tuple) or not all(isinstance(a, str) for a in value):
+        raise ValueError(f"{where}: aliases must be a list of strings, got {value!r}")
+    return tuple(value)
+
+
+def _merge_fields(base: Mapping[str, FieldSpec], overrides: Mapping[str, Any], section: str) -> dict[str, FieldSpec]:
+    fields = dict(base)
+    for name, cfg in overrides.items():
+        if name not in fields:
+            raise ValueError(f"Unknown {section} field in source mapping: {name!r}")
+        where = f"{section}.{name}"
+        spec = fields[name]
+        if not isinstance(cfg, Mapping):
+            fields[name] = replace(spec, aliases=_aliases(cfg, where))
+            continue
+        unknown = set(cfg) - _FIELD_CONFIG_KEYS
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}; expected 'aliases' and/or 'default'")
+        aliases = _aliases(cfg["aliases"], where) if "aliases" in cfg else spec.aliases
+        default = spec.default
+        if "default" in cfg:
+            try:
+                default = None if cfg["default"] is None else spec.cast(cfg["default"])
+            except (TypeError, ValueError):
+                raise ValueError(f"{where}: invalid default {cfg['default']!r}") from None
+        fields[name] = replace(spec, aliases=aliases, default=default)
+    return fields
+
+
+def _apply_units(types: dict[str, FieldSpec], units: Any) -> None:
+    if not isinstance(units, Mapping):
+        raise ValueError(f"units: expected an object like {{'weight': 'lb'}}, got {units!r}")
+    for dimension, unit in units.items():
+        factors = UNIT_FACTORS.get(dimension)
+        if factors is None:
+            raise ValueError(f"units: unknown dimension {dimension!r}; expected one of {sorted(UNIT_FACTORS)}")
+        factor = factors.get(unit.lower()) if isinstance(unit, str) else None
+        if factor is None:
+            raise ValueError(f"units.{dimension}: unknown unit {unit!r}; expected one of {sorted(factors)}")
+        for name in _UNIT_FIELDS[dimension]:
+            types[name] = replace(types[name], scale=factor)
+
+
+def plan_from_config(config: Mapping[str, Any]) -> MappingPlan:
+    """Build a plan from a config mapping, overriding the default plan per field."""
+    types = _merge_fields(DEFAULT_PLAN.types, config.get("types") or {}, "types")
+    if config.get("units"):
+        _apply_units(types, config["units"])
+    return MappingPlan(types=types, items=_merge_fields(DEFAULT_PLAN.items, config.get("items") or {}, "items"))
+
+
+def register_source(source: str, plan: MappingPlan) -> None:
+    _plans[source] = plan
+
+
+def load_sources(config: Mapping[str, Mapping[str, Any]]) -> None:
+    """Replace every registered source with the plans described by ``config``."""
+    plans = {source: plan_from_config(cfg) for source, cfg in config.items()}
+    _plans.clear()
+    _plans.update(plans)
+
+
+def get_plan(source: str) -> MappingPlan:
+    # Unknown sources share the default plan, so arbitrary client-supplied
+    # source names never grow the compiled cache.
+    return _plans.get(source, DEFAULT_PLAN)
@@ -0,0 +1,258 @@
+"""Incremental (streaming) normalization.
+
+Records are decoded from byte chunks as they arrive and normalized one at a
+time, so memory stays bounded by the chunk size and the largest record
+(``max_record_bytes``) rather than the payload size.
+Two input layouts are understood:
+
+* NDJSON: one JSON object per line, tagged with ``"kind": "type"`` or
+  ``"kind": "item"``;
+* the regular JSON document ``{"types": [...], "items": [...]}``, parsed
+  element by element.
+
+Output is NDJSON with the same ``kind`` tag followed by the normalized fields.
+"""
+
+import codecs
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from typing import Any, NoReturn
+
+from .mapping import get_plan
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+Record = tuple[str, dict[str, Any]]
+
+_KINDS = {"types": "type", "items": "item"}
+_WS = " \t\r\n"
+# Largest single record (NDJSON line, or element of the JSON document) held while it is incomplete
+MAX_RECORD_BYTES = 16 * 1024 * 1024
+
+
+class StreamFormatError(ValueError):
+    pass
+
+
+class RecordTooLargeError(StreamFormatError):
+    pass
+
+
+class NDJSONDecoder:
+    def __init__(self, max_record_bytes: int = MAX_RECORD_BYTES, first_line: int = 1) -> None:
+        self.max_record_bytes = max_record_bytes
+        self._buf = bytearray()
+        # Errors are reported by line number; ``first_line`` is that of the first line fed
+        self._line = first_line - 1
+
+    def feed(self, chunk: bytes) -> Iterator[Record]:
+        # Only the new chunk is searched for newlines; the partial line is just appended to
+        start = 0
+        nl = chunk.find(b"\n")
+        while nl != -1:
+            if self._buf:
+                self._buf += chunk[start:nl]
+                line = bytes(self._buf)
+                self._buf.clear()
+            else:
+                line = chunk[start:nl]
+            yield from self._decode(line)
+            start = nl + 1
+            nl = chunk.find(b"\n", start)
+        self._buf += chunk[start:]
+        if len(self._buf) > self.max_record_bytes:
+            raise RecordTooLargeError(f"line {self._line + 1}: longer than {self.max_record_bytes} bytes")
+
+    def close(self) -> Iterator[Record]:
+        buf = bytes(self._buf)
+        self._buf.clear()
+        yield from self._decode(buf)
+
+    def _decode(self, line: bytes) -> Iterator[Record]:
+        self._line += 1
+        if len(line) > self.max_record_bytes:
+            raise RecordTooLargeError(f"line {self._line}: longer than {self.max_record_bytes} bytes")
+        if not line.strip():
+            return
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            raise StreamFormatError(f"line {self._line}: invalid JSON ({e})") from None
+        kind = obj.get("kind") if isinstance(obj, dict) else None
+        if kind not in ("type", "item"):
+            raise StreamFormatError(f"line {self._line}: expected an object with kind 'type' or 'item'")
+        yield kind, obj
+
+
+class JSONDocumentDecoder:
+    """Pull ``types``/``items`` elements out of a JSON object as bytes arrive.
+
+    An element that is still incomplete is only re-parsed once the buffered
+    text has doubled since the last attempt, so a large element costs
+    amortized linear time; one longer than ``max_record_bytes`` characters is
+    rejected.
+    """
+
+    def __init__(self, max_record_bytes: int = MAX_RECORD_BYTES) -> None:
+        self.max_record_bytes = max_record_bytes
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._tail: list[str] = []
+        self._tail_len = 0
+        self._retry_at = 0
+        self._state = "start"
+        self._kind: str | None = None
+        self._closed = False
+        self._json = json.JSONDecoder()
+
+    def feed(self, chunk: bytes) -> Iterator[Record]:
+        text = self._text.decode(chunk)
+        self._tail.append(text)
+        self._tail_len += len(text)
+        if self._retry_at:
+            # Everything buffered belongs to the incomplete value at _pos
+            pending = len(self._buf) - self._pos + self._tail_len
+            self._check_size(pending)
+            if pending < self._retry_at:
+                return
+        self._join()
+        yield from self._drain()
+
+    def close(self) -> Iterator[Record]:
+        self._tail.append(self._text.decode(b"", final=True))
+        self._join()
+        self._closed = True
+        yield from self._drain()
+        if self._state != "done":
+            raise StreamFormatError("unexpected end of JSON document")
+
+    def _join(self) -> None:
+        self._buf = self._buf[self._pos :] + "".join(self._tail)
+        self._pos = 0
+        self._tail.clear()
+        self._tail_len = 0
+
+    def _check_size(self, pending: int) -> None:
+        if pending > self.max_record_bytes:
+            raise RecordTooLargeError(f"JSON value longer than {self.max_record_bytes} characters")
+
+    def _skip_ws(self) -> str | None:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WS:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _value(self) -> Any:
+        """Decode the next value, or raise ``EOFError`` if it may still be incomplete."""
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if self._closed:
+                raise StreamFormatError(f"invalid JSON: {e}") from None
+            self._incomplete()
+        # A trailing number could still grow with the next chunk
+        if end == len(self._buf) and not self._closed:
+            self._incomplete()
+        self._pos = end
+        self._retry_at = 0
+        return value
+
+    def _incomplete(self) -> NoReturn:
+        pending = len(self._buf) - self._pos
+        self._check_size(pending)
+        self._retry_at = 2 * pending
+        raise EOFError
+
+    def _drain(self) -> Iterator[Record]:
+        while True:
+            ch = self._skip_ws()
+            if ch is None:
+                return
+            try:
+                if self._state == "start":
+                    if ch != "{":
+                        raise StreamFormatError("expected a JSON object")
+                    self._pos += 1
+                    self._state = "key"
+                elif self._state == "key":
+                    if ch == ",":
+                        self._pos += 1
+                    elif ch == "}":
+                        self._pos += 1
+                        self._state = "done"
+                    elif ch != '"':
+                        raise StreamFormatError("expected an object key")
+                    else:
+                        start = self._pos
+                        key = self._value()
+                        if self._skip_ws() is None:
+                            self._pos = start
+                            return
+                        if self._buf[self._pos] != ":":
+                            raise StreamFormatError("expected ':' after object key")
+                        self._pos += 1
+                        self._kind = _KINDS.get(key)
+                        self._state = "open" if self._kind else "skip"
+                elif self._state == "open":
+                    if ch == "[":
+                        self._pos += 1
+                        self._state = "array"
+                    elif self._buf.startswith("null", self._pos):
+                        self._pos += 4
+                        self._state = "key"
+                    elif "null".startswith(self._buf[self._pos :]) and not self._closed:
+                        return
+                    else:
+                        raise StreamFormatError("expected an array of records")
+                elif self._state == "skip":
+                    self._value()
+                    self._state = "key"
+                elif self._state == "array":
+                    if ch == ",":
+                        self._pos += 1
+                    elif ch == "]":
+                        self._pos += 1
+                        self._state = "key"
+                    elif ch != "{":
+                        raise StreamFormatError("expected a JSON object record")
+                    else:
+                        assert self._kind is not None
+                        yield self._kind, self._value()
+                else:
+                    raise StreamFormatError("unexpected data after JSON document")
+            except EOFError:
+                return
+
+
+async def stream_normalized(
+    source: str, chunks: AsyncIterable[bytes], ndjson: bool, max_record_bytes: int = MAX_RECORD_BYTES
+) -> AsyncIterator[bytes]:
+    """Normalize records from ``chunks`` and yield NDJSON, one batch per input chunk.
+
+    Once the response has started the status code can no longer change, so a
+    malformed stream ends with a ``{"kind": "error"}`` line instead.
+    """
+    extract = dict(zip(("type", "item"), get_plan(source).extractors, strict=True))
+    decoder = NDJSONDecoder(max_record_bytes) if ndjson else JSONDocumentDecoder(max_record_bytes)
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    lines: list[str] = []
+
+    def flush() -> bytes:
+        out = ("\n".join(lines) + "\n").encode()
+        lines.clear()
+        return out
+
+    try:
+        async for chunk in chunks:
+            for kind, rec in decoder.feed(chunk):
+                lines.append(dumps({"kind": kind, **extract[kind](rec)}))
+            if lines:
+                yield flush()
+        for kind, rec in decoder.close():
+            lines.append(dumps({"kind": kind, **extract[kind](rec)}))
+    except (TypeError, ValueError) as e:
+        lines.append(dumps({"kind": "error", "message": str(e)}))
+    if lines:
+        yield flush()
@@ -0,0 +1,98 @@
+"""Payload validation: locate bad records (strict) or skip them (lenient).
+
+Clean payloads never pay for validation. Strict mode is simply the regular
+normalizer; only when it raises is the payload walked again with
+``first_issue`` to report the exact place (``items[3].q``). Lenient mode runs
+the compiled extractor per record inside ``try`` and only inspects the records
+that fail, which are reported and skipped.
+"""
+
+from collections.abc import Mapping
+from typing import Any
+
+from .issues import NormalizeIssue
+from .mapping import FieldSpec, get_plan
+
+INVALID_SECTION = "INVALID_SECTION"
+INVALID_RECORD = "INVALID_RECORD"
+INVALID_VALUE = "INVALID_VALUE"
+
+# What the compiled extractors raise on malformed input; OverflowError covers
+# float(10**400), int(inf) and integers beyond a 64-bit column
+NORMALIZE_ERRORS = (TypeError, ValueError, AttributeError, OverflowError)
+
+
+def _record_issue(section: str, index: int, rec: Any, fields: Mapping[str, FieldSpec]) -> NormalizeIssue | None:
+    if not isinstance(rec, dict):
+        return NormalizeIssue(f"{section}[{index}]", INVALID_RECORD, f"expected an object, got {type(rec).__name__}")
+    for name, spec in fields.items():
+        for alias in spec.aliases:
+            value = rec.get(alias)
+            if value is not None:
+                break
+        else:
+            continue
+        try:
+            spec.cast(value)
+        except (TypeError, ValueError, OverflowError):
+            cast = getattr(spec.cast, "__name__", "the expected type")
+            return NormalizeIssue(
+                f"{section}[{index}].{alias}", INVALID_VALUE, f"{name}: cannot convert {value!r} to {cast}"
+            )
+    return None
+
+
+def _section(raw: dict[str, Any], key: str) -> tuple[list[Any], NormalizeIssue | None]:
+    records = raw.get(key) or []
+    if not isinstance(records, list):
+        return [], NormalizeIssue(key, INVALID_SECTION, f"expected a list of records, got {type(records).__name__}")
+    return records, None
+
+
+def first_issue(source: str, raw: dict[str, Any]) -> NormalizeIssue | None:
+    """The first problem in ``raw`` in document order, or ``None`` if the normalizer would accept it."""
+    plan = get_plan(source)
+    for key, fields in (("types", plan.types), ("items", plan.items)):
+        records, issue = _section(raw, key)
+        if issue is not None:
+            return issue
+        for i, rec in enumerate(records):
+            issue = _record_issue(key, i, rec, fields)
+            if issue is not None:
+                return issue
+    return None
+
+
+def normalize_lenient_indexed(
+    source: str, raw: dict[str, Any]
+) -> tuple[list[dict], list[dict], list[NormalizeIssue], list[int]]:
+    """``normalize_lenient`` plus the raw index of every kept item, for error paths in later stages."""
+    plan = get_plan(source)
+    extract_type, extract_item = plan.extractors
+    issues: list[NormalizeIssue] = []
+    out: list[list[dict]] = []
+    positions: list[int] = []
+    for key, fields, extract in (("types", plan.types, extract_type), ("items", plan.items, extract_item)):
+        records, issue = _section(raw, key)
+        if issue is not None:
+            issues.append(issue)
+        kept: list[dict] = []
+        for i, rec in enumerate(records):
+            try:
+                kept.append(extract(rec))
+            except NORMALIZE_ERRORS:
+                issues.append(
+                    _record_issue(key, i, rec, fields)
+                    or NormalizeIssue(f"{key}[{i}]", INVALID_RECORD, "record could not be normalized")
+                )
+                continue
+            if key == "items":
+                positions.append(i)
+        out.append(kept)
+    return out[0], out[1], issues, positions
+
+
+def normalize_lenient(source: str, raw: dict[str, Any]) -> tuple[list[dict], list[dict], list[NormalizeIssue]]:
+    """Normalize every valid record; invalid ones are skipped and reported."""
+    item_types, items, issues, _ = normalize_lenient_indexed(source, raw)
+    return item_types, items, issues
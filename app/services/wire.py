@@ -0,0 +1,36 @@
+"""Compact columnar input layout for normalize payloads.
+
+Either section of a payload may be sent as ``{"columns": [...], "rows": [[...], ...]}``
+instead of a list of records, so keys such as ``unitWeightKg`` appear once per
+request rather than once per record. ``expand_payload`` turns such sections
+back into records before normalization; record lists pass through untouched.
+"""
+
+from typing import Any
+
+SECTIONS = ("types", "items")
+
+
+def _records(key: str, section: dict[str, Any]) -> list[dict[str, Any]]:
+    columns = section.get("columns")
+    rows = section.get("rows", [])
+    if not isinstance(columns, list) or not all(isinstance(c, str) for c in columns):
+        raise ValueError(f"{key}.columns must be a list of strings")
+    if not isinstance(rows, list):
+        raise ValueError(f"{key}.rows must be a list of rows")
+    width = len(columns)
+    for i, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) != width:
+            raise ValueError(f"{key}.rows[{i}] must be a list of {width} values")
+    return [dict(zip(columns, row, strict=True)) for row in rows]
+
+
+def expand_payload(raw: dict[str, Any]) -> dict[str, Any]:
+    expanded = None
+    for key in SECTIONS:
+        section = raw.get(key)
+        if isinstance(section, dict):
+            if expanded is None:
+                expanded = dict(raw)
+            expanded[key] = _records(key, section)
+    return raw if expanded is None else expanded
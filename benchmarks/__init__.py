@@ -0,0 +1,11 @@
+"""Performance benchmarks for the normalize path.
+
+Three layers, all reporting JSON:
+
+* ``micro`` - normalizer engines on synthetic payloads (in-process, no HTTP);
+* ``e2e`` - GraphQL requests through ``create_app()`` over an in-process ASGI client;
+* ``load`` - concurrent HTTP load against a running server, with a distinct
+  payload per request unless ``--repeat`` is given.
+
+Run via ``python scripts/bench.py <layer> [options]``.
+"""
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import sys
+
+
+def _sizes(value: str) -> tuple[int, ...]:
+    return tuple(int(v) for v in value.split(","))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Normalize-path benchmarks (JSON output)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    sub = parser.add_subparsers(dest="layer", required=True)
+
+    micro = sub.add_parser("micro", help="Normalizer engines on synthetic payloads")
+    micro.add_argument("--sizes", type=_sizes, default=(10, 1_000, 100_000, 1_000_000), help="Comma-separated")
+    micro.add_argument("--alias-mix", type=float, default=0.5, help="Share of records using short aliases")
+
+    e2e = sub.add_parser("e2e", help="GraphQL through create_app() over in-process ASGI")
+    e2e.add_argument("--sizes", type=_sizes, default=(10, 1_000, 10_000), help="Comma-separated item counts")
+    e2e.add_argument("--requests", type=int, default=20)
+
+    load = sub.add_parser("load", help="HTTP load against a running server")
+    load.add_argument("--url", default=os.environ.get("CARGO_URL", "http://127.0.0.1:8000"))
+    load.add_argument("--items", type=int, default=1_000, help="Item lines per request payload")
+    load.add_argument("--concurrency", type=int, default=16)
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    load.add_argument("--api-key", default=os.environ.get("X_CARGO_API_KEY"))
+    load.add_argument("--server-pid", type=int, help="Report this server process's peak RSS too (Linux)")
+    load.add_argument(
+        "--repeat", action="store_true", help="Send the same body every time (measures result-cache hits)"
+    )
+
+    startup = sub.add_parser("startup", help="Import time and time to first /ready in fresh processes")
+    startup.add_argument("--runs", type=int, default=5)
+    startup.add_argument("--runners", default="uvicorn,server", help="Comma-separated: uvicorn, server")
+
+    args = parser.parse_args()
+    if args.layer == "micro":
+        from .micro import run as run_micro
+
+        report = run_micro(args.sizes, alias_mix=args.alias_mix)
+    elif args.layer == "e2e":
+        from .e2e import run as run_e2e
+
+        report = run_e2e(args.sizes, requests=args.requests)
+    elif args.layer == "startup":
+        from .startup import run as run_startup
+
+        report = run_startup(args.runs, tuple(args.runners.split(",")))
+    else:
+        from .load import run as run_load
+
+        report = run_load(
+            args.url, args.items, args.concurrency, args.duration, args.api_key, args.server_pid, args.repeat
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""End-to-end benchmarks through ``create_app()`` over an in-process ASGI client."""
+
+import asyncio
+import time
+from typing import Any
+
+import httpx
+
+from app.api import create_app
+
+from .payloads import make_payload, make_typed_inputs
+from .stats import peak_rss_mb, summarize
+
+# Plain selection, served by the pre-serialized fast path
+FAST_QUERY = (
+    "mutation($src:String!, $p: JSON!){ normalize(source:$src, payload:$p){ "
+    "itemTypes{ name unitWeightKg unitVolumeM3 lengthM widthM heightM } items{ itemTypeName quantity } } }"
+)
+# __typename forces regular Strawberry execution
+GENERIC_QUERY = (
+    "mutation($src:String!, $p: JSON!){ normalize(source:$src, payload:$p){ "
+    "__typename itemTypes{ name unitWeightKg unitVolumeM3 } items{ itemTypeName quantity } } }"
+)
+
+# Canonical typed inputs: no JSON scalar, alias lookup or casts (never cached)
+TYPED_FAST_QUERY = (
+    "mutation($src:String!, $t:[ItemTypeIn!]!, $i:[ItemIn!]!){ normalizeTyped(source:$src, itemTypes:$t, items:$i){ "
+    "itemTypes{ name unitWeightKg unitVolumeM3 lengthM widthM heightM } items{ itemTypeName quantity } } }"
+)
+TYPED_GENERIC_QUERY = (
+    "mutation($src:String!, $t:[ItemTypeIn!]!, $i:[ItemIn!]!){ normalizeTyped(source:$src, itemTypes:$t, items:$i){ "
+    "__typename itemTypes{ name unitWeightKg unitVolumeM3 } items{ itemTypeName quantity } } }"
+)
+
+
+async def _measure(client: httpx.AsyncClient, bodies: list[dict[str, Any]]) -> dict[str, Any]:
+    latencies = []
+    started = time.perf_counter()
+    for body in bodies:
+        t0 = time.perf_counter()
+        r = await client.post("/graphql", json=body)
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def _run(sizes: tuple[int, ...], requests: int) -> list[dict[str, Any]]:
+    transport = httpx.ASGITransport(app=create_app())
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for n in sizes:
+            payload = make_payload(n)
+            for name, query in (("fast_path", FAST_QUERY), ("generic", GENERIC_QUERY)):
+                # A distinct source per request keeps the result cache from hiding the work
+                uncached = [
+                    {"query": query, "variables": {"src": f"{name}-{n}-{i}", "p": payload}} for i in range(requests)
+                ]
+                cached = [{"query": query, "variables": {"src": f"{name}-{n}", "p": payload}}] * (requests + 1)
+                results.append({"case": name, "cached": False, "items": n, **await _measure(client, uncached)})
+                await _measure(client, cached[:1])  # warm the cache
+                results.append({"case": name, "cached": True, "items": n, **await _measure(client, cached[1:])})
+            item_types, items = make_typed_inputs(n)
+            for name, query in (("typed_fast_path", TYPED_FAST_QUERY), ("typed_generic", TYPED_GENERIC_QUERY)):
+                typed = [{"query": query, "variables": {"src": f"{name}-{n}", "t": item_types, "i": items}}] * requests
+                results.append({"case": name, "cached": False, "items": n, **await _measure(client, typed)})
+    return results
+
+
+def run(sizes: tuple[int, ...] = (10, 1_000, 10_000), requests: int = 20) -> dict[str, Any]:
+    results = asyncio.run(_run(sizes, requests))
+    return {"layer": "e2e", "results": results, "peak_rss_mb": peak_rss_mb()}
@@ -0,0 +1,76 @@
+"""HTTP load generator for a running server (``python scripts/run.py --no-reload``)."""
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Any
+
+import httpx
+
+from .e2e import FAST_QUERY
+from .payloads import make_payload
+from .stats import peak_rss_mb, summarize
+
+
+async def _run(
+    url: str,
+    items: int,
+    concurrency: int,
+    duration_s: float,
+    api_key: str | None,
+    repeat: bool,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> dict[str, Any]:
+    payload = make_payload(items)
+    headers = {"X-Cargo-Api-Key": api_key} if api_key else {}
+    latencies: list[float] = []
+    errors: Counter[str] = Counter()
+    sent = itertools.count()
+    deadline = time.perf_counter() + duration_s
+
+    def body() -> dict[str, Any]:
+        # A unique payload per request keeps the result cache out of the measurement (unknown keys are ignored)
+        p = payload if repeat else {**payload, "loadRequest": next(sent)}
+        return {"query": FAST_QUERY, "variables": {"src": "load", "p": p}}
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while time.perf_counter() < deadline:
+            t0 = time.perf_counter()
+            try:
+                r = await client.post("/graphql", json=body(), headers=headers)
+                r.raise_for_status()
+                graphql_errors = r.json().get("errors")
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+                continue
+            if graphql_errors:
+                # HTTP 200 with e.g. BACKPRESSURE is a failed request too
+                errors[graphql_errors[0].get("extensions", {}).get("code", "GRAPHQL_ERROR")] += 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60, transport=transport) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {**summarize(latencies, elapsed), "errors": sum(errors.values()), "error_kinds": dict(errors)}
+
+
+def run(
+    url: str = "http://127.0.0.1:8000",
+    items: int = 1_000,
+    concurrency: int = 16,
+    duration_s: float = 10.0,
+    api_key: str | None = None,
+    server_pid: int | None = None,
+    repeat: bool = False,
+) -> dict[str, Any]:
+    """Send ``normalize`` requests for ``duration_s`` seconds; ``repeat`` resends one body to measure cache hits."""
+    stats = asyncio.run(_run(url, items, concurrency, duration_s, api_key, repeat))
+    out = {"layer": "load", "url": url, "items": items, "concurrency": concurrency, "repeat": repeat, **stats}
+    out["client_peak_rss_mb"] = peak_rss_mb()
+    if server_pid is not None:
+        out["server_peak_rss_mb"] = peak_rss_mb(server_pid)
+    return out
@@ -0,0 +1,52 @@
+"""Micro-benchmarks of the normalizer engines (no HTTP, no GraphQL)."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.services.columnar import normalize_columnar
+from app.services.mapping import get_plan
+from app.services.normalizer import normalize_raw
+
+from .payloads import make_payload
+from .stats import peak_rss_mb
+
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: tuple[int, ...] = DEFAULT_SIZES, alias_mix: float = 0.5, source: str = "bench") -> dict[str, Any]:
+    extract_type, extract_item = get_plan(source).extractors
+    results = []
+    for n in sizes:
+        payload = make_payload(n, alias_mix=alias_mix)
+        records = len(payload["types"]) + len(payload["items"])
+        # Keep total work per case roughly constant
+        repeat = max(3, min(200, 1_000_000 // max(n, 1)))
+        cases = {
+            "extractors": lambda: (
+                [extract_type(t) for t in payload["types"]],
+                [extract_item(i) for i in payload["items"]],
+            ),
+            "normalize_raw": lambda: normalize_raw(source, payload),
+            "normalize_columnar": lambda: normalize_columnar(source, payload),
+        }
+        for name, fn in cases.items():
+            seconds = _best_of(fn, repeat)
+            results.append(
+                {
+                    "case": name,
+                    "records": records,
+                    "best_ms": round(seconds * 1000, 3),
+                    "ns_per_record": round(seconds * 1e9 / records, 1),
+                }
+            )
+    return {"layer": "micro", "alias_mix": alias_mix, "results": results, "peak_rss_mb": peak_rss_mb()}
@@ -0,0 +1,37 @@
+import random
+from typing import Any
+
+# Raw key spellings the default mapping plan accepts
+_TYPE_ALIASES = [("name", "unitWeightKg", "unitVolumeM3"), ("id", "w", "v")]
+_ITEM_ALIASES = [("itemTypeName", "quantity"), ("type", "q")]
+
+
+def make_payload(n_items: int, n_types: int | None = None, alias_mix: float = 0.5, seed: int = 0) -> dict[str, Any]:
+    """Synthetic payload with ``n_items`` item lines over ``n_types`` types.
+
+    ``alias_mix`` is the share of records using the short aliases (``id``/``w``/``v``,
+    ``type``/``q``) instead of the canonical keys; quantities are sometimes strings
+    to exercise the casts.
+    """
+    rng = random.Random(seed)
+    n_types = n_types or max(1, min(n_items // 10, 1_000))
+    types = []
+    for i in range(n_types):
+        name_key, w_key, v_key = _TYPE_ALIASES[rng.random() < alias_mix]
+        rec: dict[str, Any] = {name_key: f"Type {i}", w_key: round(rng.uniform(0.1, 50), 3), v_key: rng.random()}
+        if rng.random() < 0.5:
+            rec.update(lengthM=rng.random(), widthM=rng.random(), heightM=rng.random())
+        types.append(rec)
+    items = []
+    for _ in range(n_items):
+        name_key, q_key = _ITEM_ALIASES[rng.random() < alias_mix]
+        q = rng.randint(1, 100)
+        items.append({name_key: f"Type {rng.randrange(n_types)}", q_key: str(q) if rng.random() < 0.1 else q})
+    return {"types": types, "items": items}
+
+
+def make_typed_inputs(n_items: int, n_types: int | None = None, seed: int = 0) -> tuple[list[dict], list[dict]]:
+    """``make_payload`` with canonical keys and int quantities, as ``normalizeTyped`` variables."""
+    payload = make_payload(n_items, n_types, alias_mix=0.0, seed=seed)
+    items = [{"itemTypeName": i["itemTypeName"], "quantity": int(i["quantity"])} for i in payload["items"]]
+    return payload["types"], items
@@ -0,0 +1,121 @@
+"""Cold-start cost: ``python -X importtime`` totals and time until ``/ready`` answers 200."""
+
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Any
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """``(module, self_us, cumulative_us, depth)`` per line of ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m[4], int(m[1]), int(m[2]), (len(m[3]) - 1) // 2))
+    return rows
+
+
+def import_times(module: str = "main", runs: int = 5, top: int = 10) -> dict[str, Any]:
+    """Median import time of ``module`` in fresh interpreters, and its most expensive third-party packages."""
+    totals: list[float] = []
+    packages: dict[str, list[int]] = {}
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        rows = parse_importtime(proc.stderr)
+        totals.append(next(cum for name, _, cum, depth in reversed(rows) if name == module and depth == 0) / 1000)
+        run: dict[str, int] = {}
+        for name, _, cum, _ in rows:
+            # Cumulative time per top-level package, however deep its first import happened
+            package = name.split(".")[0]
+            run[package] = max(run.get(package, 0), cum)
+        for package, cum in run.items():
+            packages.setdefault(package, []).append(cum)
+    ranked = sorted(
+        ((statistics.median(v) / 1000, p) for p, v in packages.items() if p not in (module, "app")), reverse=True
+    )
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "top_packages_ms": {p: round(ms, 1) for ms, p in ranked[:top]},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, proc: subprocess.Popen[bytes], timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline and proc.poll() is None:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as r:
+                if r.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def time_to_ready(command: list[str], port: int, env: dict[str, str] | None = None, timeout: float = 60.0) -> float:
+    """Seconds from spawning ``command`` until ``GET /ready`` on ``port`` returns 200."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        command,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not _wait_ready(f"http://127.0.0.1:{port}/ready", proc, timeout):
+            raise RuntimeError(f"{' '.join(command)} did not become ready within {timeout}s")
+        return time.perf_counter() - started
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def _commands(port: int) -> dict[str, list[str]]:
+    return {
+        "uvicorn": [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        "server": [sys.executable, "-m", "app.server", "--port", str(port), "--workers", "1"],
+    }
+
+
+def run(runs: int = 5, runners: tuple[str, ...] = ("uvicorn", "server")) -> dict[str, Any]:
+    # Both with and without the dev-only routes; the app itself is the same
+    profiles = {"default": {}, "lean": {"GRAPHIQL_ENABLED": "false", "DOCS_ENABLED": "false"}}
+    ready: list[dict[str, Any]] = []
+    for runner in runners:
+        for profile, env in profiles.items():
+            samples = []
+            for _ in range(runs):
+                port = _free_port()
+                samples.append(time_to_ready(_commands(port)[runner], port, env))
+            ready.append(
+                {
+                    "runner": runner,
+                    "profile": profile,
+                    "median_ms": round(statistics.median(samples) * 1000, 1),
+                    "min_ms": round(min(samples) * 1000, 1),
+                }
+            )
+    return {"imports": import_times(runs=runs), "time_to_ready": ready}
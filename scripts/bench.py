@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Run normalize-path benchmarks (micro | e2e | load | startup); forwards all args, prints a JSON report."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+
+def main() -> int:
+    # Run from the repo root so `app` and `benchmarks` are importable
+    root = Path(__file__).resolve().parent.parent
+    cmd = [sys.executable, "-m", "benchmarks", *sys.argv[1:]]
+    print("$", " ".join(cmd), file=sys.stderr)
+    return subprocess.run(cmd, cwd=root).returncode
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Normalize a local JSON / NDJSON export directly, without HTTP (memory-mapped; optional worker fan-out)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+# Run from anywhere: make the repo root importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import get_settings  # noqa: E402
+from app.services.columnar import ColumnarBuilder  # noqa: E402
+from app.services.ingest import (  # noqa: E402
+    build_columnar,
+    detect_ndjson,
+    iter_records,
+    mapped,
+    merge_parts,
+    ndjson_ranges,
+    normalize_range_columnar,
+    normalize_range_ndjson,
+    write_columnar,
+    write_ndjson,
+)
+from app.services.mapping import load_sources  # noqa: E402
+from app.services.stream import StreamFormatError  # noqa: E402
+from app.services.validation import NORMALIZE_ERRORS  # noqa: E402
+
+
+def run(path: str, source: str, out: IO[bytes], fmt: str, ndjson: bool, workers: int, mappings: dict[str, Any]) -> int:
+    if workers <= 1:
+        with mapped(path) as buf:
+            if fmt == "ndjson":
+                return write_ndjson(source, iter_records(buf, ndjson), out)
+            batch = build_columnar(source, iter_records(buf, ndjson))
+        write_columnar(batch, out)
+        return len(batch.type_name) + len(batch.quantity)
+
+    with mapped(path) as buf:
+        ranges = ndjson_ranges(buf, workers)
+    if len(ranges) <= 1:
+        # Empty or single-line input: nothing to fan out
+        return run(path, source, out, fmt, ndjson, 1, mappings)
+    pool = ProcessPoolExecutor(
+        max_workers=len(ranges),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=load_sources,
+        initargs=(mappings,),
+    )
+    with pool, tempfile.TemporaryDirectory(prefix="normalize-file-") as tmp:
+        if fmt == "ndjson":
+            parts = [os.path.join(tmp, f"part-{i:04d}") for i in range(len(ranges))]
+            futures = [
+                pool.submit(normalize_range_ndjson, path, source, True, a, b, part)
+                for (a, b), part in zip(ranges, parts, strict=True)
+            ]
+            count = sum(f.result() for f in futures)
+            merge_parts(parts, out)
+            return count
+        batches = [pool.submit(normalize_range_columnar, path, source, True, a, b) for a, b in ranges]
+        builder = ColumnarBuilder(source)
+        for batch_future in batches:
+            builder.extend(batch_future.result())
+        batch = builder.build()
+    write_columnar(batch, out)
+    return len(batch.type_name) + len(batch.quantity)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Normalize a local JSON/NDJSON export")
+    parser.add_argument("input", help="{types, items} JSON document, or NDJSON with kind=type|item per line")
+    parser.add_argument("--source", required=True, help="Source name selecting the SOURCE_MAPPINGS plan")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--format", choices=("ndjson", "columnar"), default="ndjson", help="Output format")
+    parser.add_argument(
+        "--input-format", choices=("auto", "ndjson", "json"), default="auto", help="auto: by .ndjson/.jsonl suffix"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Processes for NDJSON input (split by byte range)")
+    args = parser.parse_args(argv)
+
+    mappings = get_settings().source_mappings
+    load_sources(mappings)
+    ndjson = detect_ndjson(args.input, args.input_format)
+    workers = args.workers
+    if workers > 1 and not ndjson:
+        print("note: a JSON document cannot be split by offset; using one process", file=sys.stderr)
+        workers = 1
+
+    started = time.perf_counter()
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        count = run(args.input, args.source, out, args.format, ndjson, workers, mappings)
+    except (StreamFormatError, *NORMALIZE_ERRORS) as e:
+        if out is not sys.stdout.buffer:
+            out.close()
+            os.unlink(args.output)
+        print(f"error: {args.input}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    print(json.dumps({"records": count, "seconds": round(time.perf_counter() - started, 3)}), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Run uvicorn for local dev (reload by default; supports --workers/--no-reload)."""
+"""Run uvicorn for local dev (reload by default; supports --workers/--no-reload) or the production runner (--prod)."""
 
 from __future__ import annotations
 
@@ -15,18 +15,34 @@ def main() -> int:
     parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)))
     parser.add_argument("--workers", type=int, default=0, help="Number of workers (0 means single with reload)")
     parser.add_argument("--no-reload", action="store_true", help="Disable auto-reload")
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Preloaded, forked workers via app.server (one per CPU unless --workers; SERVER_* settings apply)",
+    )
     args = parser.parse_args()
 
+    if args.prod:
+        base = [sys.executable, "-m", "app.server", "--host", args.host, "--port", str(args.port)]
+        if args.workers > 0:
+            base += ["--workers", str(args.workers)]
+        print("$", " ".join(base))
+        return subprocess.run(base).returncode
+
     base = [sys.executable, "-m", "uvicorn", "main:app", "--host", args.host, "--port", str(args.port)]
 
+    env = None
     if args.workers and args.workers > 0:
         base += ["--workers", str(args.workers)]
+        # Every worker starts its own normalize pool; split the CPUs between them unless configured
+        env = dict(os.environ)
+        env.setdefault("NORMALIZE_POOL_WORKERS", str(max(1, (os.cpu_count() or 1) // args.workers)))
     else:
         if not args.no_reload:
             base += ["--reload"]
 
     print("$", " ".join(base))
-    return subprocess.run(base).returncode
+    return subprocess.run(base, env=env).returncode
 
 
 if __name__ == "__main__":
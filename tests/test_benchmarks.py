@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from benchmarks import load, micro
+from benchmarks.payloads import make_payload
+from benchmarks.startup import parse_importtime
+from benchmarks.stats import percentile, summarize
+
+
+def test_make_payload_is_deterministic_and_mixes_aliases():
+    a = make_payload(200, alias_mix=0.5, seed=1)
+    assert a == make_payload(200, alias_mix=0.5, seed=1)
+    assert len(a["items"]) == 200
+    assert {"type", "itemTypeName"} <= {k for it in a["items"] for k in it}
+
+
+def test_summarize_percentiles():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    stats = summarize([0.001] * 99 + [0.1], elapsed_s=1.0)
+    assert stats["requests"] == 100 and stats["p50_ms"] == 1.0 and stats["max_ms"] == 100.0
+
+
+def test_micro_smoke():
+    report = micro.run(sizes=(10,))
+    assert {r["case"] for r in report["results"]} == {"extractors", "normalize_raw", "normalize_columnar"}
+    assert report["peak_rss_mb"] > 0
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     app.core.config\n"
+        "import time:      1500 |       1620 |   app.api\n"
+        "import time:        80 |       1700 | main\n"
+    )
+    assert parse_importtime(stderr) == [
+        ("app.core.config", 120, 120, 2),
+        ("app.api", 1500, 1620, 1),
+        ("main", 80, 1700, 0),
+    ]
+
+
+def test_load_sends_distinct_payloads_and_counts_graphql_errors():
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        if len(bodies) % 2:
+            return httpx.Response(200, json={"data": {"normalize": {"items": []}}})
+        return httpx.Response(200, json={"data": None, "errors": [{"extensions": {"code": "BACKPRESSURE"}}]})
+
+    stats = asyncio.run(load._run("http://bench", 10, 1, 0.05, None, False, httpx.MockTransport(handler)))
+    assert len(set(bodies)) == len(bodies) > 1
+    assert stats["errors"] == stats["error_kinds"]["BACKPRESSURE"] == len(bodies) // 2
+    assert stats["requests"] == len(bodies) - len(bodies) // 2
@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from app.api import create_app
+from app.core import admission
+from app.core.admission import AdmissionController, AdmissionMiddleware, AdmissionRejectedError
+
+
+def test_controller_queues_fifo_and_sheds():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=1, max_bytes=0, max_queued=1, queue_timeout=1.0)
+        await ctl.acquire(10)
+        waiting = asyncio.create_task(ctl.acquire(20))
+        await asyncio.sleep(0)
+        assert ctl.saturated and ctl.queued == 1
+        with pytest.raises(AdmissionRejectedError) as full:
+            await ctl.acquire(5)
+        assert full.value.status_code == 429
+        ctl.release(10)
+        await waiting
+        assert (ctl.in_flight, ctl.bytes_in_flight, ctl.queued) == (1, 20, 0)
+        ctl.release(20)
+        assert not ctl.saturated
+        return ctl.rejected
+
+    assert asyncio.run(scenario()) == {"queue_full": 1, "queue_timeout": 0}
+
+
+def test_controller_byte_budget_and_timeout():
+    async def scenario():
+        ctl = AdmissionController(max_in_flight=8, max_bytes=100, max_queued=8, queue_timeout=0.01)
+        await ctl.acquire(500)  # larger than the budget, but alone
+        with pytest.raises(AdmissionRejectedError) as timeout:
+            await ctl.acquire(1)
+        assert timeout.value.status_code == 503 and timeout.value.retry_after == 1
+        ctl.release(500)
+        await ctl.acquire(60)
+        await ctl.acquire(40)
+        assert ctl.saturated and ctl.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_middleware_rejects_with_retry_after():
+    ctl = AdmissionController(max_in_flight=1, max_bytes=0, max_queued=0, queue_timeout=1.0)
+    app = AdmissionMiddleware(PlainTextResponse("ok"), ctl)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await ctl.acquire(0)
+            shed = await client.post("/graphql", content=b"{}")
+            other = await client.get("/graphql")
+            ctl.release(0)
+            admitted = await client.post("/graphql", content=b"{}")
+        return shed, other, admitted
+
+    shed, other, admitted = asyncio.run(scenario())
+    assert shed.status_code == 429 and shed.headers["retry-after"] == "1"
+    assert other.status_code == admitted.status_code == 200
+    assert ctl.in_flight == 0
+
+
+def test_middleware_charges_bodies_without_content_length():
+    ctl = AdmissionController(max_in_flight=8, max_bytes=100, max_queued=0, queue_timeout=1.0, unknown_length_bytes=60)
+    app = AdmissionMiddleware(PlainTextResponse("ok"), ctl)
+
+    async def chunks():
+        yield b"{}"
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await ctl.acquire(50)
+            # Chunked: no Content-Length, so it counts as 60 bytes and does not fit next to 50
+            shed = await client.post("/graphql", content=chunks())
+            ctl.release(50)
+            admitted = await client.post("/graphql", content=chunks())
+        return shed, admitted
+
+    shed, admitted = asyncio.run(scenario())
+    assert shed.status_code == 429 and admitted.status_code == 200
+    assert ctl.bytes_in_flight == 0
+    assert AdmissionController(1, 100, 0, 1.0).charge(None) == 100
+
+
+def test_ready_reports_saturation(monkeypatch):
+    ctl = AdmissionController(max_in_flight=1, max_bytes=0, max_queued=0, queue_timeout=2.0)
+    monkeypatch.setattr(admission, "_controller", ctl)
+    monkeypatch.setattr(admission, "_configured", True)
+    client = TestClient(create_app())
+    assert client.get("/ready").json() == {"status": "ready"}
+    ctl.in_flight = 1
+    r = client.get("/ready")
+    assert r.status_code == 503 and r.headers["retry-after"] == "2"
+    assert r.json()["status"] == "saturated"
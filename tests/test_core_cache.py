@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache as cache_module
+from app.core.cache import MemoryLRUCache, get_result_cache, request_key, result_key
+from app.graphql import router
+
+
+def test_result_key_is_canonical():
+    assert result_key("s", {"a": 1, "b": [1, 2]}) == result_key("s", {"b": [1, 2], "a": 1})
+    assert result_key("s", {"a": 1}) != result_key("t", {"a": 1})
+
+
+def test_request_key_hashes_large_bodies_off_the_loop(monkeypatch: pytest.MonkeyPatch):
+    threads = []
+    digest = cache_module._body_digest
+
+    def recording(body: bytes, scope: tuple[str, ...]) -> str:
+        threads.append(threading.current_thread())
+        return digest(body, scope)
+
+    monkeypatch.setattr(cache_module, "_body_digest", recording)
+    monkeypatch.setattr(cache_module, "_INLINE_HASH_BYTES", 10)
+    small, large = asyncio.run(request_key(b"{}", "a")), asyncio.run(request_key(b"x" * 100, "a"))
+    assert threads[0] is threading.main_thread() and threads[1] is not threading.main_thread()
+    assert small != large
+    assert asyncio.run(request_key(b"{}", "a")) != asyncio.run(request_key(b"{}", "b"))
+
+
+def test_lru_evicts_by_byte_budget_and_expires(monkeypatch):
+    cache = MemoryLRUCache(max_bytes=20, ttl_seconds=10)
+    cache.set("a", b"x" * 8)
+    cache.set("b", b"y" * 8)
+    assert cache.get("a") == b"x" * 8  # "a" is now most recently used
+    cache.set("c", b"z" * 8)
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries, stats.bytes) == (1, 1, 1, 2, 18)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("a") is None
+    assert cache.stats().entries == 1
+
+
+def test_repeated_normalize_is_served_from_cache(client: TestClient):
+    query = 'mutation($p: JSON!){ normalize(source:"cache", payload:$p){ items{ itemTypeName quantity } } }'
+    body = {"query": query, "variables": {"p": {"items": [{"type": "S", "q": 2}]}}}
+    cache = get_result_cache()
+    assert cache is not None
+    before = cache.stats()
+
+    first = client.post("/graphql", json=body).json()
+    second = client.post("/graphql", json=body).json()
+
+    assert first == second == {"data": {"normalize": {"items": [{"itemTypeName": "S", "quantity": 2}]}}}
+    after = cache.stats()
+    assert after.hits - before.hits == 1
+    assert after.misses - before.misses == 1
+
+
+def test_fast_path_hit_is_served_as_cached_bytes(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    query = 'mutation($p: JSON!){ n: normalize(source:"hit", payload:$p){ items{ quantity } } }'
+    body = {"query": query, "variables": {"p": {"items": [{"type": "S", "q": 5}]}}}
+    first = client.post("/graphql", json=body)
+
+    async def fail(*_):
+        raise AssertionError("cache hit must not normalize again")
+
+    monkeypatch.setattr(router, "normalize_dicts_offloaded", fail)
+    second = client.post("/graphql", json=body)
+    assert second.content == first.content == b'{"data":{"n":{"items":[{"quantity":5}]}}}'
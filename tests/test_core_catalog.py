@@ -0,0 +1,120 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import create_app
+from app.core import catalog as catalog_module
+from app.core.catalog import CatalogCache, CatalogUnavailableError
+from app.core.push import BackendPusher, Outbox
+
+
+class CatalogBackend:
+    """Serves GET /item-types with an ETag; POST /item-types and container items for the pusher."""
+
+    def __init__(self) -> None:
+        self.types = [{"id": 7, "name": "Small Box"}]
+        self.version = 1
+        self.gets: list[str | None] = []
+        self.down = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            return httpx.Response(503)
+        if request.method == "GET":
+            self.gets.append(request.headers.get("if-none-match"))
+            etag = f'"v{self.version}"'
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304)
+            return httpx.Response(200, json=self.types, headers={"ETag": etag})
+        if request.url.path == "/item-types":
+            created = {"id": 100 + len(self.types), **json.loads(request.content)}
+            self.types.append(created)
+            return httpx.Response(201, json=created)
+        return httpx.Response(201, json={})
+
+
+def _cache(backend: CatalogBackend, ttl: float = 300.0) -> CatalogCache:
+    return CatalogCache(httpx.AsyncClient(base_url="http://backend", transport=httpx.MockTransport(backend)), ttl)
+
+
+def test_catalog_revalidates_with_etag_after_ttl():
+    backend = CatalogBackend()
+
+    async def scenario():
+        cache = _cache(backend, ttl=0)
+        first = await cache.get()
+        assert first.resolve("small box").id == 7
+        await cache.get()  # stale: schedules a background revalidation
+        await cache._refresh_task
+        assert cache.requests == {"fetched": 1, "not_modified": 1, "failed": 0}
+
+        backend.types.append({"id": 8, "name": "Pallet"})
+        backend.version = 2
+        await cache.refresh()
+        assert cache.index.resolve("PALLET").id == 8
+        assert backend.gets == [None, '"v1"', '"v1"']
+
+        backend.down = True
+        assert await cache.refresh() is cache.index
+        assert cache.requests["failed"] == 1
+        await cache.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_catalog_unavailable_without_index():
+    backend = CatalogBackend()
+    backend.down = True
+    with pytest.raises(CatalogUnavailableError):
+        asyncio.run(_cache(backend).get())
+
+
+def test_pusher_uses_catalog_instead_of_fetching_per_push(tmp_path):
+    backend = CatalogBackend()
+    cache = _cache(backend)
+    pusher = BackendPusher(cache.client, Outbox(str(tmp_path)), max_retries=0, catalog=cache)
+    types = [{"name": "Crate", "unitWeightKg": 1.0, "unitVolumeM3": 0.1}]
+    items = [{"itemTypeName": "Small Box", "quantity": 1}, {"itemTypeName": "Crate", "quantity": 2}]
+
+    async def scenario():
+        for _ in range(3):
+            report = await pusher.push("c1", types, items)
+            assert report.items_sent == 2 and not report.issues
+
+    asyncio.run(scenario())
+    assert len(backend.gets) == 1
+    assert cache.index.resolve("crate") is not None
+
+
+def test_graphql_normalize_attaches_catalog_ids(monkeypatch):
+    backend = CatalogBackend()
+    client = TestClient(create_app())
+    query = (
+        'mutation($p: JSON!, $c: CatalogMode!){ normalize(source:"unit", payload:$p, catalog:$c){ '
+        "itemTypes{ id name } items{ itemTypeId itemTypeName } errors{ path code } } }"
+    )
+    payload = {
+        "types": [{"id": "small  box", "w": 1, "v": 0.1}, {"id": "Smal Box", "w": 1, "v": 0.1}],
+        "items": [{"type": "small  box", "q": 2}, {"type": "Unknown", "q": 1}],
+    }
+
+    monkeypatch.setattr(catalog_module, "_catalog", None)
+    monkeypatch.setattr(catalog_module, "get_backend_client", lambda: None)
+    r = client.post("/graphql", json={"query": query, "variables": {"p": payload, "c": "EXACT"}})
+    assert r.json()["errors"][0]["extensions"]["code"] == "CATALOG_NOT_CONFIGURED"
+
+    monkeypatch.setattr(catalog_module, "_catalog", _cache(backend))
+    r = client.post("/graphql", json={"query": query, "variables": {"p": payload, "c": "FUZZY"}})
+    data = r.json()["data"]["normalize"]
+    assert data["itemTypes"] == [{"id": "7", "name": "Small Box"}, {"id": "7", "name": "Small Box"}]
+    assert data["items"] == [
+        {"itemTypeId": "7", "itemTypeName": "Small Box"},
+        {"itemTypeId": None, "itemTypeName": "Unknown"},
+    ]
+    assert data["errors"] == [
+        {"path": "itemTypes[1].name", "code": "FUZZY_MATCH"},
+        {"path": "items[1].itemTypeName", "code": "UNKNOWN_CATALOG_ITEM_TYPE"},
+    ]
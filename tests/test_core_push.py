@@ -0,0 +1,169 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import create_app
+from app.core import backend as backend_module
+from app.core import push
+from app.core.push import BACKEND_REJECTED, BackendPusher, Outbox, PushReport
+
+
+class StubBackend:
+    """In-memory /item-types and /containers/{id}/items.
+
+    ``fail`` makes the next N POSTs answer ``fail_status`` without applying them;
+    ``lose`` makes the next N POSTs apply and then answer 500.
+    """
+
+    def __init__(self) -> None:
+        self.types = {"Existing": {"id": "t0", "name": "Existing"}}
+        self.items: list[tuple[str, dict]] = []
+        self.fail = 0
+        self.fail_status = 503
+        self.lose = 0
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        assert request.headers.get("authorization") == "Bearer tok"
+        if request.method == "GET" and request.url.path == "/api/item-types":
+            return httpx.Response(200, json=list(self.types.values()))
+        if self.fail:
+            self.fail -= 1
+            return httpx.Response(self.fail_status, headers={"Retry-After": "0"})
+        response = self._apply(request)
+        if self.lose:
+            self.lose -= 1
+            return httpx.Response(500)
+        return response
+
+    def _apply(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        records = body if isinstance(body, list) else [body]
+        if request.url.path == "/api/item-types":
+            if any(r.get("unitWeightKg", 0) < 0 for r in records):
+                return httpx.Response(400, text="unitWeightKg must be positive")
+            created = []
+            for r in records:
+                self.types[r["name"]] = created_type = {"id": f"t{len(self.types)}", **r}
+                created.append(created_type)
+            return httpx.Response(201, json=created if isinstance(body, list) else created[0])
+        container = request.url.raw_path.decode().split("/")[3]
+        self.items.extend((container, r) for r in records)
+        return httpx.Response(201, json=body)
+
+
+def _pusher(backend: StubBackend, tmp_path, batch_size: int = 1) -> BackendPusher:
+    client = httpx.AsyncClient(
+        base_url="http://backend/api", headers={"Authorization": "Bearer tok"}, transport=httpx.MockTransport(backend)
+    )
+    return BackendPusher(client, Outbox(str(tmp_path)), batch_size=batch_size, max_retries=2, backoff_seconds=0)
+
+
+TYPES = [
+    {"name": "Existing", "unitWeightKg": 1.0, "unitVolumeM3": 0.1, "lengthM": None},
+    {"name": "New", "unitWeightKg": 2.0, "unitVolumeM3": 0.2, "lengthM": None},
+]
+ITEMS = [{"itemTypeName": "Existing", "quantity": 3}, {"itemTypeName": "New", "quantity": 4}]
+
+
+@pytest.mark.parametrize("batch_size", [1, 50])
+def test_push_creates_missing_types_and_sends_items(tmp_path, batch_size: int):
+    backend = StubBackend()
+    report = asyncio.run(_pusher(backend, tmp_path, batch_size).push("c 1", TYPES, ITEMS))
+    assert (report.item_types_created, report.items_sent, report.issues) == (1, 2, [])
+    assert "lengthM" not in backend.types["New"]
+    assert backend.items == [
+        ("c%201", {"itemTypeId": "t0", "quantity": 3}),
+        ("c%201", {"itemTypeId": "t1", "quantity": 4}),
+    ]
+
+
+def test_push_retries_transient_errors(tmp_path):
+    backend = StubBackend()
+    backend.fail = 2
+    report = asyncio.run(_pusher(backend, tmp_path).push("c1", TYPES, ITEMS))
+    assert report.items_sent == 2 and report.outboxed_items == 0
+
+
+def test_push_does_not_resend_unconfirmed_items(tmp_path):
+    backend = StubBackend()
+    pusher = _pusher(backend, tmp_path)
+    # The first item-type and item POSTs are applied, but their responses are lost
+    backend.lose = 1
+    report = asyncio.run(pusher.push("c1", TYPES, [{"itemTypeName": "New", "quantity": 4}]))
+    # The type is found by name, so the line is sent once
+    assert report.items_sent == 1 and report.issues == [] and len(backend.types) == 2
+
+    backend.lose = 1
+    report = asyncio.run(pusher.push("c1", [], [{"itemTypeName": "New", "quantity": 5}]))
+    assert [(i.path, i.code) for i in report.issues] == [("items[0]", push.PUSH_UNCONFIRMED)]
+    assert report.outboxed_items == 0 and len(pusher.outbox) == 0
+    assert [r["quantity"] for _, r in backend.items] == [4, 5]
+
+
+def test_push_outboxes_and_replays_in_background(tmp_path):
+    backend = StubBackend()
+    pusher = _pusher(backend, tmp_path)
+    backend.fail, backend.fail_status = 100, 429
+    report = asyncio.run(pusher.push("c1", TYPES, ITEMS))
+    assert (report.outboxed_item_types, report.outboxed_items) == (1, 2)
+    assert len(pusher.outbox) == 1
+
+    async def push_and_drain() -> PushReport:
+        report = await pusher.push("c1", [], [])
+        assert pusher._drain_task is not None
+        await pusher._drain_task
+        return report
+
+    backend.fail = 0
+    asyncio.run(push_and_drain())
+    assert len(pusher.outbox) == 0
+    assert sorted(r["quantity"] for _, r in backend.items) == [3, 4]
+
+
+def test_outbox_requeues_claims_of_dead_workers(tmp_path):
+    outbox = Outbox(str(tmp_path))
+    (tmp_path / "00000000000000000001-dead.claim-4194305").write_text('{"containerId": "c1"}')
+    outbox.put({"containerId": "c2"})
+    claimed = [entry["containerId"] for _, entry in outbox.claim()]
+    assert claimed == ["c1", "c2"]
+
+
+def test_push_reports_rejected_types(tmp_path):
+    backend = StubBackend()
+    bad = [{"name": "Bad", "unitWeightKg": -1.0, "unitVolumeM3": 0.1}]
+    report = asyncio.run(_pusher(backend, tmp_path).push("c1", bad, [{"itemTypeName": "Bad", "quantity": 1}]))
+    assert [(i.path, i.code) for i in report.issues] == [
+        ("itemTypes[0]", BACKEND_REJECTED),
+        ("items[0]", push.ITEM_TYPE_NOT_PUSHED),
+    ]
+    assert report.outboxed_items == 0 and not backend.items
+
+
+def test_graphql_normalize_and_push(monkeypatch, tmp_path):
+    backend = StubBackend()
+    client = TestClient(create_app())
+    query = (
+        'mutation($p: JSON!){ normalizeAndPush(source:"unit", payload:$p, containerId:"c1"){ '
+        "itemTypesCreated itemsSent outboxedItems errors{ code } } }"
+    )
+    variables = {"p": {"types": [{"id": "New", "w": 2, "v": 0.2}], "items": [{"type": "New", "q": 5}]}}
+
+    monkeypatch.setattr(push, "_pusher", None)
+    monkeypatch.setattr(backend_module, "_client", None)
+    monkeypatch.setattr(push.get_settings(), "backend_base_url", "")
+    r = client.post("/graphql", json={"query": query, "variables": variables})
+    assert r.json()["errors"][0]["extensions"]["code"] == "PUSH_NOT_CONFIGURED"
+
+    monkeypatch.setattr(push, "_pusher", _pusher(backend, tmp_path))
+    r = client.post("/graphql", json={"query": query, "variables": variables})
+    assert r.json()["data"]["normalizeAndPush"] == {
+        "itemTypesCreated": 1,
+        "itemsSent": 1,
+        "outboxedItems": 0,
+        "errors": [],
+    }
@@ -0,0 +1,98 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.graphql import router
+from app.graphql.fastpath import match_normalize
+
+FULL = (
+    "mutation($src:String!, $p: JSON!){ normalize(source:$src, payload:$p){ "
+    "itemTypes{ name unitWeightKg unitVolumeM3 lengthM widthM heightM } items{ itemTypeName quantity } } }"
+)
+PARTIAL = 'mutation N($p: JSON!){ n: normalize(source:"x", payload:$p){ items{ quantity itemTypeName } } }'
+PAYLOAD = {
+    "types": [{"id": "S", "w": 1, "v": 0.02, "lengthM": 0.4}, {"name": "M"}],
+    "items": [{"type": "S", "q": 3}, {"type": "M", "q": "2"}],
+}
+
+
+def test_match_normalize_accepts_plain_selections():
+    full = match_normalize(FULL, None)
+    assert full is not None and full.is_full
+    partial = match_normalize(PARTIAL, "N")
+    assert partial is not None and not partial.is_full
+    assert partial.response_key == "n"
+    assert partial.selections == (("items", ("quantity", "itemTypeName")),)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "query { health }",
+        'mutation($p: JSON!){ normalize(source:"x", payload:$p){ items{ __typename quantity } } }',
+        'mutation($p: JSON!){ normalize(source:"x", payload:$p){ items{ q: quantity } } }',
+        'mutation($p: JSON!, $unused: Int){ normalize(source:"x", payload:$p){ items{ quantity } } }',
+        'mutation($p: JSON!){ normalize(source:"x", payload:$p){ items{ ...F } } } fragment F on Item { quantity }',
+        'mutation($p: JSON){ normalize(source:"x", payload:$p){ items{ quantity } } }',
+        'mutation($p: JSON!){ normalize(source:"x", payload:$p){ items{ quantity } } other: normalize(source:"y") }',
+    ],
+)
+def test_match_normalize_rejects_other_shapes(query: str):
+    assert match_normalize(query, None) is None
+
+
+@pytest.mark.parametrize(("query", "variables"), [(FULL, {"src": "fp", "p": PAYLOAD}), (PARTIAL, {"p": PAYLOAD})])
+def test_fast_path_matches_regular_execution(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, query: str, variables: dict
+):
+    body = {"query": query, "variables": variables}
+    fast = client.post("/graphql", json=body)
+    cached = client.post("/graphql", json=body)
+
+    monkeypatch.setattr(router, "match_normalize", lambda *_: None)
+    slow = client.post("/graphql", json=body)
+
+    assert fast.status_code == slow.status_code == 200
+    assert fast.json() == cached.json() == slow.json()
+    assert "errors" not in slow.json()
+
+
+def test_fast_path_falls_back_for_errors(client: TestClient):
+    body = {"query": FULL, "variables": {"src": "fp", "p": {"items": [{"q": "abc"}]}}}
+    data = client.post("/graphql", json=body).json()
+    assert data["data"] is None
+    assert data["errors"][0]["path"] == ["normalize"]
+
+
+TYPED = (
+    'mutation($t:[ItemTypeIn!]!, $i:[ItemIn!]!){ normalizeTyped(source:"x", itemTypes:$t, items:$i){ '
+    "itemTypes{ name unitWeightKg unitVolumeM3 lengthM widthM heightM } items{ itemTypeName quantity } } }"
+)
+TYPED_VARIABLES = {
+    "t": [{"name": "S", "unitWeightKg": 1, "unitVolumeM3": 0.02, "lengthM": 0.4}],
+    "i": [{"itemTypeName": "S", "quantity": 3}],
+}
+
+
+def test_typed_fast_path_matches_regular_execution(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    shape = match_normalize(TYPED, None)
+    assert shape is not None and shape.field == "normalizeTyped" and shape.response_key == "normalizeTyped"
+    body = {"query": TYPED, "variables": TYPED_VARIABLES}
+    fast = client.post("/graphql", json=body).json()
+
+    monkeypatch.setattr(router, "match_normalize", lambda *_: None)
+    assert fast == client.post("/graphql", json=body).json()
+    assert fast["data"]["normalizeTyped"]["itemTypes"][0]["unitWeightKg"] == 1.0
+
+
+@pytest.mark.parametrize(
+    "variables",
+    [
+        {"t": [{"name": "S", "unitWeightKg": "1", "unitVolumeM3": 0.1}], "i": []},
+        {"t": [{"name": "S", "unitWeightKg": 1}], "i": []},
+        {"t": [], "i": [{"itemTypeName": "S", "quantity": 2.5}]},
+        {"t": [], "i": [{"itemTypeName": "S", "quantity": 1, "q": 1}]},
+    ],
+)
+def test_typed_fast_path_leaves_invalid_input_to_graphql(client: TestClient, variables: dict):
+    data = client.post("/graphql", json={"query": TYPED, "variables": variables}).json()
+    assert data.get("data") is None and data["errors"]
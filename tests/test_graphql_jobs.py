@@ -0,0 +1,139 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import create_app
+from app.core import jobs
+from app.core.config import get_settings
+from app.core.jobs import Job, JobManager, SpilledResult
+
+SUBMIT = 'mutation($p: JSON!){ submitNormalizeJob(source:"unit", payload:$p){ id status totalRecords } }'
+POLL = """
+query($id: String!, $after: String) {
+  normalizeJob(id: $id) {
+    status progress processedRecords error
+    items(first: 2, after: $after) { nodes { itemTypeName quantity } pageInfo { endCursor hasNextPage } totalCount }
+    itemTypes { totalCount }
+  }
+}
+"""
+PAYLOAD = {"types": [{"id": "S"}, {"id": "M"}], "items": [{"type": "S", "q": q} for q in range(5)]}
+
+
+@pytest.fixture
+def jobs_client(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Iterator[TestClient]:
+    # One event loop for the whole test, so background jobs keep running between requests
+    monkeypatch.setattr(jobs, "_manager", None)
+    monkeypatch.setattr(get_settings(), "normalize_chunk_size", 3)
+    monkeypatch.setattr(get_settings(), "jobs_spill_dir", str(tmp_path))
+    with TestClient(create_app()) as client:
+        yield client
+
+
+def _wait(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        job = client.post("/graphql", json={"query": POLL, "variables": {"id": job_id}}).json()["data"]["normalizeJob"]
+        if job["status"] in ("DONE", "FAILED"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def _run_job(client: TestClient) -> tuple[str, dict]:
+    submitted = client.post("/graphql", json={"query": SUBMIT, "variables": {"p": PAYLOAD}}).json()
+    job = submitted["data"]["submitNormalizeJob"]
+    assert job["status"] in ("QUEUED", "RUNNING", "DONE") and job["totalRecords"] == 7
+    return job["id"], _wait(client, job["id"])
+
+
+def _page_through(client: TestClient, job_id: str, first_page: dict) -> list[int]:
+    quantities = []
+    page = first_page["items"]
+    while True:
+        quantities += [n["quantity"] for n in page["nodes"]]
+        if not page["pageInfo"]["hasNextPage"]:
+            return quantities
+        variables = {"id": job_id, "after": page["pageInfo"]["endCursor"]}
+        page = client.post("/graphql", json={"query": POLL, "variables": variables}).json()["data"]["normalizeJob"][
+            "items"
+        ]
+
+
+def test_job_runs_and_pages_results(jobs_client: TestClient):
+    job_id, job = _run_job(jobs_client)
+    assert job["status"] == "DONE" and job["progress"] == 1.0 and job["processedRecords"] == 7
+    assert job["items"]["totalCount"] == 5 and job["itemTypes"]["totalCount"] == 2
+    assert _page_through(jobs_client, job_id, job) == [0, 1, 2, 3, 4]
+
+
+def test_job_item_pages_resolve_item_types(jobs_client: TestClient):
+    job_id, _ = _run_job(jobs_client)
+    query = "query($id: String!){ normalizeJob(id: $id){ items(first: 2){ nodes { quantity itemType { name } } } } }"
+    r = jobs_client.post("/graphql", json={"query": query, "variables": {"id": job_id}})
+    assert r.json()["data"]["normalizeJob"]["items"]["nodes"] == [
+        {"quantity": 0, "itemType": {"name": "S"}},
+        {"quantity": 1, "itemType": {"name": "S"}},
+    ]
+
+
+def test_job_results_spill_to_disk(jobs_client: TestClient, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(get_settings(), "jobs_spill_min_records", 1)
+    job_id, job = _run_job(jobs_client)
+    assert job["status"] == "DONE"
+    assert (tmp_path / job_id / "items.idx").stat().st_size == 5 * 8
+    assert _page_through(jobs_client, job_id, job) == [0, 1, 2, 3, 4]
+
+
+def test_job_is_visible_to_other_workers(jobs_client: TestClient, tmp_path: Path):
+    job_id, _ = _run_job(jobs_client)
+    # A second manager on the same directory stands in for another worker
+    other = JobManager(
+        str(tmp_path), max_concurrent=1, max_pending=1, max_retained=10, ttl_seconds=60, spill_min_records=0
+    )
+    job = other.get(job_id)
+    assert job is not None and job.status == "done" and job.processed_records == 7
+    assert [r["quantity"] for r in other.result(job).page("items", 1, 2)] == [1, 2]
+
+
+def test_job_of_exited_worker_is_failed(tmp_path: Path):
+    def manager() -> JobManager:
+        return JobManager(
+            str(tmp_path), max_concurrent=1, max_pending=1, max_retained=10, ttl_seconds=60, spill_min_records=0
+        )
+
+    async def submit() -> Job:
+        owner = manager()
+        job = await owner.submit("unit", PAYLOAD)
+        await owner.shutdown()
+        return job
+
+    job = asyncio.run(submit())
+    assert manager().get(job.id).error == "cancelled"
+    # As if the worker had crashed instead: the state says running, under a pid that cannot exist
+    job.status, job.error, job.pid = "running", None, 2**22 + 1
+    manager()._save(job)
+    orphan = manager().get(job.id)
+    assert orphan is not None and orphan.status == "failed" and orphan.error == "worker exited"
+
+
+def test_unknown_job_and_bad_cursor(jobs_client: TestClient):
+    r = jobs_client.post("/graphql", json={"query": POLL, "variables": {"id": "nope"}})
+    assert r.json()["data"]["normalizeJob"] is None
+    job_id, _ = _run_job(jobs_client)
+    r = jobs_client.post("/graphql", json={"query": POLL, "variables": {"id": job_id, "after": "garbage"}})
+    assert r.json()["errors"][0]["extensions"]["code"] == "BAD_USER_INPUT"
+
+
+def test_spilled_result_pages_by_offset(tmp_path: Path):
+    result = SpilledResult(tmp_path)
+    result.append([{"name": "S"}], [{"quantity": 1}, {"quantity": 2}])
+    result.append([], [{"quantity": 3}])
+    assert result.count("items") == 3
+    assert result.page("items", 1, 10) == [{"quantity": 2}, {"quantity": 3}]
+    assert result.page("items", 3, 10) == []
+    result.clear()
+    assert not any(tmp_path.iterdir())
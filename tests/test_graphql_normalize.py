@@ -2,6 +2,9 @@ import json
 
 from fastapi.testclient import TestClient
 
+from app.graphql import types
+from app.graphql.types import ItemTypeIndex
+
 
 def test_graphql_normalize_basic(client: TestClient):
     query = (
@@ -52,3 +55,51 @@ def test_graphql_normalize_empty_payload(client: TestClient):
     out = data["data"]["normalize"]
     assert out["itemTypes"] == []
     assert out["items"] == []
+
+
+def test_graphql_item_type_and_totals_resolve_through_one_index(client: TestClient, monkeypatch):
+    builds = []
+    original = ItemTypeIndex.get
+
+    def counting_get(self, name):
+        if self._by_name is None:
+            builds.append(name)
+        return original(self, name)
+
+    monkeypatch.setattr(ItemTypeIndex, "get", counting_get)
+    query = (
+        'mutation($p: JSON!){ normalize(source:"test", payload:$p){ '
+        "items{ itemTypeName totalWeightKg totalVolumeM3 itemType{ name unitWeightKg } } } }"
+    )
+    payload = {
+        "types": [{"id": "S", "w": 2, "v": 0.5}, {"id": "S", "w": 9, "v": 9}, {"id": "M", "w": 4, "v": 1}],
+        "items": [{"type": "S", "q": 3}, {"type": "M", "q": 1}, {"type": "X", "q": 2}],
+    }
+    r = client.post("/graphql", json={"query": query, "variables": {"p": payload}})
+    assert r.json()["data"]["normalize"]["items"] == [
+        {
+            "itemTypeName": "S",
+            "totalWeightKg": 6.0,
+            "totalVolumeM3": 1.5,
+            "itemType": {"name": "S", "unitWeightKg": 2.0},
+        },
+        {
+            "itemTypeName": "M",
+            "totalWeightKg": 4.0,
+            "totalVolumeM3": 1.0,
+            "itemType": {"name": "M", "unitWeightKg": 4.0},
+        },
+        {"itemTypeName": "X", "totalWeightKg": None, "totalVolumeM3": None, "itemType": None},
+    ]
+    assert len(builds) == 1
+
+
+def test_graphql_items_are_linked_only_when_item_type_is_selected(client: TestClient, monkeypatch):
+    links = []
+    monkeypatch.setattr(types, "link_items", lambda items, index: links.append(len(items)))
+    query = 'mutation($p: JSON!){{ normalize(source:"test", payload:$p){{ errors{{ code }} items{{ {} }} }} }}'
+    payload = {"types": [{"id": "S", "w": 2, "v": 0.5}], "items": [{"type": "S", "q": 3}]}
+    for fields in ("itemTypeName quantity", "... on Item { quantity }", "quantity itemType{ name }"):
+        r = client.post("/graphql", json={"query": query.format(fields), "variables": {"p": payload}})
+        assert "errors" not in r.json()
+    assert links == [1]
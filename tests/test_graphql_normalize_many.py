@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.services.batch import chunk_payload, merge_results
+
+QUERY = (
+    "mutation($inputs: [NormalizeInput!]!){ "
+    "normalizeMany(inputs:$inputs){ itemTypes{ name unitWeightKg } items{ itemTypeName quantity } } }"
+)
+
+
+def test_chunk_and_merge_preserve_order():
+    raw = {"types": [{"name": str(i)} for i in range(5)], "items": [{"q": i} for i in range(3)]}
+    chunks = chunk_payload(raw, 2)
+    assert [len(c.get("types", c.get("items"))) for c in chunks] == [2, 2, 1, 2, 1]
+    merged = merge_results([(c.get("types", []), c.get("items", [])) for c in chunks])
+    assert merged == (raw["types"], raw["items"])
+
+
+def test_graphql_normalize_many(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(get_settings(), "normalize_chunk_size", 2)
+    inputs = [
+        {
+            "source": "a",
+            "payload": {"types": [{"id": "S", "w": 1}], "items": [{"type": "S", "q": q} for q in range(5)]},
+        },
+        {"source": "b", "payload": {}},
+        {"source": "c", "payload": {"items": [{"type": "M", "q": "7"}]}},
+    ]
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"inputs": inputs}})
+    assert r.status_code == 200
+    data = r.json()
+    assert "errors" not in data
+    out = data["data"]["normalizeMany"]
+    assert len(out) == 3
+    assert out[0]["itemTypes"] == [{"name": "S", "unitWeightKg": 1.0}]
+    assert [i["quantity"] for i in out[0]["items"]] == [0, 1, 2, 3, 4]
+    assert out[1] == {"itemTypes": [], "items": []}
+    assert out[2]["items"] == [{"itemTypeName": "M", "quantity": 7}]
+
+
+def test_normalize_many_with_more_chunks_than_queue_slots(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "normalize_chunk_size", 1)
+    monkeypatch.setattr(settings, "normalize_max_queue_depth", 4)
+    inputs = [{"source": "a", "payload": {"items": [{"type": "S", "q": q} for q in range(5)]}}]
+    data = client.post("/graphql", json={"query": QUERY, "variables": {"inputs": inputs}}).json()
+    assert "errors" not in data
+    assert [i["quantity"] for i in data["data"]["normalizeMany"][0]["items"]] == [0, 1, 2, 3, 4]
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache, workers
+from app.core.config import get_settings
+
+QUERY = 'mutation($p: JSON!){ normalize(source:"t", payload:$p){ items{ itemTypeName quantity } } }'
+PAYLOAD = {"items": [{"type": "S", "q": i} for i in range(10)]}
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(cache, "_configured", True)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_large_payload_is_offloaded(client: TestClient, monkeypatch: pytest.MonkeyPatch, executor: str):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "normalize_inline_max_records", 5)
+    monkeypatch.setattr(settings, "normalize_offload_executor", executor)
+
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": PAYLOAD}})
+    data = r.json()
+    assert "errors" not in data
+    assert [i["quantity"] for i in data["data"]["normalize"]["items"]] == list(range(10))
+
+
+def test_full_queue_returns_backpressure_error(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "normalize_inline_max_records", 5)
+    monkeypatch.setattr(settings, "normalize_max_queue_depth", 1)
+    monkeypatch.setattr(workers, "_pending", 1)
+
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": PAYLOAD}})
+    data = r.json()
+    assert data["data"] is None
+    assert data["errors"][0]["extensions"]["code"] == "BACKPRESSURE"
+
+
+def test_offload_all_keeps_within_queue_depth(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(get_settings(), "normalize_max_queue_depth", 3)
+    seen = []
+
+    def work(i: int) -> int:
+        seen.append(workers.pending_jobs())
+        time.sleep(0.01)
+        return i * 2
+
+    async def run() -> list[int]:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return await workers.offload_all(work, [(i,) for i in range(10)], executor)
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    assert max(seen) == 3
+    assert workers.pending_jobs() == 0
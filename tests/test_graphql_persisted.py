@@ -0,0 +1,42 @@
+import hashlib
+
+from fastapi.testclient import TestClient
+
+from app.graphql.persisted import PersistedQueryStore
+
+QUERY = 'mutation($p: JSON!){ normalize(source:"apq", payload:$p){ items{ quantity } } }'
+SHA = hashlib.sha256(QUERY.encode()).hexdigest()
+EXTENSIONS = {"persistedQuery": {"version": 1, "sha256Hash": SHA}}
+VARIABLES = {"p": {"items": [{"q": 4}]}}
+
+
+def test_persisted_query_register_then_hash_only(client: TestClient):
+    r = client.post("/graphql", json={"variables": VARIABLES, "extensions": EXTENSIONS})
+    assert r.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+    r = client.post("/graphql", json={"query": QUERY, "variables": VARIABLES, "extensions": EXTENSIONS})
+    assert r.json() == {"data": {"normalize": {"items": [{"quantity": 4}]}}}
+
+    r = client.post("/graphql", json={"variables": VARIABLES, "extensions": EXTENSIONS})
+    assert r.json() == {"data": {"normalize": {"items": [{"quantity": 4}]}}}
+
+    # Non fast-path documents are resolved from the store as well
+    health = "query { health }"
+    ext = {"persistedQuery": {"version": 1, "sha256Hash": hashlib.sha256(health.encode()).hexdigest()}}
+    client.post("/graphql", json={"query": health, "extensions": ext})
+    assert client.post("/graphql", json={"extensions": ext}).json() == {"data": {"health": "ok"}}
+
+
+def test_persisted_query_hash_mismatch(client: TestClient):
+    r = client.post("/graphql", json={"query": "query { health }", "extensions": EXTENSIONS})
+    assert r.json()["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+def test_store_is_bounded_lru():
+    store = PersistedQueryStore(maxsize=2)
+    store.register("a", "A")
+    store.register("b", "B")
+    assert store.get("a") == "A"
+    store.register("c", "C")
+    assert store.get("b") is None
+    assert len(store) == 2
@@ -1,5 +1,8 @@
 from fastapi.testclient import TestClient
 
+from app.api import create_app
+from app.core.config import get_settings
+
 
 def test_health_ok(client: TestClient):
     r = client.get("/health")
@@ -13,3 +16,17 @@ def test_ready_ok(client: TestClient):
     assert r.status_code == 200
     assert r.json() == {"status": "ready"}
     assert r.headers.get("content-type", "").startswith("application/json")
+
+
+def test_dev_routes_can_be_disabled(monkeypatch):
+    client = TestClient(create_app())
+    assert client.get("/docs").status_code == 200
+    assert "graphiql" in client.get("/graphql", headers={"Accept": "text/html"}).text.lower()
+
+    monkeypatch.setattr(get_settings(), "docs_enabled", False)
+    monkeypatch.setattr(get_settings(), "graphiql_enabled", False)
+    client = TestClient(create_app())
+    assert client.get("/docs").status_code == 404
+    assert client.get("/openapi.json").status_code == 404
+    assert client.get("/graphql", headers={"Accept": "text/html"}).status_code == 404
+    assert client.get("/ready").status_code == 200
@@ -0,0 +1,54 @@
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MAX_SOURCES, OVERFLOW_LABEL, Histogram
+
+QUERY = (
+    'mutation($p: JSON!){ normalize(source:"metrics-test", payload:$p){ '
+    "itemTypes{ name } items{ itemTypeName quantity } } }"
+)
+# __typename keeps the request off the fast path so the GraphQL stages run
+GENERIC = 'mutation($p: JSON!){ normalize(source:"metrics-test", payload:$p){ __typename items{ quantity } } }'
+PAYLOAD = {"types": [{"name": "S"}], "items": [{"type": "S", "q": 1}, {"type": "S", "q": 2}]}
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("t_seconds", "Test.", ("stage",), (0.1, 1.0))
+    h.observe(0.05, "a")
+    h.observe(0.5, "a")
+    h.observe(5.0, "a")
+    lines = list(h.render())
+    assert 't_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{stage="a",le="1.0"} 2' in lines
+    assert 't_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 't_seconds_count{stage="a"} 3' in lines
+
+
+def test_histogram_caps_source_cardinality_only():
+    h = Histogram("t_seconds", "Test.", ("stage", "source"), (1.0,))
+    for i in range(MAX_SOURCES + 10):
+        for stage in ("parse", "normalize"):
+            h.observe(1.0, stage, f"s{i}")
+    text = "\n".join(h.render())
+    assert f't_seconds_count{{stage="normalize",source="{OVERFLOW_LABEL}"}} 10' in text
+    assert f't_seconds_count{{stage="parse",source="{OVERFLOW_LABEL}"}} 10' in text
+    assert f't_seconds_count{{stage="parse",source="s{MAX_SOURCES - 1}"}} 1' in text
+    assert f'source="s{MAX_SOURCES + 5}"' not in text
+
+
+def test_metrics_endpoint_reports_stages_and_payloads(client: TestClient):
+    for query in (QUERY, GENERIC):
+        r = client.post("/graphql", json={"query": query, "variables": {"p": PAYLOAD}})
+        assert r.status_code == 200 and "errors" not in r.json()
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+    for stage in ("parse", "graphql_parse", "graphql_validate", "serialize"):
+        assert f'cargo_stage_seconds_count{{stage="{stage}",source=""}}' in text
+    for stage in ("normalize", "materialize"):
+        assert f'cargo_stage_seconds_count{{stage="{stage}",source="metrics-test"}}' in text
+    assert 'cargo_payload_records_bucket{source="metrics-test",le="10.0"}' in text
+    assert 'cargo_payload_bytes_count{source="metrics-test"}' in text
+    assert "# TYPE cargo_result_cache_events_total counter" in text
+    assert "cargo_offload_pending_jobs 0" in text
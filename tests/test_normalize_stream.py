@@ -0,0 +1,123 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.services.stream import JSONDocumentDecoder, NDJSONDecoder, RecordTooLargeError
+
+
+def _lines(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines() if line]
+
+
+def test_stream_ndjson(client: TestClient):
+    body = "\n".join(
+        [
+            json.dumps({"kind": "type", "id": "S", "w": 1, "v": 0.02}),
+            json.dumps({"kind": "item", "type": "S", "q": "3"}),
+            "",
+        ]
+    )
+    r = client.post("/normalize/stream?source=test", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    out = _lines(r.text)
+    assert out[0] == {
+        "kind": "type",
+        "name": "S",
+        "unitWeightKg": 1.0,
+        "unitVolumeM3": 0.02,
+        "lengthM": None,
+        "widthM": None,
+        "heightM": None,
+    }
+    assert out[1] == {"kind": "item", "itemTypeName": "S", "quantity": 3}
+
+
+def test_stream_json_document(client: TestClient):
+    payload = {"source": "ignored", "types": [{"name": "Box S"}], "items": [{"type": "Box S", "q": 1}] * 3}
+    r = client.post("/normalize/stream?source=test", json=payload)
+    assert r.status_code == 200
+    out = _lines(r.text)
+    assert [o["kind"] for o in out] == ["type", "item", "item", "item"]
+
+
+def test_stream_malformed_input_ends_with_error_line(client: TestClient):
+    r = client.post(
+        "/normalize/stream?source=test",
+        content='{"kind": "item", "q": 1}\nnot json\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    out = _lines(r.text)
+    assert out[0]["kind"] == "item"
+    assert out[-1]["kind"] == "error"
+
+
+def test_json_document_decoder_handles_arbitrary_chunk_boundaries():
+    doc = json.dumps({"items": [{"q": 10, "type": "ü"}, {"q": 20}], "extra": 123, "types": None}).encode()
+    for size in (1, 2, 3, 7):
+        decoder = JSONDocumentDecoder()
+        records = []
+        for i in range(0, len(doc), size):
+            records.extend(decoder.feed(doc[i : i + size]))
+        records.extend(decoder.close())
+        assert records == [("item", {"q": 10, "type": "ü"}), ("item", {"q": 20})]
+
+
+def test_stream_chunked_request_body(client: TestClient):
+    doc = json.dumps({"types": [{"id": "S", "w": 1}], "items": [{"type": "S", "q": i} for i in range(50)]}).encode()
+
+    def chunks():
+        for i in range(0, len(doc), 17):
+            yield doc[i : i + 17]
+
+    r = client.post("/normalize/stream?source=test", content=chunks(), headers={"Content-Type": "application/json"})
+    assert r.status_code == 200
+    out = _lines(r.text)
+    assert out[0]["kind"] == "type" and out[0]["name"] == "S"
+    assert [o["quantity"] for o in out[1:]] == list(range(50))
+
+
+def test_oversized_record_is_rejected_before_it_is_complete():
+    ndjson = NDJSONDecoder(max_record_bytes=64)
+    assert len(list(ndjson.feed(b'{"kind": "item", "q": 1}\n{"kind": "item", "type": "'))) == 1
+    with pytest.raises(RecordTooLargeError):
+        list(ndjson.feed(b"x" * 64))
+
+    document = JSONDocumentDecoder(max_record_bytes=64)
+    assert len(list(document.feed(b'{"items": [{"q": 1}, {"type": "'))) == 1
+    with pytest.raises(RecordTooLargeError):
+        for _ in range(10):
+            list(document.feed(b"x" * 16))
+
+
+def test_json_document_decoder_reparses_a_growing_value_rarely(monkeypatch: pytest.MonkeyPatch):
+    decoder = JSONDocumentDecoder()
+    calls = 0
+    raw_decode = decoder._json.raw_decode
+
+    def counting(*args):
+        nonlocal calls
+        calls += 1
+        return raw_decode(*args)
+
+    monkeypatch.setattr(decoder._json, "raw_decode", counting)
+    list(decoder.feed(b'{"items": [{"name": "'))
+    for _ in range(1000):
+        assert list(decoder.feed(b"x" * 10)) == []
+    records = list(decoder.feed(b'"}]}')) + list(decoder.close())
+    assert records == [("item", {"name": "x" * 10_000})]
+    assert calls < 30
+
+
+def test_stream_oversized_record_ends_with_error_line(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(get_settings(), "stream_max_record_bytes", 100)
+    r = client.post(
+        "/normalize/stream?source=test",
+        content='{"kind": "item", "q": 1}\n{"kind": "item", "type": "' + "x" * 200 + '"}\n',
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    out = _lines(r.text)
+    assert out[0]["kind"] == "item"
+    assert out[-1]["kind"] == "error" and "longer than 100" in out[-1]["message"]
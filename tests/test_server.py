@@ -0,0 +1,34 @@
+import asyncio
+
+import uvicorn
+
+from app import server
+from app.server import RecyclingServer, available_cpus, rss_bytes
+
+
+def test_available_cpus_is_positive():
+    assert available_cpus() >= 1
+
+
+def test_main_splits_cpus_between_worker_pools(monkeypatch):
+    options = []
+    monkeypatch.setattr(server, "serve", options.append)
+    monkeypatch.setattr(server, "available_cpus", lambda: 8)
+    server.main(["--workers", "4"])
+    server.main(["--workers", "16"])
+    server.main(["--workers", "4", "--pool-workers", "3"])
+    server.main([])
+    assert [(o.workers, o.pool_workers) for o in options] == [(4, 2), (16, 1), (4, 3), (8, 1)]
+
+
+def test_recycling_server_stops_over_rss_limit(monkeypatch):
+    config = uvicorn.Config(app=lambda *_: None)
+    monkeypatch.setattr(server, "rss_bytes", lambda: 200 << 20)
+    assert asyncio.run(RecyclingServer(config, 100 << 20).on_tick(0)) is True
+    assert asyncio.run(RecyclingServer(config, 300 << 20).on_tick(0)) is False
+    assert asyncio.run(RecyclingServer(config).on_tick(0)) is False
+
+
+def test_rss_bytes_reads_proc():
+    rss = rss_bytes()
+    assert rss is None or rss > 0
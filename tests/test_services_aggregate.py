@@ -0,0 +1,56 @@
+from fastapi.testclient import TestClient
+
+from app.services.aggregate import UNKNOWN_ITEM_TYPE, aggregate_items, normalize_aggregated
+
+QUERY = (
+    'mutation($p: JSON!){ normalize(source:"unit", payload:$p, aggregate:true){ '
+    "items{ itemTypeName quantity totalWeightKg totalVolumeM3 } errors{ path code message } } }"
+)
+PAYLOAD = {
+    "types": [{"id": "S", "w": 2, "v": 0.5}, {"id": "M", "w": 4, "v": 1}],
+    "items": [{"type": "S", "q": 3}, {"type": "X", "q": 1}, {"type": "S", "q": 2}, {"type": "X", "q": 4}],
+}
+
+
+def test_aggregate_merges_lines_and_attaches_totals():
+    item_types, items, issues = normalize_aggregated("unit", PAYLOAD)
+    assert [t["name"] for t in item_types] == ["S", "M"]
+    assert items == [
+        {"itemTypeName": "S", "quantity": 5, "totalWeightKg": 10.0, "totalVolumeM3": 2.5},
+        {"itemTypeName": "X", "quantity": 5, "totalWeightKg": None, "totalVolumeM3": None},
+    ]
+    assert [(i.path, i.code) for i in issues] == [
+        ("items[1].itemTypeName", UNKNOWN_ITEM_TYPE),
+        ("items[3].itemTypeName", UNKNOWN_ITEM_TYPE),
+    ]
+
+
+def test_aggregate_first_type_definition_wins():
+    types = [
+        {"name": "S", "unitWeightKg": 1.0, "unitVolumeM3": 1.0},
+        {"name": "S", "unitWeightKg": 9.0, "unitVolumeM3": 9.0},
+    ]
+    _, items, issues = aggregate_items(types, [{"itemTypeName": "S", "quantity": 2}])
+    assert items[0]["totalWeightKg"] == 2.0 and not issues
+
+
+def test_graphql_normalize_aggregate(client: TestClient):
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": PAYLOAD}})
+    assert r.status_code == 200
+    data = r.json()["data"]["normalize"]
+    assert data["items"][0] == {"itemTypeName": "S", "quantity": 5, "totalWeightKg": 10.0, "totalVolumeM3": 2.5}
+    assert data["errors"][0] == {
+        "path": "items[1].itemTypeName",
+        "code": UNKNOWN_ITEM_TYPE,
+        "message": "Item type 'X' is not defined",
+    }
+
+
+def test_graphql_normalize_without_aggregate_keeps_lines(client: TestClient):
+    query = QUERY.replace(", aggregate:true", "")
+    r = client.post("/graphql", json={"query": query, "variables": {"p": PAYLOAD}})
+    data = r.json()["data"]["normalize"]
+    assert [i["quantity"] for i in data["items"]] == [3, 1, 2, 4]
+    # Per-line totals come from the line's item type; undefined types stay null
+    assert [i["totalWeightKg"] for i in data["items"]] == [6.0, None, 4.0, None]
+    assert data["errors"] == []
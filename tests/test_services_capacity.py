@@ -0,0 +1,102 @@
+from fastapi.testclient import TestClient
+
+from app.services.capacity import ContainerSpec, fit_containers
+
+TYPES = [
+    {"name": "Small Box", "unitWeightKg": 1.0, "unitVolumeM3": 0.02},
+    {"name": "Large Box", "unitWeightKg": 5.0, "unitVolumeM3": 0.1},
+]
+QUERY = """
+query($t: [ItemTypeIn!]!, $i: [ItemIn!]!, $c: [ContainerIn!]!) {
+  containerFit(itemTypes: $t, items: $i, containers: $c) {
+    containers { name weightKg volumeUtilization overflowWeightKg fits items { itemTypeName quantity } }
+    unassigned { itemTypeName quantity }
+    errors { path code }
+  }
+}
+"""
+
+
+def test_fit_checks_current_load():
+    preloaded = ContainerSpec("B", 12.0, 1.0, ({"itemTypeName": "Large Box", "quantity": 3},))
+    result = fit_containers(TYPES, [], [preloaded])
+    (load,) = result.containers
+    assert load.weight_kg == 15.0 and load.overflow_weight_kg == 3.0
+    assert load.volume_utilization is not None and abs(load.volume_utilization - 0.3) < 1e-9
+    assert not load.fits
+
+
+def test_fit_assigns_largest_first_and_splits_lines():
+    items = [
+        {"itemTypeName": "Small Box", "quantity": 10},
+        {"itemTypeName": "Large Box", "quantity": 3},
+        {"itemTypeName": "Small Box", "quantity": 4},
+        {"itemTypeName": "Ghost", "quantity": 1},
+    ]
+    containers = [ContainerSpec("A", 12.0, 10.0), ContainerSpec("B", 100.0, 10.0)]
+    result = fit_containers(TYPES, items, containers)
+    a, b = result.containers
+    # Two large boxes fill A to 10 kg, the third and the small ones spill into B
+    assert a.items == [("Large Box", 2), ("Small Box", 2)]
+    assert b.items == [("Large Box", 1), ("Small Box", 12)]
+    assert a.fits and b.fits and a.weight_kg == 12.0
+    assert result.unassigned == []
+    assert [(i.path, i.code) for i in result.issues] == [("items[3].itemTypeName", "UNKNOWN_ITEM_TYPE")]
+
+
+def test_fit_reports_unassigned_units():
+    result = fit_containers(TYPES, [{"itemTypeName": "Large Box", "quantity": 5}], [ContainerSpec("A", 11.0, 1.0)])
+    assert result.containers[0].items == [("Large Box", 2)]
+    assert result.unassigned == [("Large Box", 3)]
+
+
+def test_graphql_container_fit(client: TestClient):
+    variables = {
+        "t": TYPES,
+        "i": [{"itemTypeName": "Small Box", "quantity": 10}],
+        "c": [
+            {
+                "name": "A",
+                "maxWeightKg": 200,
+                "maxVolumeM3": 2.5,
+                "items": [{"itemTypeName": "Large Box", "quantity": 3}],
+            },
+            {"name": "Empty", "maxWeightKg": 0, "maxVolumeM3": 0},
+        ],
+    }
+    r = client.post("/graphql", json={"query": QUERY, "variables": variables})
+    assert r.status_code == 200
+    data = r.json()
+    assert "errors" not in data
+    fit = data["data"]["containerFit"]
+    a, empty = fit["containers"]
+    assert a["weightKg"] == 25.0 and a["fits"] and a["overflowWeightKg"] == 0.0
+    assert a["items"] == [{"itemTypeName": "Large Box", "quantity": 3}, {"itemTypeName": "Small Box", "quantity": 10}]
+    assert empty == {
+        "name": "Empty",
+        "weightKg": 0.0,
+        "volumeUtilization": None,
+        "overflowWeightKg": 0.0,
+        "fits": True,
+        "items": [],
+    }
+    assert fit["unassigned"] == [] and fit["errors"] == []
+
+
+def test_graphql_container_fit_item_totals(client: TestClient):
+    query = """
+    query($t: [ItemTypeIn!]!, $i: [ItemIn!]!, $c: [ContainerIn!]!) {
+      containerFit(itemTypes: $t, items: $i, containers: $c) {
+        containers { items { totalWeightKg itemType { name } } }
+        unassigned { totalVolumeM3 }
+      }
+    }
+    """
+    variables = {
+        "t": TYPES,
+        "i": [{"itemTypeName": "Large Box", "quantity": 3}],
+        "c": [{"name": "A", "maxWeightKg": 10, "maxVolumeM3": 1}],
+    }
+    fit = client.post("/graphql", json={"query": query, "variables": variables}).json()["data"]["containerFit"]
+    assert fit["containers"][0]["items"] == [{"totalWeightKg": 10.0, "itemType": {"name": "Large Box"}}]
+    assert fit["unassigned"] == [{"totalVolumeM3": 0.1}]
@@ -0,0 +1,32 @@
+from app.services.catalog import FUZZY_MATCH, UNKNOWN_CATALOG_ITEM_TYPE, CatalogIndex, match_issues
+
+ENTRIES = [{"id": 1, "name": "Small Box"}, {"id": 2, "name": "Pallet"}, {"id": 3, "name": "small box"}, {"x": 1}]
+
+
+def test_exact_lookup_ignores_case_and_whitespace():
+    index = CatalogIndex(ENTRIES)
+    assert len(index) == 2
+    match = index.resolve("  SMALL   box ")
+    assert (match.id, match.name, match.fuzzy) == (1, "Small Box", False)
+    assert index.resolve("Smal Box") is None
+    assert index.by_name == {"Small Box": 1, "Pallet": 2, "small box": 3}
+
+
+def test_fuzzy_lookup_respects_cutoff():
+    index = CatalogIndex(ENTRIES, fuzzy_cutoff=0.8)
+    match = index.resolve("Smal Box", fuzzy=True)
+    assert (match.id, match.name, match.fuzzy) == (1, "Small Box", True)
+    assert index.resolve("Crate", fuzzy=True) is None
+
+    index.add("Crate", 4)
+    assert index.resolve("crates", fuzzy=True).name == "Crate"
+
+
+def test_match_issues_report_fuzzy_and_unknown_names():
+    index = CatalogIndex(ENTRIES)
+    names = ["pallet", "Smal Box", "Crate"]
+    resolved = index.resolve_all(names, fuzzy=True)
+    assert [(i.path, i.code) for i in match_issues("items", "itemTypeName", names, resolved)] == [
+        ("items[1].itemTypeName", FUZZY_MATCH),
+        ("items[2].itemTypeName", UNKNOWN_CATALOG_ITEM_TYPE),
+    ]
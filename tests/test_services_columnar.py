@@ -0,0 +1,36 @@
+import pytest
+
+from app.services.columnar import normalize_columnar
+from app.services.normalizer import normalize_raw
+
+
+def test_columnar_matches_dict_engine():
+    raw = {
+        "types": [
+            {"id": "S", "w": 1, "v": 0.02},
+            {"name": "Box M", "unitWeightKg": 2.5, "unitVolumeM3": 0.05, "lengthM": 0.6},
+        ],
+        "items": [{"type": "S", "q": 3}, {"itemTypeName": "Box M", "quantity": "2"}, {"type": "S", "q": 1}, {}],
+    }
+
+    batch = normalize_columnar("unit", raw)
+    item_types, items = normalize_raw("unit", raw)
+
+    assert list(batch.iter_item_types()) == item_types
+    assert list(batch.iter_items()) == items
+    # Names are stored once and referenced by index
+    assert batch.names == ["S", "Box M", "Unknown"]
+    assert list(batch.item_type_name) == [0, 1, 0, 2]
+    assert batch.quantity.typecode == "q" and batch.unit_weight_kg.typecode == "d"
+
+
+def test_columnar_empty_payload():
+    batch = normalize_columnar("unit", {})
+    assert list(batch.iter_item_types()) == []
+    assert list(batch.iter_items()) == []
+    assert batch.nbytes == 0
+
+
+def test_columnar_rejects_quantities_beyond_int64():
+    with pytest.raises(ValueError, match=r"items\[1\]: quantity 9223372036854775808"):
+        normalize_columnar("unit", {"items": [{"type": "S", "q": 1}, {"type": "S", "q": 2**63}]})
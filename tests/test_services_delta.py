@@ -0,0 +1,133 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.delta import (
+    FileSnapshotStore,
+    MemorySnapshotStore,
+    Snapshot,
+    SnapshotNotFoundError,
+    diff_delta,
+    full_delta,
+)
+from app.services.normalizer import normalize_raw
+
+QUERY = """
+mutation($p: JSON!, $mode: DeltaMode!, $base: String) {
+  normalizeDelta(source: "unit", payload: $p, mode: $mode, baseSnapshotId: $base) {
+    snapshotId
+    added { itemTypes { name } items { itemTypeName quantity } }
+    changed { itemTypes { name unitWeightKg } items { itemTypeName quantity } }
+    removedItemTypes
+    removedItems
+  }
+}
+"""
+V1 = {
+    "types": [{"id": "S", "w": 1}, {"id": "M", "w": 2}, {"id": "L", "w": 5}],
+    "items": [{"type": "S", "q": 3}, {"type": "M", "q": 1}, {"type": "S", "q": 2}],
+}
+V2 = {
+    "types": [{"id": "S", "w": 1}, {"id": "M", "w": 2.5}, {"id": "XL", "w": 9}],
+    "items": [{"type": "S", "q": 5}, {"type": "XL", "q": 1}],
+}
+
+
+def test_full_delta_against_previous_snapshot():
+    store = MemorySnapshotStore(per_source=2, max_sources=2)
+    first = full_delta(store, "unit", *normalize_raw("unit", V1), None)
+    assert [t["name"] for t in first.added_types] == ["S", "M", "L"]
+    assert first.added_items == [{"itemTypeName": "S", "quantity": 5}, {"itemTypeName": "M", "quantity": 1}]
+
+    second = full_delta(store, "unit", *normalize_raw("unit", V2), first.snapshot_id)
+    assert [t["name"] for t in second.added_types] == ["XL"]
+    assert [t["name"] for t in second.changed_types] == ["M"]
+    assert second.removed_types == ["L"]
+    # S totals 5 in both versions, so only XL is new and M is gone
+    assert second.added_items == [{"itemTypeName": "XL", "quantity": 1}]
+    assert second.changed_items == []
+    assert second.removed_items == ["M"]
+
+
+def test_diff_delta_applies_upserts_and_removals():
+    store = MemorySnapshotStore(per_source=2, max_sources=2)
+    base = full_delta(store, "unit", *normalize_raw("unit", V1), None)
+    diff = {"types": [{"id": "L", "w": 6}], "items": [{"type": "M", "q": 4}]}
+    delta = diff_delta(store, "unit", *normalize_raw("unit", diff), {"types": ["S", "nope"]}, base.snapshot_id)
+    assert [t["name"] for t in delta.changed_types] == ["L"]
+    assert delta.changed_items == [{"itemTypeName": "M", "quantity": 4}]
+    assert delta.removed_types == ["S"]
+
+    # The new snapshot reflects the diff: resending the same full state is a no-op
+    state = {
+        "types": [{"id": "M", "w": 2}, {"id": "L", "w": 6}],
+        "items": [{"type": "S", "q": 5}, {"type": "M", "q": 4}],
+    }
+    again = full_delta(store, "unit", *normalize_raw("unit", state), delta.snapshot_id)
+    assert (again.added_types, again.changed_types, again.removed_types) == ([], [], [])
+    assert (again.added_items, again.changed_items, again.removed_items) == ([], [], [])
+
+
+def test_full_delta_detects_changes_hash_would_miss():
+    store = MemorySnapshotStore(per_source=2, max_sources=2)
+    # hash(-1) == hash(-2) in CPython
+    first = full_delta(store, "unit", [], [{"itemTypeName": "S", "quantity": -1}], None)
+    second = full_delta(store, "unit", [], [{"itemTypeName": "S", "quantity": -2}], first.snapshot_id)
+    assert second.changed_items == [{"itemTypeName": "S", "quantity": -2}]
+
+
+def test_snapshot_store_is_bounded():
+    store = MemorySnapshotStore(per_source=1, max_sources=1)
+    first = store.put("a", Snapshot())
+    second = store.put("a", Snapshot())
+    with pytest.raises(SnapshotNotFoundError):
+        store.get("a", first)
+    store.get("a", second)
+    store.put("b", Snapshot())
+    with pytest.raises(SnapshotNotFoundError):
+        store.get("a", second)
+
+
+def test_file_snapshot_store_is_shared_and_bounded(tmp_path):
+    # Two stores on one directory stand in for two workers
+    a = FileSnapshotStore(str(tmp_path), per_source=1, max_sources=1)
+    b = FileSnapshotStore(str(tmp_path), per_source=1, max_sources=1)
+    first = full_delta(a, "../unit", *normalize_raw("unit", V1), None)
+    second = full_delta(b, "../unit", *normalize_raw("unit", V2), first.snapshot_id)
+    assert second.removed_types == ["L"]
+    assert [t["name"] for t in second.changed_types] == ["M"]
+
+    with pytest.raises(SnapshotNotFoundError):
+        a.get("../unit", first.snapshot_id)
+    with pytest.raises(SnapshotNotFoundError):
+        a.get("../unit", "../../etc/passwd")
+    b.put("other", Snapshot())
+    with pytest.raises(SnapshotNotFoundError):
+        a.get("../unit", second.snapshot_id)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_graphql_normalize_delta(client: TestClient):
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": V1, "mode": "FULL"}})
+    first = r.json()["data"]["normalizeDelta"]
+    assert len(first["added"]["itemTypes"]) == 3
+
+    diff = {"types": [{"id": "M", "w": 3}], "removed": {"items": ["S"]}}
+    variables = {"p": diff, "mode": "DIFF", "base": first["snapshotId"]}
+    out = client.post("/graphql", json={"query": QUERY, "variables": variables}).json()["data"]["normalizeDelta"]
+    assert out["changed"]["itemTypes"] == [{"name": "M", "unitWeightKg": 3.0}]
+    assert out["added"] == {"itemTypes": [], "items": []}
+    assert out["removedItems"] == ["S"] and out["removedItemTypes"] == []
+    assert out["snapshotId"] != first["snapshotId"]
+
+
+@pytest.mark.parametrize(
+    ("variables", "code"),
+    [
+        ({"p": {}, "mode": "DIFF"}, "BAD_USER_INPUT"),
+        ({"p": {}, "mode": "DIFF", "base": "missing"}, "SNAPSHOT_NOT_FOUND"),
+        ({"p": {"removed": []}, "mode": "FULL"}, "BAD_USER_INPUT"),
+    ],
+)
+def test_graphql_normalize_delta_errors(client: TestClient, variables: dict, code: str):
+    r = client.post("/graphql", json={"query": QUERY, "variables": variables})
+    assert r.json()["errors"][0]["extensions"]["code"] == code
@@ -0,0 +1,101 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from app.services.columnar import ColumnarBuilder, normalize_columnar
+from app.services.ingest import (
+    build_columnar,
+    iter_records,
+    mapped,
+    ndjson_ranges,
+    normalize_range_columnar,
+    write_ndjson,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+RAW = {
+    "types": [{"id": f"T{i}", "w": i, "v": 0.01 * i} for i in range(50)],
+    "items": [{"type": f"T{i % 50}", "q": i} for i in range(200)],
+}
+
+
+def _ndjson(path: Path) -> Path:
+    lines = [json.dumps({"kind": "type", **t}) for t in RAW["types"]]
+    lines += [json.dumps({"kind": "item", **i}) for i in RAW["items"]]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_ndjson_ranges_split_on_line_boundaries(tmp_path: Path):
+    path = _ndjson(tmp_path / "in.ndjson")
+    with mapped(str(path)) as buf:
+        ranges = ndjson_ranges(buf, 4)
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(buf)
+        assert all(buf[b - 1 : b] == b"\n" for _, b in ranges)
+        assert all(a == prev_b for (a, _), (_, prev_b) in zip(ranges[1:], ranges, strict=False))
+        merged = ColumnarBuilder("unit")
+        for a, b in ranges:
+            merged.extend(normalize_range_columnar(str(path), "unit", True, a, b))
+    batch, expected = merged.build(), normalize_columnar("unit", RAW)
+    assert list(batch.iter_item_types()) == list(expected.iter_item_types())
+    assert list(batch.iter_items()) == list(expected.iter_items())
+
+
+def test_json_document_read_in_slices(tmp_path: Path, monkeypatch):
+    from app.services import ingest
+
+    monkeypatch.setattr(ingest, "SLICE_BYTES", 64)
+    path = tmp_path / "in.json"
+    path.write_text(json.dumps(RAW))
+    with mapped(str(path)) as buf:
+        batch = build_columnar("unit", iter_records(buf, ndjson=False))
+    assert len(batch.type_name) == 50 and list(batch.quantity) == list(range(200))
+
+
+def test_empty_file(tmp_path: Path):
+    path = tmp_path / "empty.ndjson"
+    path.write_bytes(b"")
+    out = tmp_path / "out"
+    with mapped(str(path)) as buf, open(out, "wb") as f:
+        assert ndjson_ranges(buf, 3) == []
+        assert write_ndjson("unit", iter_records(buf, ndjson=True), f) == 0
+
+
+def test_cli_handles_empty_and_malformed_input(tmp_path: Path):
+    cli = [sys.executable, str(ROOT / "scripts" / "normalize_file.py"), "--source", "unit", "--workers", "2"]
+    empty = tmp_path / "empty.ndjson"
+    empty.write_bytes(b"")
+    done = subprocess.run([*cli, str(empty)], capture_output=True)
+    assert done.returncode == 0 and done.stdout == b""
+
+    bad = tmp_path / "bad.ndjson"
+    bad.write_bytes(b'{"kind": "type", "name": "A"}\n{"kind": "item", \n')
+    out = tmp_path / "out.ndjson"
+    failed = subprocess.run([*cli, str(bad), "-o", str(out)], capture_output=True)
+    assert failed.returncode == 1 and not out.exists()
+    assert failed.stderr.startswith(b"error: ") and b"Traceback" not in failed.stderr
+    assert b"line 2:" in failed.stderr
+
+
+def test_cli_fans_out_over_workers(tmp_path: Path):
+    path = _ndjson(tmp_path / "in.ndjson")
+    out = tmp_path / "out.ndjson"
+    cmd = [sys.executable, str(ROOT / "scripts" / "normalize_file.py"), str(path), "--source", "unit"]
+    subprocess.run([*cmd, "--workers", "3", "-o", str(out)], check=True, capture_output=True)
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert len(lines) == 250
+    assert lines[0] == {
+        "kind": "type",
+        "name": "T0",
+        "unitWeightKg": 0.0,
+        "unitVolumeM3": 0.0,
+        "lengthM": None,
+        "widthM": None,
+        "heightM": None,
+    }
+    assert lines[-1] == {"kind": "item", "itemTypeName": "T49", "quantity": 199}
+
+    columnar = subprocess.run([*cmd, "--format", "columnar"], check=True, capture_output=True).stdout
+    data = json.loads(columnar)
+    assert data["names"][:2] == ["T0", "T1"] and data["items"]["quantity"] == list(range(200))
@@ -1,3 +1,8 @@
+import pytest
+
+from app.services import mapping
+from app.services.columnar import normalize_columnar, nullable
+from app.services.mapping import plan_from_config
 from app.services.normalizer import normalize_raw
 
 
@@ -34,3 +39,77 @@ def test_normalize_raw_maps_fields_and_defaults():
     assert items[0] == {"itemTypeName": "S", "quantity": 3}
     assert items[1] == {"itemTypeName": "Box M", "quantity": 2}
     assert items[2] == {"itemTypeName": "Unknown", "quantity": 0}
+
+
+def test_normalize_raw_uses_registered_source_plan(monkeypatch: pytest.MonkeyPatch):
+    plan = plan_from_config(
+        {
+            "types": {"name": ["sku"], "unitWeightKg": {"aliases": ["kg"], "default": "1.5"}},
+            "items": {"quantity": ["qty"]},
+        }
+    )
+    monkeypatch.setitem(mapping._plans, "acme", plan)
+    raw = {
+        "types": [{"sku": "A-1", "kg": "2", "v": 0.1}, {"sku": "A-2"}],
+        "items": [{"type": "A-1", "qty": "4"}],
+    }
+
+    item_types, items = normalize_raw("acme", raw)
+
+    assert item_types[0]["name"] == "A-1"
+    assert item_types[0]["unitWeightKg"] == 2.0
+    assert item_types[0]["unitVolumeM3"] == 0.1
+    assert item_types[1]["unitWeightKg"] == 1.5
+    assert items == [{"itemTypeName": "A-1", "quantity": 4}]
+
+    # Other sources keep the default aliases
+    item_types, _ = normalize_raw("other", raw)
+    assert item_types[0]["name"] == "Unknown"
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"types": {"colour": ["c"]}},
+        {"items": {"quantity": "qty"}},
+        {"items": {"quantity": {"alias": ["qty"]}}},
+        {"types": {"unitWeightKg": {"default": "x"}}},
+        {"units": {"weight": "stone"}},
+        {"units": {"mass": "kg"}},
+        {"units": ["lb"]},
+    ],
+)
+def test_plan_from_config_rejects_invalid_config(config: dict):
+    with pytest.raises(ValueError):
+        plan_from_config(config)
+
+
+def test_source_units_are_converted_and_volume_derived(monkeypatch: pytest.MonkeyPatch):
+    plan = plan_from_config({"units": {"weight": "lb", "length": "cm", "volume": "L"}, "types": {"lengthM": ["l"]}})
+    monkeypatch.setitem(mapping._plans, "imperial", plan)
+    raw = {
+        "types": [
+            {"id": "A", "w": 10, "v": 20, "l": 50},
+            {"id": "B", "w": 1, "l": 200, "widthM": 50, "heightM": 10},
+            {"id": "C", "widthM": 50, "heightM": 10},
+            {"id": "D", "unitWeightKg": None, "unitVolumeM3": 0, "lengthM": 1, "widthM": 1, "heightM": 1},
+        ],
+        "items": [{"type": "A", "q": 3}],
+    }
+
+    item_types, items = normalize_raw("imperial", raw)
+
+    assert item_types[0] == pytest.approx(
+        {"name": "A", "unitWeightKg": 4.5359237, "unitVolumeM3": 0.02, "lengthM": 0.5, "widthM": None, "heightM": None}
+    )
+    # No volume: derived from the converted dimensions
+    assert item_types[1]["unitVolumeM3"] == pytest.approx(2.0 * 0.5 * 0.1)
+    assert item_types[2]["unitVolumeM3"] == 0.0
+    # An explicit volume (even 0) is kept; defaults are already canonical
+    assert (item_types[3]["unitWeightKg"], item_types[3]["unitVolumeM3"]) == (0.0, 0.0)
+    assert items == [{"itemTypeName": "A", "quantity": 3}]
+
+    batch = normalize_columnar("imperial", raw)
+    assert list(batch.unit_weight_kg) == pytest.approx([t["unitWeightKg"] for t in item_types])
+    assert list(batch.unit_volume_m3) == pytest.approx([t["unitVolumeM3"] for t in item_types])
+    assert nullable(batch.length_m) == pytest.approx([t["lengthM"] for t in item_types])
@@ -0,0 +1,90 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.services.aggregate import normalize_aggregated_lenient
+from app.services.validation import (
+    INVALID_RECORD,
+    INVALID_SECTION,
+    INVALID_VALUE,
+    first_issue,
+    normalize_lenient,
+)
+
+PAYLOAD = {
+    "types": [{"id": "S", "w": 2, "v": 0.5}, {"id": "M", "w": "heavy", "v": 1}],
+    "items": [{"type": "S", "q": 3}, {"type": "S", "q": "abc"}, "oops", {"type": "M", "q": 1}],
+}
+QUERY = (
+    'mutation($p: JSON!, $m: ValidationMode!){ normalize(source:"unit", payload:$p, mode:$m){ '
+    "itemTypes{ name } items{ itemTypeName quantity } errors{ path code message } } }"
+)
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(cache, "_configured", True)
+
+
+def test_first_issue_locates_bad_value():
+    issue = first_issue("unit", PAYLOAD)
+    assert issue is not None
+    assert (issue.path, issue.code) == ("types[1].w", INVALID_VALUE)
+    assert "'heavy'" in issue.message
+
+
+def test_first_issue_none_for_clean_payload():
+    assert first_issue("unit", {"types": [{"id": "S", "w": "2"}], "items": [{"type": "S", "q": 1}]}) is None
+
+
+def test_first_issue_rejects_non_list_section():
+    issue = first_issue("unit", {"items": {"type": "S"}})
+    assert issue is not None and (issue.path, issue.code) == ("items", INVALID_SECTION)
+
+
+def test_overflowing_values_are_invalid_not_crashes():
+    raw = {"types": [{"id": "S", "w": 10**400}, {"id": "M", "w": 1}], "items": [{"type": "S", "q": float("inf")}]}
+    issue = first_issue("unit", raw)
+    assert issue is not None and (issue.path, issue.code) == ("types[0].w", INVALID_VALUE)
+    item_types, items, issues = normalize_lenient("unit", raw)
+    assert [t["name"] for t in item_types] == ["M"] and items == []
+    assert [e.path for e in issues] == ["types[0].w", "items[0].q"]
+
+
+def test_lenient_skips_bad_records():
+    item_types, items, issues = normalize_lenient("unit", PAYLOAD)
+    assert [t["name"] for t in item_types] == ["S"]
+    assert [(i["itemTypeName"], i["quantity"]) for i in items] == [("S", 3), ("M", 1)]
+    assert [(e.path, e.code) for e in issues] == [
+        ("types[1].w", INVALID_VALUE),
+        ("items[1].q", INVALID_VALUE),
+        ("items[2]", INVALID_RECORD),
+    ]
+
+
+def test_lenient_aggregate_keeps_raw_item_paths():
+    _, items, issues = normalize_aggregated_lenient("unit", PAYLOAD)
+    assert [(i["itemTypeName"], i["quantity"]) for i in items] == [("S", 3), ("M", 1)]
+    # M was dropped as a type, so its item is an unknown reference at its original index
+    assert [e.path for e in issues][-1] == "items[3].itemTypeName"
+
+
+def test_graphql_strict_reports_path(client: TestClient):
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": PAYLOAD, "m": "STRICT"}})
+    (error,) = r.json()["errors"]
+    assert error["extensions"] == {"code": INVALID_VALUE, "payloadPath": "types[1].w"}
+
+
+def test_graphql_default_mode_is_strict(client: TestClient):
+    query = 'mutation($p: JSON!){ normalize(source:"unit", payload:$p){ items{ quantity } } }'
+    r = client.post("/graphql", json={"query": query, "variables": {"p": {"items": [{"type": "S", "q": "x"}]}}})
+    (error,) = r.json()["errors"]
+    assert error["extensions"]["payloadPath"] == "items[0].q"
+
+
+def test_graphql_lenient_returns_errors(client: TestClient):
+    r = client.post("/graphql", json={"query": QUERY, "variables": {"p": PAYLOAD, "m": "LENIENT"}})
+    data = r.json()["data"]["normalize"]
+    assert [i["quantity"] for i in data["items"]] == [3, 1]
+    assert [e["path"] for e in data["errors"]] == ["types[1].w", "items[1].q", "items[2]"]
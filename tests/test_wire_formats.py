@@ -0,0 +1,125 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import cache
+from app.services.wire import expand_payload
+
+FAST = (
+    'mutation($p: JSON!){ normalize(source:"unit", payload:$p){ '
+    "itemTypes{ name unitWeightKg unitVolumeM3 lengthM widthM heightM } items{ itemTypeName quantity } } }"
+)
+COLUMNAR = (
+    'mutation($p: JSON!){ normalizeColumnar(source:"unit", payload:$p){ names '
+    "itemTypes{ nameIndex unitWeightKg lengthM } items{ itemTypeNameIndex quantity } } }"
+)
+RECORDS = {
+    "types": [{"id": "S", "w": 1, "v": 0.02}, {"id": "M", "w": 2, "v": 0.05, "lengthM": 0.6}],
+    "items": [{"type": "S", "q": 3}, {"type": "M", "q": 1}, {"type": "S", "q": 2}],
+}
+COLUMNS = {
+    "types": {"columns": ["id", "w", "v", "lengthM"], "rows": [["S", 1, 0.02, None], ["M", 2, 0.05, 0.6]]},
+    "items": {"columns": ["type", "q"], "rows": [["S", 3], ["M", 1], ["S", 2]]},
+}
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(cache, "_cache", None)
+    monkeypatch.setattr(cache, "_configured", True)
+
+
+def test_expand_payload_matches_records():
+    expanded = expand_payload(COLUMNS)
+    assert expanded["items"] == RECORDS["items"]
+    assert expanded["types"][0] == {"id": "S", "w": 1, "v": 0.02, "lengthM": None}
+    assert expand_payload(RECORDS) is RECORDS
+
+
+@pytest.mark.parametrize(
+    "section",
+    [{"columns": "id", "rows": []}, {"columns": ["id"], "rows": {}}, {"columns": ["id", "w"], "rows": [["S"]]}],
+)
+def test_expand_payload_rejects_malformed_sections(section):
+    with pytest.raises(ValueError):
+        expand_payload({"types": section})
+
+
+def test_columnar_input_on_fast_and_generic_paths(client: TestClient):
+    expected = client.post("/graphql", json={"query": FAST, "variables": {"p": RECORDS}}).json()
+    r = client.post("/graphql", json={"query": FAST, "variables": {"p": COLUMNS}})
+    assert r.json() == expected
+    generic = FAST.replace("items{ itemTypeName", "items{ __typename itemTypeName")
+    r = client.post("/graphql", json={"query": generic, "variables": {"p": COLUMNS}})
+    assert r.json()["data"]["normalize"]["items"][0] == {"__typename": "Item", "itemTypeName": "S", "quantity": 3}
+
+
+def test_normalize_columnar_lists_names_once(client: TestClient):
+    r = client.post("/graphql", json={"query": COLUMNAR, "variables": {"p": COLUMNS}})
+    assert r.status_code == 200
+    out = r.json()["data"]["normalizeColumnar"]
+    assert out == {
+        "names": ["S", "M"],
+        "itemTypes": {"nameIndex": [0, 1], "unitWeightKg": [1.0, 2.0], "lengthM": [None, 0.6]},
+        "items": {"itemTypeNameIndex": [0, 1, 0], "quantity": [3, 1, 2]},
+    }
+
+
+def test_gzip_request_and_response(client: TestClient):
+    body = gzip.compress(json.dumps({"query": FAST, "variables": {"p": RECORDS}}).encode())
+    r = client.post(
+        "/graphql",
+        content=body,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip", "Accept-Encoding": "gzip"},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"]["normalize"]["items"][0] == {"itemTypeName": "S", "quantity": 3}
+
+    big = {"items": [{"type": "S", "q": i} for i in range(500)]}
+    r = client.post("/graphql", json={"query": FAST, "variables": {"p": big}}, headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.json()["data"]["normalize"]["items"]) == 500
+
+
+def test_bad_content_encoding(client: TestClient):
+    headers = {"Content-Type": "application/json"}
+    r = client.post("/graphql", content=b"{}", headers={**headers, "Content-Encoding": "br"})
+    assert r.status_code == 415
+    r = client.post("/graphql", content=b"not gzip", headers={**headers, "Content-Encoding": "gzip"})
+    assert r.status_code == 400
+
+
+def test_decompressed_size_limit(monkeypatch: pytest.MonkeyPatch):
+    from app.api import create_app
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "request_max_decompressed_bytes", 1000)
+    client = TestClient(create_app())
+    body = gzip.compress(json.dumps({"query": FAST, "variables": {"p": {"items": [{"q": 1}] * 500}}}).encode())
+    r = client.post("/graphql", content=body, headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert r.status_code == 413
+
+
+def test_zstd_bomb_is_capped_per_chunk():
+    zstandard = pytest.importorskip("zstandard")
+    from app.core.compression import _decoder
+
+    bomb = zstandard.ZstdCompressor(level=19).compress(b"\0" * 200_000_000)
+    decoder = _decoder("zstd")
+    assert decoder is not None
+    out = decoder[0](bomb, 1000)
+    assert 1000 < len(out) <= 1000 + zstandard.DECOMPRESSION_RECOMMENDED_OUTPUT_SIZE
+
+
+def test_stream_response_is_not_gzipped(client: TestClient):
+    body = "\n".join(json.dumps({"kind": "item", "type": "S", "q": i}) for i in range(500))
+    r = client.post(
+        "/normalize/stream?source=test",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson", "Accept-Encoding": "gzip"},
+    )
+    assert r.status_code == 200
+    assert "content-encoding" not in r.headers
+    assert len(r.text.splitlines()) == 500